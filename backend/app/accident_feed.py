@@ -0,0 +1,91 @@
+import logging
+from typing import Any, Dict, List, Optional
+import pandas as pd
+from sqlalchemy.orm import Session
+from config import Config
+from . import crud
+from .data_migration import SEVERITY_MAPPING, accident_records, categorize_hours, parse_times
+
+logger = logging.getLogger(__name__)
+
+# Per-record outcomes of a feed submission
+INSERTED = "inserted"
+DUPLICATE = "duplicate"
+INVALID = "invalid"
+FAILED = "failed"
+
+
+def feed_frame(records: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Validated feed records as a frame in the accidents table's column names"""
+    df = pd.DataFrame.from_records(records)
+    # Already dates; datetime64 lets parse_dates skip string parsing
+    df['accident_date'] = pd.to_datetime(df['accident_date'])
+    return df
+
+
+def derive_feed_fields(df: pd.DataFrame) -> pd.DataFrame:
+    """Derived accident columns for a frame of feed records
+
+    Same derivations as preprocess_accident_data, but a missing value stays
+    NULL: no batch medians and no 'Unknown' placeholders, so a record is
+    stored the same whichever records share its batch. Returns an object
+    frame with None for every missing value.
+    """
+    dates = df['accident_date']
+    df['accident_date'] = dates.dt.date
+    df['year'] = dates.dt.year
+    df['month'] = dates.dt.month
+    df['day'] = dates.dt.day
+    df['day_of_week'] = dates.dt.dayofweek
+    df['is_weekend'] = df['day_of_week'].isin([5, 6])
+
+    times, hours = parse_times(df['accident_time'])
+    parsed = times.notna()
+    df['accident_time'] = times
+    df['hour'] = hours.where(parsed).astype('Int64')
+    df['time_of_day'] = categorize_hours(hours).where(parsed)
+
+    df['severity'] = df['severity'].map(SEVERITY_MAPPING)
+    return df.astype(object).where(df.notna(), None)
+
+
+def store_accident_feed(
+    db: Session,
+    records: List[Dict[str, Any]],
+    commit_every: Optional[int] = None,
+    strategy: Optional[str] = None
+) -> List[str]:
+    """Derive fields for validated feed records and insert them in batches
+
+    Each batch of ``commit_every`` records gets its derived fields from
+    derive_feed_fields, is inserted with one statement and committed
+    on its own, so a failing batch only fails its own records. Returns a
+    status per record: inserted, duplicate (accident_index already stored,
+    or repeated earlier in the feed) or failed.
+    """
+    commit_every = commit_every or Config.FEED_COMMIT_ROWS
+    strategy = strategy or Config.INGEST_DEDUP_STRATEGY
+    crud_obj = crud.CRUD(db)
+    statuses: List[str] = []
+
+    for start in range(0, len(records), commit_every):
+        batch = records[start:start + commit_every]
+        try:
+            rows = accident_records(derive_feed_fields(feed_frame(batch)))
+            inserted = set(crud_obj.insert_new_accidents(rows, strategy=strategy, commit=False))
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to store accident feed batch at record {start}: {e}")
+            statuses.extend([FAILED] * len(batch))
+            continue
+
+        for row in rows:
+            # The first record with a new key is the one that was inserted
+            if row['accident_index'] in inserted:
+                inserted.discard(row['accident_index'])
+                statuses.append(INSERTED)
+            else:
+                statuses.append(DUPLICATE)
+
+    return statuses
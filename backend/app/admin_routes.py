@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from typing import List, Optional, Dict, Any
 import logging
 from datetime import datetime, timedelta
@@ -12,6 +12,7 @@ from .database import get_db
 from . import crud
 from sqlalchemy.orm import Session
 from config import Config
+from .executors import run_db, run_cpu
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -47,7 +48,7 @@ async def get_dashboard_overview(
     current_admin: User = Depends(get_current_admin_user)
 ):
     """Get dashboard overview statistics"""
-    try:
+    def collect_overview():
         crud_obj = crud.CRUD(db)
         
         # Get accident statistics
@@ -62,6 +63,12 @@ async def get_dashboard_overview(
         # Get predictions needing review
         pending_review = crud_obj.get_predictions(needs_review=True, limit=10)
         
+        return accident_stats, prediction_metrics, recent_predictions, pending_review
+    
+    try:
+        accident_stats, prediction_metrics, recent_predictions, pending_review = \
+            await run_db(collect_overview)
+        
         # Get system health
         from main import app
         model_loaded = app.state.predictor is not None
@@ -79,6 +86,8 @@ async def get_dashboard_overview(
             "timestamp": datetime.now().isoformat()
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to get dashboard overview: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -90,17 +99,13 @@ async def get_predictions_analytics(
     current_admin: User = Depends(get_current_admin_user)
 ):
     """Get predictions analytics for the last N days"""
-    try:
+    def analyze(all_predictions):
         import pandas as pd
         
         # Calculate date range
         end_date = datetime.now()
         start_date = end_date - timedelta(days=days)
         
-        # Get predictions in date range
-        crud_obj = crud.CRUD(db)
-        all_predictions = crud_obj.get_predictions(limit=10000)  # Adjust limit as needed
-        
         # Filter by date
         recent_predictions = [
             p for p in all_predictions 
@@ -149,7 +154,14 @@ async def get_predictions_analytics(
             "review_rate": (df['needs_review'].sum() / len(df)) * 100 if len(df) > 0 else 0,
             "accuracy_rate": df['is_correct'].dropna().mean() * 100 if not df['is_correct'].dropna().empty else None
         }
-        
+    
+    try:
+        # Get predictions in date range
+        crud_obj = crud.CRUD(db)
+        all_predictions = await run_db(crud_obj.get_predictions, limit=10000)  # Adjust limit as needed
+        return await run_cpu(analyze, all_predictions)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to get predictions analytics: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -161,14 +173,8 @@ async def get_accident_analytics(
     current_admin: User = Depends(get_current_admin_user)
 ):
     """Get accident analytics for the last N days"""
-    try:
+    def analyze(accidents):
         import pandas as pd
-        from sqlalchemy import func
-        
-        crud_obj = crud.CRUD(db)
-        
-        # Get accidents
-        accidents = crud_obj.get_accidents(limit=10000)
         
         if not accidents:
             return {"message": "No accident data available"}
@@ -219,7 +225,14 @@ async def get_accident_analytics(
             "top_hotspots": hotspots.to_dict('records'),
             "severity_distribution": df['severity'].value_counts().to_dict()
         }
-        
+    
+    try:
+        # Get accidents
+        crud_obj = crud.CRUD(db)
+        accidents = await run_db(crud_obj.get_accidents, limit=10000)
+        return await run_cpu(analyze, accidents)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to get accident analytics: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -241,12 +254,14 @@ async def export_data(
         crud_obj = crud.CRUD(db)
         
         if data_type == "accidents" or data_type == "all":
-            accidents = crud_obj.get_accidents(limit=100000)
-            accident_data = [acc.to_dict() for acc in accidents]
+            accident_data = await run_db(
+                lambda: [acc.to_dict() for acc in crud_obj.get_accidents(limit=100000)]
+            )
         
         if data_type == "predictions" or data_type == "all":
-            predictions = crud_obj.get_predictions(limit=100000)
-            prediction_data = [pred.to_dict() for pred in predictions]
+            prediction_data = await run_db(
+                lambda: [pred.to_dict() for pred in crud_obj.get_predictions(limit=100000)]
+            )
         
         if format == "json":
             data = {}
@@ -306,41 +321,333 @@ async def export_data(
         logger.error(f"Failed to export data: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.post("/dashboard/retrain-model")
-async def retrain_model(
+@router.post("/data/upload")
+async def upload_accidents_csv(
+    request: Request,
+    compressed: Optional[bool] = Query(None, description="Body is gzip-compressed (default: detect)"),
     current_admin: User = Depends(get_current_admin_user)
 ):
-    """Retrain the ML model with latest data"""
+    """Load an accidents CSV sent as the raw request body (optionally gzip)
+    
+    The body is streamed through the chunked preprocessing and insert
+    pipeline as it arrives, so memory use does not grow with the upload.
+    It is read with request.stream() rather than as multipart form data,
+    which would first spool the whole file to a temporary file.
+    
+    The loader runs on a thread of its own for the whole upload rather
+    than taking a db pool slot per piece, so a saturated pool cannot fail
+    an upload half way through with a 503.
+    """
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+    from starlette.requests import ClientDisconnect
+    from .stream_ingest import CsvStreamLoader
+    
+    if compressed is None and (
+        request.headers.get("content-encoding", "").lower() == "gzip"
+        or request.headers.get("content-type", "").lower() in ("application/gzip", "application/x-gzip")
+    ):
+        compressed = True
+    
+    loop = asyncio.get_running_loop()
+    upload_thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix="csv-upload")
+    
+    def in_upload_thread(fn, *args):
+        return loop.run_in_executor(upload_thread, fn, *args)
+    
+    loader = CsvStreamLoader(compressed=compressed)
     try:
-        from main import app
-        from .ml_model.model_training import AccidentPredictor
+        logger.info("Admin started a CSV upload")
+        # Each piece is processed before the next is read, so a slow
+        # database throttles the client instead of buffering its data
+        async for piece in request.stream():
+            await in_upload_thread(loader.feed, piece)
+        stats = await in_upload_thread(loader.finish)
         
-        if not app.state.predictor:
-            raise HTTPException(status_code=503, detail="ML model not loaded")
+        return {
+            "status": "success",
+            "message": f"Uploaded data loaded ({stats['rows_inserted']} records added)",
+            "stats": stats,
+            "timestamp": datetime.now().isoformat()
+        }
         
-        # Retrain model
+    except ClientDisconnect:
+        committed = await in_upload_thread(loader.abort)
+        logger.warning(
+            f"CSV upload aborted by client; {committed} records committed before the "
+            f"disconnect were kept, the rest rolled back"
+        )
+        raise HTTPException(
+            status_code=400,
+            detail=f"Upload interrupted; {committed} records were already committed and kept"
+        )
+    except Exception as e:
+        await in_upload_thread(loader.abort)
+        logger.error(f"Failed to load uploaded data: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        upload_thread.shutdown(wait=False)
+
+def get_training_runner():
+    """Get the app's training job runner"""
+    from main import app
+    
+    runner = getattr(app.state, "training_jobs", None)
+    if runner is None:
+        raise HTTPException(status_code=503, detail="Training job runner not available")
+    return runner
+
+@router.post("/dashboard/retrain-model", status_code=202)
+async def retrain_model(
+    mode: str = Query(Config.TRAINING_MODE, regex="^(full|incremental)$"),
+    current_admin: User = Depends(get_current_admin_user)
+):
+    """Retrain the ML model with latest data
+    
+    Training runs as a background job in a separate process; the new model
+    replaces the served one when the job completes. Poll the returned job
+    with GET /jobs/training/{job_id}.
+    """
+    try:
         logger.info("Admin triggered model retraining...")
-        
-        # Create new predictor instance with latest data
-        new_predictor = AccidentPredictor()
-        
-        # Update app state
-        app.state.predictor = new_predictor
-        
-        # Get new metrics
-        metrics = new_predictor.get_model_metrics()
+        job = get_training_runner().submit({"mode": mode})
         
         return {
-            "status": "success",
-            "message": "Model retrained successfully",
-            "metrics": metrics,
+            "status": "accepted",
+            "message": "Model retraining job submitted",
+            "job": job.to_dict(),
             "timestamp": datetime.now().isoformat()
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to retrain model: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/jobs/training", status_code=202)
+async def submit_training_job(
+    mode: str = Query(Config.TRAINING_MODE, regex="^(full|incremental|tune)$"),
+    promote: Optional[bool] = Query(None, description="Promote the new version when done (default: AUTO_PROMOTE_MODELS)"),
+    time_budget: Optional[float] = Query(None, gt=0, description="Tuning wall-clock budget in seconds"),
+    cpu_budget: Optional[float] = Query(None, gt=0, description="Tuning CPU budget in seconds"),
+    max_candidates: Optional[int] = Query(None, ge=1),
+    latency_budget_ms: Optional[float] = Query(None, gt=0, description="p99 latency budget for picking the winner"),
+    current_admin: User = Depends(get_current_admin_user)
+):
+    """Submit a model training job (full refit, incremental warm start or tuning search)"""
+    params = {"mode": mode}
+    if promote is not None:
+        params["promote"] = promote
+    if mode == "tune":
+        options = {
+            "time_budget": time_budget,
+            "cpu_budget": cpu_budget,
+            "max_candidates": max_candidates,
+            "latency_budget_ms": latency_budget_ms
+        }
+        params["tuning"] = {key: value for key, value in options.items() if value is not None}
+    job = get_training_runner().submit(params)
+    return job.to_dict()
+
+@router.get("/jobs/training")
+async def list_training_jobs(
+    current_admin: User = Depends(get_current_admin_user)
+):
+    """List recent training jobs"""
+    runner = get_training_runner()
+    return {"jobs": [job.to_dict() for job in runner.store.list(kind="training")]}
+
+@router.get("/jobs/training/{job_id}")
+async def get_training_job(
+    job_id: str,
+    current_admin: User = Depends(get_current_admin_user)
+):
+    """Get training job status, progress and timings"""
+    job = get_training_runner().store.get(job_id)
+    if not job or job.kind != "training":
+        raise HTTPException(status_code=404, detail="Training job not found")
+    return job.to_dict()
+
+@router.delete("/jobs/training/{job_id}")
+async def cancel_training_job(
+    job_id: str,
+    current_admin: User = Depends(get_current_admin_user)
+):
+    """Cancel a queued or running training job"""
+    job = get_training_runner().cancel(job_id)
+    if not job or job.kind != "training":
+        raise HTTPException(status_code=404, detail="Training job not found")
+    return job.to_dict()
+
+def get_model_registry():
+    """Get the model registry"""
+    from .ml_model.registry import ModelRegistry
+    return ModelRegistry(Config.MODEL_REGISTRY_DIR)
+
+@router.get("/models")
+async def list_model_versions(
+    current_admin: User = Depends(get_current_admin_user)
+):
+    """List registered model versions with their metadata"""
+    from main import app
+    
+    registry = get_model_registry()
+    versions = await run_db(registry.list_versions)
+    return {
+        "current": await run_db(registry.current_version),
+        "serving": app.state.predictor.model_version if app.state.predictor else None,
+        "versions": versions
+    }
+
+@router.get("/models/{version}")
+async def get_model_version(
+    version: str,
+    current_admin: User = Depends(get_current_admin_user)
+):
+    """Get one model version's metadata"""
+    metadata = await run_db(get_model_registry().get, version)
+    if metadata is None:
+        raise HTTPException(status_code=404, detail="Model version not found")
+    return metadata
+
+@router.post("/models/{version}/promote")
+async def promote_model_version(
+    version: str,
+    current_admin: User = Depends(get_current_admin_user)
+):
+    """Promote a model version and swap it in for serving
+    
+    The version is loaded and swapped in first; CURRENT only moves once it
+    is serving, and the previous predictor is restored if that fails.
+    """
+    from main import app
+    from .training_jobs import load_and_swap_predictor
+    
+    registry = get_model_registry()
+    if not await run_db(registry.exists, version):
+        raise HTTPException(status_code=404, detail=f"Unknown model version: {version}")
+    
+    previous = app.state.predictor
+    try:
+        await run_cpu(load_and_swap_predictor, app.state, version)
+    except Exception as e:
+        logger.error(f"Failed to load model {version}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    try:
+        await run_db(registry.promote, version)
+    except Exception as e:
+        app.state.predictor = previous
+        logger.error(f"Failed to promote model {version}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    return {"status": "promoted", "version": version, "timestamp": datetime.now().isoformat()}
+
+@router.post("/models/rollback")
+async def rollback_model_version(
+    current_admin: User = Depends(get_current_admin_user)
+):
+    """Roll back to the previously promoted model version
+    
+    Like promotion, the previous version is serving before CURRENT moves
+    back to it.
+    """
+    from main import app
+    from .training_jobs import load_and_swap_predictor
+    
+    registry = get_model_registry()
+    try:
+        version = await run_db(registry.previous_version)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    
+    previous = app.state.predictor
+    try:
+        await run_cpu(load_and_swap_predictor, app.state, version)
+    except Exception as e:
+        logger.error(f"Failed to load model {version}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    try:
+        await run_db(registry.rollback, version)
+    except Exception as e:
+        app.state.predictor = previous
+        logger.error(f"Failed to roll back model: {e}")
+        status_code = 409 if isinstance(e, ValueError) else 500
+        raise HTTPException(status_code=status_code, detail=str(e))
+    
+    return {"status": "rolled_back", "version": version, "timestamp": datetime.now().isoformat()}
+
+def load_candidate(version: str):
+    """Load a model version for shadow scoring"""
+    from .ml_model.model_training import AccidentPredictor
+    
+    candidate = AccidentPredictor(initialize=False, model_version=version)
+    candidate.load_model()
+    candidate.warm_up()
+    return candidate
+
+@router.post("/models/{version}/shadow")
+async def start_shadow_scoring(
+    version: str,
+    sample_rate: float = Query(Config.SHADOW_SAMPLE_RATE, gt=0, le=1),
+    current_admin: User = Depends(get_current_admin_user)
+):
+    """Shadow-score a sample of live predictions with a candidate version"""
+    from main import app
+    from .shadow import ShadowScorer
+    
+    if not await run_db(get_model_registry().exists, version):
+        raise HTTPException(status_code=404, detail="Model version not found")
+    
+    try:
+        candidate = await run_cpu(load_candidate, version)
+    except Exception as e:
+        logger.error(f"Failed to load shadow model {version}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    scorer = ShadowScorer(
+        candidate,
+        get_primary=lambda: app.state.predictor,
+        sample_rate=sample_rate,
+        batch_size=Config.SHADOW_BATCH_SIZE,
+        max_pending=Config.SHADOW_MAX_PENDING,
+        flush_interval=Config.SHADOW_FLUSH_INTERVAL_MS / 1000
+    )
+    scorer.start()
+    
+    # Replace any running scorer; requests see either the old or the new one
+    previous, app.state.shadow = app.state.shadow, scorer
+    if previous:
+        await run_cpu(previous.stop)
+    
+    return scorer.get_stats()
+
+@router.get("/shadow")
+async def get_shadow_stats(
+    current_admin: User = Depends(get_current_admin_user)
+):
+    """Get agreement and latency of the running shadow comparison"""
+    from main import app
+    
+    if not app.state.shadow:
+        raise HTTPException(status_code=404, detail="Shadow scoring is not running")
+    return app.state.shadow.get_stats()
+
+@router.delete("/shadow")
+async def stop_shadow_scoring(
+    current_admin: User = Depends(get_current_admin_user)
+):
+    """Stop shadow scoring and return the final comparison"""
+    from main import app
+    
+    scorer, app.state.shadow = app.state.shadow, None
+    if not scorer:
+        raise HTTPException(status_code=404, detail="Shadow scoring is not running")
+    await run_cpu(scorer.stop)
+    return scorer.get_stats()
+
 @router.get("/admin/users")
 async def get_users(
     skip: int = Query(0, ge=0),
@@ -350,7 +657,7 @@ async def get_users(
 ):
     """Get list of users (admin only)"""
     try:
-        users = db.query(models.User).offset(skip).limit(limit).all()
+        users = await run_db(lambda: db.query(models.User).offset(skip).limit(limit).all())
         
         return {
             "total": len(users),
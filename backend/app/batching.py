@@ -0,0 +1,188 @@
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from .executors import run_cpu
+
+logger = logging.getLogger(__name__)
+
+
+class PredictionBatcher:
+    """Adaptive micro-batcher in front of the predictor
+
+    Concurrent ``submit`` calls are queued and collected by a single worker
+    task. The worker waits for the first request, then keeps gathering until
+    either ``max_batch_size`` requests are pending or ``max_wait_us`` has
+    elapsed, runs one vectorized ``predict_batch`` and resolves every
+    waiting future with its own result. A request that fails (an input
+    that cannot be encoded, or any error once the batch falls back to
+    scoring requests one by one) only fails its own future.
+
+    The window is adaptive: while traffic is light (the previous batch held a
+    single request and nothing else is queued) requests are dispatched
+    immediately, so the wait is only paid once there is concurrency to
+    amortize it.
+    """
+
+    def __init__(
+        self,
+        get_predictor: Callable[[], Any],
+        max_batch_size: int = 64,
+        max_wait_us: int = 2000
+    ):
+        self.get_predictor = get_predictor
+        self.max_batch_size = max_batch_size
+        self.max_wait_us = max_wait_us
+        self.queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+        # Tuning statistics
+        self.total_requests = 0
+        self.total_batches = 0
+        self.max_batch_seen = 0
+        self.max_queue_depth = 0
+        self.batch_size_histogram: Dict[int, int] = {}
+        self.total_inference_seconds = 0.0
+        self._last_batch_size = 0
+
+    def start(self):
+        """Start the batching worker on the running event loop"""
+        self.queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+        logger.info(
+            f"Prediction batcher started (max_batch_size={self.max_batch_size}, "
+            f"max_wait_us={self.max_wait_us})"
+        )
+
+    async def stop(self):
+        """Stop the worker, failing any requests still queued"""
+        if self._worker:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+        while self.queue and not self.queue.empty():
+            _, future = self.queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Prediction batcher stopped"))
+
+    async def submit(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Queue one prediction and wait for its result"""
+        if self._worker is None:
+            raise RuntimeError("Prediction batcher is not running")
+
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((input_data, future))
+        self.max_queue_depth = max(self.max_queue_depth, self.queue.qsize())
+        return await future
+
+    async def _collect(self) -> List[Tuple[Dict[str, Any], asyncio.Future]]:
+        """Gather one batch from the queue within the batching window"""
+        batch = [await self.queue.get()]
+        deadline = time.perf_counter() + self.max_wait_us / 1_000_000
+
+        while len(batch) < self.max_batch_size:
+            # Drain whatever is already queued without yielding
+            while len(batch) < self.max_batch_size and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            if len(batch) >= self.max_batch_size:
+                break
+            if len(batch) == 1 and self._last_batch_size <= 1:
+                # Light traffic: don't hold a lone request for the window
+                break
+
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _run(self):
+        """Worker loop: collect, score and dispatch batches"""
+        while True:
+            batch = await self._collect()
+            inputs = [input_data for input_data, _ in batch]
+            futures = [future for _, future in batch]
+
+            try:
+                predictor = self.get_predictor()
+                if predictor is None:
+                    raise RuntimeError("ML model not loaded")
+
+                started = time.perf_counter()
+                try:
+                    results = await self._infer(predictor, inputs)
+                except Exception as e:
+                    if len(inputs) == 1:
+                        raise
+                    # Score requests one by one so only the failing ones fail
+                    logger.error(f"Batched prediction failed, scoring {len(inputs)} requests individually: {e}")
+                    results = await self._infer_each(predictor, inputs)
+                self.total_inference_seconds += time.perf_counter() - started
+
+                for future, result in zip(futures, results):
+                    if future.done():
+                        continue
+                    if isinstance(result, Exception):
+                        future.set_exception(result)
+                    else:
+                        future.set_result(result)
+            except Exception as e:
+                logger.error(f"Batched prediction failed: {e}")
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+
+            self._record_batch(len(batch))
+
+    async def _infer(self, predictor, inputs: List[Dict[str, Any]]) -> List[Any]:
+        """Run one vectorized inference for a batch
+
+        Inputs that cannot be encoded get their exception in place of a
+        result, so they fail alone.
+        """
+        return await run_cpu(predictor.predict_batch, inputs, return_exceptions=True)
+
+    async def _infer_each(self, predictor, inputs: List[Dict[str, Any]]) -> List[Any]:
+        """Score each input with its own call, collecting per-input exceptions"""
+        results = []
+        for input_data in inputs:
+            try:
+                results.append(await run_cpu(predictor.predict, input_data))
+            except Exception as e:
+                results.append(e)
+        return results
+
+    def _record_batch(self, size: int):
+        """Update batch statistics"""
+        self._last_batch_size = size
+        self.total_requests += size
+        self.total_batches += 1
+        self.max_batch_seen = max(self.max_batch_seen, size)
+        self.batch_size_histogram[size] = self.batch_size_histogram.get(size, 0) + 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue depth and batch size statistics"""
+        return {
+            "running": self._worker is not None,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_us": self.max_wait_us,
+            "queue_depth": self.queue.qsize() if self.queue else 0,
+            "max_queue_depth": self.max_queue_depth,
+            "total_requests": self.total_requests,
+            "total_batches": self.total_batches,
+            "avg_batch_size": self.total_requests / self.total_batches if self.total_batches else 0,
+            "max_batch_seen": self.max_batch_seen,
+            "avg_inference_ms": (
+                self.total_inference_seconds / self.total_batches * 1000
+                if self.total_batches else 0
+            ),
+            "batch_size_histogram": dict(sorted(self.batch_size_histogram.items()))
+        }
@@ -1,12 +1,16 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, func, and_, or_
-from typing import List, Optional, Dict, Any
+from sqlalchemy import desc, func, and_, or_, select, insert, case
+from typing import List, Optional, Dict, Any, Tuple
 import datetime
+import numpy as np
 from . import models
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Bound parameters per IN lookup (stays under SQLite's variable limit)
+IN_LOOKUP_BATCH = 900
+
 class CRUD:
     """CRUD operations for the database"""
     
@@ -35,6 +39,114 @@ class CRUD:
             logger.error(f"Failed to create bulk accidents: {e}")
             raise
     
+    def insert_accidents_skip_existing(
+        self,
+        accidents_data: List[Dict[str, Any]],
+        strategy: str = "auto",
+        commit: bool = True
+    ) -> Tuple[int, int]:
+        """Insert accident rows with one executemany, skipping known accident_index values
+        
+        ``on_conflict`` lets SQLite drop duplicates itself
+        (INSERT ... ON CONFLICT DO NOTHING on the unique accident_index);
+        ``lookup`` finds existing keys with batched IN queries first. ``auto``
+        picks ``on_conflict`` on SQLite. Returns (inserted, skipped).
+        """
+        if not accidents_data:
+            return 0, 0
+        
+        table = models.Accident.__table__
+        if strategy == "auto":
+            strategy = "on_conflict" if self.db.get_bind().dialect.name == "sqlite" else "lookup"
+        
+        try:
+            if strategy == "on_conflict":
+                from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+                
+                stmt = sqlite_insert(table).on_conflict_do_nothing(index_elements=["accident_index"])
+                inserted = self.db.execute(stmt, accidents_data).rowcount
+            else:
+                new_records = self._drop_existing_accidents(accidents_data)
+                if new_records:
+                    self.db.execute(insert(table), new_records)
+                inserted = len(new_records)
+            
+            if commit:
+                self.db.commit()
+            return inserted, len(accidents_data) - inserted
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Failed to insert accidents: {e}")
+            raise
+    
+    def insert_new_accidents(
+        self,
+        accidents_data: List[Dict[str, Any]],
+        strategy: str = "auto",
+        commit: bool = True
+    ) -> List[str]:
+        """Like insert_accidents_skip_existing, but return the accident_index values inserted
+        
+        With ``on_conflict`` the keys come back from INSERT ... ON CONFLICT
+        DO NOTHING RETURNING, so it needs a dialect that supports RETURNING
+        with executemany (SQLite 3.35+); otherwise ``lookup`` is used.
+        """
+        if not accidents_data:
+            return []
+        
+        table = models.Accident.__table__
+        dialect = self.db.get_bind().dialect
+        if strategy in ("auto", "on_conflict"):
+            strategy = (
+                "on_conflict"
+                if dialect.name == "sqlite" and dialect.insert_executemany_returning
+                else "lookup"
+            )
+        
+        try:
+            if strategy == "on_conflict":
+                from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+                
+                stmt = (
+                    sqlite_insert(table)
+                    .on_conflict_do_nothing(index_elements=["accident_index"])
+                    .returning(table.c.accident_index)
+                )
+                inserted = list(self.db.execute(stmt, accidents_data).scalars())
+            else:
+                new_records = self._drop_existing_accidents(accidents_data)
+                if new_records:
+                    self.db.execute(insert(table), new_records)
+                inserted = [record["accident_index"] for record in new_records]
+            
+            if commit:
+                self.db.commit()
+            return inserted
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Failed to insert accidents: {e}")
+            raise
+    
+    def _drop_existing_accidents(self, accidents_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Records whose accident_index is neither stored nor repeated earlier in the list"""
+        table = models.Accident.__table__
+        keys = [record["accident_index"] for record in accidents_data]
+        seen = set()
+        for start in range(0, len(keys), IN_LOOKUP_BATCH):
+            seen.update(self.db.execute(
+                select(table.c.accident_index).where(
+                    table.c.accident_index.in_(keys[start:start + IN_LOOKUP_BATCH])
+                )
+            ).scalars())
+        
+        # Also drops repeats within the batch
+        new_records = []
+        for record in accidents_data:
+            if record["accident_index"] not in seen:
+                seen.add(record["accident_index"])
+                new_records.append(record)
+        return new_records
+    
     def get_accident(self, accident_id: int) -> Optional[models.Accident]:
         """Get accident by ID"""
         return self.db.query(models.Accident).filter(models.Accident.id == accident_id).first()
@@ -55,11 +167,16 @@ class CRUD:
         min_latitude: Optional[float] = None,
         max_latitude: Optional[float] = None,
         min_longitude: Optional[float] = None,
-        max_longitude: Optional[float] = None
+        max_longitude: Optional[float] = None,
+        after_id: Optional[int] = None
     ) -> List[models.Accident]:
         """Get accidents with filtering"""
         query = self.db.query(models.Accident)
         
+        # Only rows ingested after a high-water mark
+        if after_id is not None:
+            query = query.filter(models.Accident.id > after_id)
+        
         # Apply filters
         if severity:
             query = query.filter(models.Accident.severity == severity)
@@ -82,11 +199,84 @@ class CRUD:
         if max_longitude:
             query = query.filter(models.Accident.longitude <= max_longitude)
         
-        # Order by date (newest first)
-        query = query.order_by(desc(models.Accident.accident_date))
+        # Order by date (newest first); rows after a high-water mark come
+        # newest-ingested first, read straight from the id range
+        if after_id is not None:
+            query = query.order_by(desc(models.Accident.id))
+        else:
+            query = query.order_by(desc(models.Accident.accident_date))
         
         return query.offset(skip).limit(limit).all()
     
+    def load_accident_columns(
+        self,
+        columns: List[str],
+        limit: Optional[int] = None,
+        after_id: Optional[int] = None,
+        chunk_size: int = 50000
+    ) -> Dict[str, np.ndarray]:
+        """Load accident columns into typed NumPy arrays
+        
+        Runs a Core select on just ``columns`` (newest accidents first, like
+        get_accidents; newest ingested first with ``after_id``) and streams
+        it in chunks of ``chunk_size`` rows into preallocated arrays,
+        without building ORM objects or per-row dicts.
+        Integer columns come back as int64, or float64 with NaN when they
+        contain NULLs; floats are float64 and everything else is an object
+        array.
+        """
+        table = models.Accident.__table__
+        filters = [table.c.id > after_id] if after_id is not None else []
+        
+        total = self.db.execute(
+            select(func.count()).select_from(table).where(*filters)
+        ).scalar()
+        n_rows = min(total, limit) if limit is not None else total
+        
+        numeric = {
+            name for name in columns
+            if table.c[name].type.python_type in (int, float)
+        }
+        arrays = {
+            name: np.empty(n_rows, dtype=np.float64 if name in numeric else object)
+            for name in columns
+        }
+        
+        # Rows after a high-water mark are read newest-ingested first from
+        # the id range, rather than walking the whole date index
+        order = table.c.id if after_id is not None else table.c.accident_date
+        stmt = (
+            select(*[table.c[name] for name in columns])
+            .where(*filters)
+            .order_by(desc(order))
+        )
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        
+        result = self.db.execute(stmt.execution_options(yield_per=chunk_size))
+        position = 0
+        try:
+            for partition in result.partitions():
+                # Rows inserted after the count are left out
+                end = min(position + len(partition), n_rows)
+                if end == position:
+                    break
+                for name, values in zip(columns, zip(*partition)):
+                    # NULLs become NaN in the float columns
+                    arrays[name][position:end] = values[:end - position]
+                position = end
+        finally:
+            result.close()
+        
+        # Rows deleted after the count leave an unfilled tail
+        for name in columns:
+            array = arrays[name][:position]
+            if name in numeric and table.c[name].type.python_type is int and not np.isnan(array).any():
+                array = array.astype(np.int64)
+            arrays[name] = array
+        
+        return arrays
+    
     def get_accident_statistics(self) -> Dict[str, Any]:
         """Get statistics about accidents"""
         total = self.db.query(models.Accident).count()
@@ -237,6 +427,20 @@ class CRUD:
         self.db.refresh(db_prediction)
         return db_prediction
     
+    def create_predictions_bulk(self, predictions_data: List[Dict[str, Any]]) -> int:
+        """Create multiple prediction records in one bulk insert"""
+        if not predictions_data:
+            return 0
+        
+        try:
+            self.db.bulk_insert_mappings(models.Prediction, predictions_data)
+            self.db.commit()
+            return len(predictions_data)
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Failed to create bulk predictions: {e}")
+            raise
+    
     def update_prediction_outcome(
         self, 
         prediction_id: str, 
@@ -275,26 +479,49 @@ class CRUD:
     
     def get_prediction_metrics(self) -> Dict[str, Any]:
         """Get prediction performance metrics"""
-        total = self.db.query(models.Prediction).count()
+        total = self.db.query(func.count(models.Prediction.id)).scalar()
         
         if total == 0:
             return {"total": 0, "accuracy": 0}
         
-        # Get predictions with actual outcomes
-        reviewed = self.db.query(models.Prediction).filter(
+        # Count predictions with actual outcomes in SQL (served by the
+        # partial ix_predictions_reviewed index)
+        reviewed, correct = self.db.query(
+            func.count(models.Prediction.is_correct),
+            func.coalesce(func.sum(case((models.Prediction.is_correct, 1), else_=0)), 0)
+        ).filter(
             models.Prediction.is_correct.isnot(None)
-        ).all()
+        ).one()
         
         if not reviewed:
             return {"total": total, "reviewed": 0, "accuracy": 0}
         
-        correct = sum(1 for p in reviewed if p.is_correct)
-        accuracy = correct / len(reviewed) if reviewed else 0
+        accuracy = correct / reviewed
         
         return {
             "total": total,
-            "reviewed": len(reviewed),
+            "reviewed": reviewed,
             "accuracy": accuracy,
             "correct": correct,
-            "incorrect": len(reviewed) - correct
-        }
\ No newline at end of file
+            "incorrect": reviewed - correct
+        }
+    
+    # Ingest state operations
+    def get_ingest_state(self, path: str) -> Optional[models.IngestState]:
+        """Get the ingestion checkpoint of a file"""
+        return self.db.query(models.IngestState).filter(models.IngestState.path == path).first()
+    
+    def save_ingest_state(self, path: str, **fields) -> models.IngestState:
+        """Create or update a file's ingestion checkpoint
+        
+        Not committed here: the caller commits it together with the rows
+        it describes.
+        """
+        state = self.get_ingest_state(path)
+        if state is None:
+            state = models.IngestState(path=path)
+            self.db.add(state)
+        for name, value in fields.items():
+            setattr(state, name, value)
+        self.db.flush()
+        return state
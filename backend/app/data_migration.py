@@ -1,17 +1,134 @@
+import hashlib
+import io
+from itertools import islice
 import pandas as pd
 import numpy as np
 from datetime import datetime, time
+import time as time_module
 import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from sqlalchemy.orm import Session
 from . import models, crud
-from .database import SessionLocal, init_db
+from .database import init_db, session_for
 import os
 from config import Config
 
 logger = logging.getLogger(__name__)
 
+# time objects for every minute of the day, indexed by hour * 60 + minute
+_TIMES_BY_MINUTE = np.array(
+    [time(hour=h, minute=m) for h in range(24) for m in range(60)] + [None],
+    dtype=object
+)
+
+# CSV severity codes and labels to stored severity labels
+SEVERITY_MAPPING = {
+    '1': 'Fatal',
+    '2': 'Serious',
+    '3': 'Slight',
+    'Fatal': 'Fatal',
+    'Serious': 'Serious',
+    'Slight': 'Slight'
+}
+
+def _parse_time(time_str):
+    """Parse one time value; the reference behaviour for parse_times"""
+    try:
+        if pd.isna(time_str):
+            return None
+        # Handle various time formats
+        if isinstance(time_str, str):
+            if ':' in time_str:
+                hour, minute = map(int, time_str.split(':')[:2])
+                return time(hour=hour, minute=minute)
+        return None
+    except:
+        return None
+
+def _categorize_time(hour):
+    """Time of day for one hour value; the reference behaviour for categorize_hours"""
+    if hour is None:
+        return 'Unknown'
+    if hour < 6:
+        return 'Night'
+    elif hour < 12:
+        return 'Morning'
+    elif hour < 18:
+        return 'Afternoon'
+    else:
+        return 'Evening'
+
+def parse_dates(values: pd.Series) -> pd.Series:
+    """Parse dates once, like ``pd.to_datetime(values, errors='coerce')``
+    
+    An explicit INGEST_DATE_FORMAT takes the strptime fast path and falls
+    back to inference if any value does not match it. Unset, the format
+    is guessed from the first value exactly as pandas does.
+    """
+    if Config.INGEST_DATE_FORMAT and values.dtype == object:
+        parsed = pd.to_datetime(values, format=Config.INGEST_DATE_FORMAT, errors='coerce')
+        if not (parsed.isna() & values.notna()).any():
+            return parsed
+    return pd.to_datetime(values, errors='coerce')
+
+def parse_times(values: pd.Series) -> Tuple[pd.Series, pd.Series]:
+    """Vectorized ``_parse_time`` plus the derived hour column
+    
+    A time column holds a few thousand distinct values at most, so each
+    distinct value goes through ``_parse_time`` once and the results are
+    mapped back by position; every edge case (whitespace, signs,
+    out-of-range fields) behaves exactly as before. The hour column has the
+    dtype ``.apply(lambda x: x.hour if x else None)`` produced: int64 when
+    every time parsed, float64 with NaN when some did not, and object
+    (all None) when none did.
+    """
+    n = len(values)
+    codes, uniques = pd.factorize(values)
+    
+    unique_minutes = np.full(len(uniques) + 1, -1, dtype=np.int64)
+    for i, value in enumerate(uniques):
+        parsed = _parse_time(value)
+        if parsed is not None:
+            unique_minutes[i] = parsed.hour * 60 + parsed.minute
+    # Missing values have code -1, which picks the trailing -1 entry
+    minute_of_day = unique_minutes[codes]
+    
+    valid = minute_of_day >= 0
+    times = pd.Series(
+        _TIMES_BY_MINUTE[np.where(valid, minute_of_day, len(_TIMES_BY_MINUTE) - 1)],
+        index=values.index,
+        dtype=object
+    )
+    
+    hour_values = minute_of_day // 60
+    if n and valid.all():
+        hours = pd.Series(hour_values, index=values.index, dtype=np.int64)
+    elif valid.any():
+        hours = pd.Series(np.where(valid, hour_values, np.nan), index=values.index, dtype=np.float64)
+    else:
+        hours = pd.Series([None] * n, index=values.index, dtype=object)
+    
+    return times, hours
+
+def categorize_hours(hours: pd.Series) -> pd.Series:
+    """Vectorized ``_categorize_time`` (NaN hours fall through to 'Evening' as before)"""
+    if hours.dtype == object:
+        return hours.apply(_categorize_time)
+    
+    values = hours.to_numpy()
+    labels = np.select(
+        [values < 6, values < 12, values < 18],
+        ['Night', 'Morning', 'Afternoon'],
+        'Evening'
+    )
+    return pd.Series(labels.astype(object), index=hours.index, dtype=object)
+
 def preprocess_accident_data(df: pd.DataFrame) -> pd.DataFrame:
-    """Preprocess accident data for database insertion"""
+    """Preprocess accident data for database insertion
+    
+    Dates are parsed once and reused for the derived fields; time, hour
+    and time-of-day columns are computed column-wise.
+    """
     # Rename columns to match database schema
     column_mapping = {
         'Accident_Index': 'accident_index',
@@ -33,42 +150,20 @@ def preprocess_accident_data(df: pd.DataFrame) -> pd.DataFrame:
     df = df.rename(columns={k: v for k, v in column_mapping.items() if k in df.columns})
     
     # Convert date and time
+    dates = None
     if 'accident_date' in df.columns:
-        df['accident_date'] = pd.to_datetime(df['accident_date'], errors='coerce').dt.date
+        dates = parse_dates(df['accident_date'])
+        df['accident_date'] = dates.dt.date
     
     if 'accident_time' in df.columns:
-        # Convert time string to datetime.time
-        def parse_time(time_str):
-            try:
-                if pd.isna(time_str):
-                    return None
-                # Handle various time formats
-                if isinstance(time_str, str):
-                    if ':' in time_str:
-                        hour, minute = map(int, time_str.split(':')[:2])
-                        return time(hour=hour, minute=minute)
-                return None
-            except:
-                return None
-        
-        df['accident_time'] = df['accident_time'].apply(parse_time)
-        df['hour'] = df['accident_time'].apply(lambda x: x.hour if x else None)
+        df['accident_time'], df['hour'] = parse_times(df['accident_time'])
     
     # Clean severity
     if 'severity' in df.columns:
-        severity_mapping = {
-            '1': 'Fatal',
-            '2': 'Serious',
-            '3': 'Slight',
-            'Fatal': 'Fatal',
-            'Serious': 'Serious',
-            'Slight': 'Slight'
-        }
-        df['severity'] = df['severity'].map(severity_mapping)
+        df['severity'] = df['severity'].map(SEVERITY_MAPPING)
     
-    # Calculate derived features
-    if 'accident_date' in df.columns:
-        dates = pd.to_datetime(df['accident_date'])
+    # Calculate derived features from the same parse
+    if dates is not None:
         df['year'] = dates.dt.year
         df['month'] = dates.dt.month
         df['day'] = dates.dt.day
@@ -77,19 +172,7 @@ def preprocess_accident_data(df: pd.DataFrame) -> pd.DataFrame:
     
     if 'hour' in df.columns:
         # Categorize time of day
-        def categorize_time(hour):
-            if hour is None:
-                return 'Unknown'
-            if hour < 6:
-                return 'Night'
-            elif hour < 12:
-                return 'Morning'
-            elif hour < 18:
-                return 'Afternoon'
-            else:
-                return 'Evening'
-        
-        df['time_of_day'] = df['hour'].apply(categorize_time)
+        df['time_of_day'] = categorize_hours(df['hour'])
     
     # Handle missing values
     numeric_cols = df.select_dtypes(include=[np.number]).columns
@@ -105,52 +188,297 @@ def preprocess_accident_data(df: pd.DataFrame) -> pd.DataFrame:
     
     return df
 
-def load_csv_to_db(csv_path: str = None, batch_size: int = 1000):
-    """Load CSV data into database"""
+class IngestStats:
+    """Row counts and per-stage timings of one ingestion run"""
+    
+    def __init__(self, workers: int = 1):
+        self.workers = workers
+        self.rows_read = 0
+        self.rows_inserted = 0
+        self.rows_skipped = 0
+        self.rows_invalid = 0
+        self.chunks = 0
+        self.parse_seconds = 0.0
+        self.preprocess_seconds = 0.0
+        self.write_seconds = 0.0
+        self.writer_wait_seconds = 0.0
+        self.max_queue_depth = 0
+        self.bytes_read = 0
+        self.total_bytes = 0
+        self.start_offset = 0
+        self.skipped_unchanged = False
+        self.cancelled = False
+        self.started = time_module.perf_counter()
+        self.finished = None
+    
+    def finish(self):
+        self.finished = time_module.perf_counter()
+    
+    @property
+    def elapsed_seconds(self) -> float:
+        return (self.finished or time_module.perf_counter()) - self.started
+    
+    @property
+    def eta_seconds(self) -> Optional[float]:
+        """Remaining time, extrapolated from the share of the file consumed so far"""
+        consumed = self.bytes_read - self.start_offset
+        if self.finished or consumed <= 0 or not self.total_bytes:
+            return None
+        remaining = max(self.total_bytes - self.bytes_read, 0)
+        return self.elapsed_seconds * remaining / consumed
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert stats to dictionary"""
+        elapsed = self.elapsed_seconds
+        stage_seconds = {
+            "parse": self.parse_seconds,
+            "preprocess": self.preprocess_seconds,
+            "write": self.write_seconds
+        }
+        return {
+            "workers": self.workers,
+            "rows_read": self.rows_read,
+            "rows_inserted": self.rows_inserted,
+            "rows_skipped": self.rows_skipped,
+            "rows_invalid": self.rows_invalid,
+            "chunks": self.chunks,
+            "bytes_read": self.bytes_read,
+            "total_bytes": self.total_bytes,
+            "resumed_from_offset": self.start_offset,
+            "skipped_unchanged": self.skipped_unchanged,
+            "cancelled": self.cancelled,
+            "elapsed_seconds": elapsed,
+            "eta_seconds": self.eta_seconds,
+            "rows_per_second": self.rows_read / elapsed if elapsed else 0.0,
+            # Parse and preprocess seconds are summed over workers
+            "stage_seconds": stage_seconds,
+            "stage_rows_per_second": {
+                stage: self.rows_read / seconds if seconds else None
+                for stage, seconds in stage_seconds.items()
+            },
+            "writer_wait_seconds": self.writer_wait_seconds,
+            "max_queue_depth": self.max_queue_depth
+        }
+
+def accident_records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Rows of a preprocessed chunk as insert parameters for the accidents table
+    
+    Columns the table does not have are dropped, as are rows without an
+    accident_index (they cannot be deduplicated).
+    """
+    table_columns = [c.name for c in models.Accident.__table__.columns if c.name != 'id']
+    records = df[[c for c in table_columns if c in df.columns]].to_dict('records')
+    return [record for record in records if record.get('accident_index')]
+
+def file_fingerprint(csv_path: str, sample_bytes: int = None) -> Dict[str, Any]:
+    """Size, mtime and a hash of the first and last ``sample_bytes`` of a file
+    
+    Reading only the ends keeps the cost independent of file size.
+    """
+    sample_bytes = sample_bytes or Config.INGEST_HASH_SAMPLE_BYTES
+    stat = os.stat(csv_path)
+    digest = hashlib.sha256(str(stat.st_size).encode())
+    with open(csv_path, 'rb') as f:
+        digest.update(f.read(sample_bytes))
+        if stat.st_size > sample_bytes:
+            f.seek(max(stat.st_size - sample_bytes, sample_bytes))
+            digest.update(f.read())
+    return {"size": stat.st_size, "mtime": stat.st_mtime, "content_hash": digest.hexdigest()}
+
+class IngestCheckpoint:
+    """Durable progress of one file's load, kept in the ingest_state table
+    
+    A load starts at the stored offset if the file's fingerprint is
+    unchanged, or right after the header otherwise. ``record`` stages the
+    new offset in the caller's transaction, so it becomes durable exactly
+    when the rows before it are committed.
+    """
+    
+    def __init__(self, crud_obj: crud.CRUD, csv_path: str, header_length: int, resume: bool = True):
+        self.crud = crud_obj
+        self.path = os.path.abspath(csv_path)
+        self.fingerprint = file_fingerprint(csv_path)
+        
+        state = crud_obj.get_ingest_state(self.path)
+        unchanged = resume and state is not None and all(
+            getattr(state, name) == value for name, value in self.fingerprint.items()
+        )
+        self.completed = bool(unchanged and state.completed)
+        self.offset = max(state.offset, header_length) if unchanged else header_length
+        self.base_rows = (state.rows_committed or 0) if unchanged else 0
+        self.fresh = not unchanged
+    
+    def begin(self):
+        """Stage the checkpoint for a load starting at ``offset``"""
+        fields = dict(self.fingerprint, offset=self.offset, completed=False, completed_at=None)
+        if self.fresh:
+            fields.update(rows_committed=0, started_at=datetime.utcnow())
+        self.crud.save_ingest_state(self.path, **fields)
+    
+    def record(self, offset: int, rows_inserted: int):
+        """Stage the offset just past the rows about to be committed"""
+        self.offset = offset
+        self.crud.save_ingest_state(
+            self.path, offset=offset, rows_committed=self.base_rows + rows_inserted
+        )
+    
+    def complete(self):
+        """Stage the file as fully loaded"""
+        self.crud.save_ingest_state(self.path, completed=True, completed_at=datetime.utcnow())
+
+def read_csv_lines(csv_file, n_lines: int) -> List[bytes]:
+    """Read about ``n_lines`` lines, ending on a record boundary
+    
+    A newline inside a quoted field leaves an odd number of quote
+    characters before it (escaped quotes come in pairs), so lines are added
+    until the count is even again; the position after the last line is
+    then always a valid place to split or resume the file.
+    """
+    lines = list(islice(csv_file, n_lines))
+    quotes = sum(line.count(b'"') for line in lines)
+    while quotes % 2:
+        line = csv_file.readline()
+        if not line:
+            break
+        lines.append(line)
+        quotes += line.count(b'"')
+    return lines
+
+def load_csv_to_db(
+    csv_path: str = None,
+    batch_size: int = None,
+    commit_every: int = None,
+    strategy: str = None,
+    workers: int = None,
+    resume: bool = True,
+    progress: Optional[Callable[[IngestStats], None]] = None,
+    should_cancel: Optional[Callable[[], bool]] = None
+) -> Optional[Dict[str, Any]]:
+    """Load CSV data into database
+    
+    The CSV is streamed in chunks of ``batch_size`` rows; each chunk is
+    preprocessed and written with one executemany that skips accident_index
+    values already stored (see CRUD.insert_accidents_skip_existing), and the
+    transaction is committed every ``commit_every`` rows. Returns ingestion
+    stats, including rows/sec and time spent per stage.
+    
+    With ``workers`` > 1 parsing and preprocessing run in parallel worker
+    processes instead (see ingest_pipeline.load_csv_parallel).
+    
+    Every commit also records the byte offset reached in the file's
+    ingest_state checkpoint. A later call resumes from that offset, and
+    returns at once if the file is unchanged and was loaded completely;
+    ``resume=False`` ignores the checkpoint and reloads from the start.
+    Chunks always end on a record boundary (see read_csv_lines), so quoted
+    fields with embedded newlines are loaded intact.
+    
+    ``progress(stats)`` is called after every chunk. Once ``should_cancel()``
+    returns True the load stops after the current chunk; chunks already
+    written are committed and the stats are returned with ``cancelled`` set.
+    """
     csv_path = csv_path or Config.DATA_PATH
+    batch_size = batch_size or Config.INGEST_CHUNK_SIZE
+    commit_every = commit_every or Config.INGEST_COMMIT_ROWS
+    strategy = strategy or Config.INGEST_DEDUP_STRATEGY
+    workers = workers or Config.INGEST_WORKERS
     
     if not os.path.exists(csv_path):
         logger.error(f"CSV file not found: {csv_path}")
-        return
+        return None
+    
+    if workers > 1:
+        from .ingest_pipeline import load_csv_parallel
+        return load_csv_parallel(
+            csv_path, workers, commit_every=commit_every, strategy=strategy,
+            resume=resume, progress=progress, should_cancel=should_cancel
+        )
     
     logger.info(f"Loading data from {csv_path}")
     
+    stats = IngestStats()
+    stats.total_bytes = os.path.getsize(csv_path)
+    csv_file = open(csv_path, 'rb')
+    db = session_for("bulk_load")
     try:
-        # Read CSV in chunks
-        chunks = pd.read_csv(csv_path, chunksize=batch_size)
-        
-        db = SessionLocal()
         crud_obj = crud.CRUD(db)
+        header = csv_file.readline()
+        checkpoint = IngestCheckpoint(crud_obj, csv_path, len(header), resume=resume)
+        if checkpoint.completed:
+            logger.info(f"{csv_path} is unchanged and already loaded, skipping")
+            stats.skipped_unchanged = True
+            stats.bytes_read = stats.start_offset = stats.total_bytes
+            stats.finish()
+            return stats.to_dict()
         
-        total_loaded = 0
+        offset = stats.bytes_read = stats.start_offset = checkpoint.offset
+        if offset > len(header):
+            logger.info(f"Resuming {csv_path} at byte {offset} of {stats.total_bytes}")
+        checkpoint.begin()
+        csv_file.seek(offset)
+        uncommitted = 0
         
-        for chunk in chunks:
-            # Preprocess chunk
-            processed_chunk = preprocess_accident_data(chunk)
+        while not (should_cancel and should_cancel()):
+            # Whole records, so the offset after a chunk is a valid restart point
+            started = time_module.perf_counter()
+            lines = read_csv_lines(csv_file, batch_size)
+            if not lines:
+                stats.parse_seconds += time_module.perf_counter() - started
+                break
+            offset += sum(len(line) for line in lines)
+            chunk = pd.read_csv(io.BytesIO(header + b''.join(lines)))
+            stats.parse_seconds += time_module.perf_counter() - started
             
-            # Convert to list of dictionaries
-            records = processed_chunk.to_dict('records')
+            started = time_module.perf_counter()
+            records = accident_records(preprocess_accident_data(chunk))
+            stats.preprocess_seconds += time_module.perf_counter() - started
             
-            # Filter out records that already exist
-            unique_records = []
-            for record in records:
-                if 'accident_index' in record and record['accident_index']:
-                    existing = crud_obj.get_accident_by_index(record['accident_index'])
-                    if not existing:
-                        unique_records.append(record)
+            started = time_module.perf_counter()
+            inserted, skipped = crud_obj.insert_accidents_skip_existing(
+                records, strategy=strategy, commit=False
+            )
+            uncommitted += len(records)
+            stats.rows_inserted += inserted
+            if uncommitted >= commit_every:
+                checkpoint.record(offset, stats.rows_inserted)
+                db.commit()
+                uncommitted = 0
+            stats.write_seconds += time_module.perf_counter() - started
             
-            if unique_records:
-                # Insert records
-                count = crud_obj.create_accidents_bulk(unique_records)
-                total_loaded += count
-                logger.info(f"Loaded {count} records, total: {total_loaded}")
+            stats.chunks += 1
+            stats.rows_read += len(chunk)
+            stats.rows_invalid += len(chunk) - len(records)
+            stats.rows_skipped += skipped
+            stats.bytes_read = offset
+            logger.info(f"Loaded {inserted} records, total: {stats.rows_inserted}")
+            if progress:
+                progress(stats)
+        else:
+            # Loop condition failed: cancelled rather than end of file
+            stats.cancelled = True
+            logger.info("Data migration cancelled")
         
-        db.close()
-        logger.info(f"Data migration completed. Total records loaded: {total_loaded}")
+        started = time_module.perf_counter()
+        checkpoint.record(offset, stats.rows_inserted)
+        if not stats.cancelled:
+            checkpoint.complete()
+        db.commit()
+        stats.write_seconds += time_module.perf_counter() - started
         
     except Exception as e:
+        db.rollback()
         logger.error(f"Failed to load data: {e}")
         raise
+    finally:
+        csv_file.close()
+        db.close()
+    
+    stats.finish()
+    result = stats.to_dict()
+    logger.info(
+        f"Data migration completed. Total records loaded: {stats.rows_inserted} "
+        f"({result['rows_per_second']:.0f} rows/sec, {stats.rows_skipped} duplicates skipped)"
+    )
+    return result
 
 def run_migration():
     """Run the data migration"""
@@ -1,5 +1,136 @@
+import logging
+import threading
+from typing import Any, Dict, Optional
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.orm import Session, declarative_base, sessionmaker
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Connection profiles: SQLite pragmas run on every new connection, pool
+# settings size the connection pool. WAL lets readers run alongside the
+# single writer; busy_timeout makes a blocked writer wait instead of
+# failing with "database is locked". Negative cache_size is in KiB.
+ENGINE_PROFILES: Dict[str, Dict[str, Any]] = {
+    # Request handling: many short reads plus the prediction writer. A
+    # writer blocked by a bulk-load transaction waits up to busy_timeout,
+    # so INGEST_COMMIT_ROWS keeps ingestion transactions well below it
+    "oltp": {
+        "pragmas": {
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "busy_timeout": 5000,
+            "cache_size": -16384,
+            "temp_store": "MEMORY",
+            "foreign_keys": "ON"
+        },
+        "pool": {"pool_size": 10, "max_overflow": 20, "pool_timeout": 30}
+    },
+    # Large ingestion transactions from a single writer: a big page cache,
+    # a long lock wait and fewer automatic WAL checkpoints
+    "bulk_load": {
+        "pragmas": {
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "busy_timeout": 60000,
+            "cache_size": -262144,
+            "temp_store": "MEMORY",
+            "wal_autocheckpoint": 10000
+        },
+        "pool": {"pool_size": 1, "max_overflow": 1, "pool_timeout": 60}
+    },
+    # Long aggregate scans: memory-mapped reads and a large cache
+    "analytics": {
+        "pragmas": {
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "busy_timeout": 10000,
+            "cache_size": -131072,
+            "mmap_size": 1024 * 1024 * 1024,
+            "temp_store": "MEMORY"
+        },
+        "pool": {"pool_size": 4, "max_overflow": 4, "pool_timeout": 30}
+    }
+}
+
+
+def _apply_pragmas(engine: Engine, pragmas: Dict[str, Any]):
+    """Run the profile's pragmas on every connection the engine opens"""
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+def create_profile_engine(profile: str = "oltp", url: Optional[str] = None) -> Engine:
+    """Create an engine tuned for one of ENGINE_PROFILES"""
+    if profile not in ENGINE_PROFILES:
+        raise ValueError(f"Unknown database profile {profile!r} (choose from {', '.join(ENGINE_PROFILES)})")
+
+    settings = ENGINE_PROFILES[profile]
+    url = make_url(url or Config.DATABASE_URL)
+    kwargs: Dict[str, Any] = {}
+
+    if url.get_backend_name() == "sqlite":
+        # Sessions are used from executor threads, one thread at a time
+        kwargs["connect_args"] = {"check_same_thread": False}
+        # In-memory databases use a single shared connection, not a pool
+        if url.database not in (None, "", ":memory:"):
+            kwargs.update(settings["pool"])
+    else:
+        kwargs.update(settings["pool"])
+        kwargs["pool_pre_ping"] = True
+
+    engine = create_engine(url, **kwargs)
+    if url.get_backend_name() == "sqlite":
+        _apply_pragmas(engine, settings["pragmas"])
+
+    logger.info(f"Database engine created with profile {profile}")
+    return engine
+
+
+_engines: Dict[str, Engine] = {}
+_engines_lock = threading.Lock()
+
+
+def get_engine(profile: str) -> Engine:
+    """Shared engine for a profile, created on first use"""
+    with _engines_lock:
+        if profile not in _engines:
+            _engines[profile] = create_profile_engine(profile)
+        return _engines[profile]
+
+
+def session_for(profile: str) -> Session:
+    """New session on a profile's engine
+
+    Lets a workload (e.g. a bulk load) use its own tuned connections for
+    the lifetime of the session without affecting the main engine.
+    """
+    return Session(bind=get_engine(profile), autoflush=False)
+
+
+engine = get_engine(Config.DB_PROFILE)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+Base = declarative_base()
+
 from . import models
-from .auth import get_password_hash
+
+
+def get_db():
+    """Database session per request"""
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
 
 def init_db():
     """Initialize database and create tables"""
@@ -17,6 +148,7 @@ def init_db():
 def create_default_admin():
     """Create default admin user"""
     from config import Config
+    from .auth import get_password_hash
     
     db = SessionLocal()
     try:
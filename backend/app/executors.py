@@ -0,0 +1,123 @@
+import asyncio
+import functools
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict
+from fastapi import HTTPException
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class BoundedExecutor:
+    """Thread pool with a bounded backlog for use from async handlers
+
+    At most ``max_workers`` calls run at once and at most ``max_queue`` more
+    may wait for a worker. Once both are full, ``run`` fails fast with a 503
+    and a Retry-After header instead of letting the backlog grow without
+    bound.
+
+    A call counts as in flight until its worker thread finishes, not until
+    its awaiter returns: a cancelled awaiter (client disconnect, timeout)
+    cannot stop a running thread, so its slot is only freed once the
+    thread is done.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_queue: int, retry_after: int = 1):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self.total_submitted = 0
+        self.total_rejected = 0
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run ``fn`` in the pool and await its result"""
+        with self._lock:
+            if self._in_flight >= self.max_workers + self.max_queue:
+                self.total_rejected += 1
+                logger.warning(f"{self.name} executor saturated ({self._in_flight} in flight)")
+                raise HTTPException(
+                    status_code=503,
+                    detail=f"Server busy ({self.name} pool saturated), retry later",
+                    headers={"Retry-After": str(self.retry_after)}
+                )
+            self._in_flight += 1
+            self.total_submitted += 1
+
+        try:
+            future = self._pool.submit(functools.partial(fn, *args, **kwargs))
+        except Exception:
+            self._release()
+            raise
+        # Runs in the worker thread when the call finishes (or at once if
+        # the call was cancelled before it started)
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def _release(self, future: Future = None):
+        """Free the slot of a finished call"""
+        with self._lock:
+            self._in_flight -= 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool occupancy statistics"""
+        return {
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": self._in_flight,
+            "queued": max(0, self._in_flight - self.max_workers),
+            "total_submitted": self.total_submitted,
+            "total_rejected": self.total_rejected
+        }
+
+    def shutdown(self):
+        """Shut down the pool, waiting for running calls"""
+        self._pool.shutdown(wait=True)
+
+
+# Database I/O (SQLAlchemy sessions)
+db_executor = BoundedExecutor(
+    "db",
+    max_workers=Config.DB_EXECUTOR_WORKERS,
+    max_queue=Config.DB_EXECUTOR_QUEUE,
+    retry_after=Config.EXECUTOR_RETRY_AFTER
+)
+
+# CPU-heavy work: model inference, training and pandas analytics.
+# A thread pool is used because the predictor is shared in-process state;
+# sklearn tree traversal and numpy/pandas kernels release the GIL.
+cpu_executor = BoundedExecutor(
+    "cpu",
+    max_workers=Config.CPU_EXECUTOR_WORKERS,
+    max_queue=Config.CPU_EXECUTOR_QUEUE,
+    retry_after=Config.EXECUTOR_RETRY_AFTER
+)
+
+
+async def run_db(fn: Callable, *args, **kwargs) -> Any:
+    """Run a blocking database call off the event loop"""
+    return await db_executor.run(fn, *args, **kwargs)
+
+
+async def run_cpu(fn: Callable, *args, **kwargs) -> Any:
+    """Run CPU-heavy work off the event loop"""
+    return await cpu_executor.run(fn, *args, **kwargs)
+
+
+def get_executor_stats() -> Dict[str, Any]:
+    """Get statistics for all executors"""
+    return {
+        "db": db_executor.get_stats(),
+        "cpu": cpu_executor.get_stats()
+    }
+
+
+def shutdown_executors():
+    """Shut down all executors"""
+    db_executor.shutdown()
+    cpu_executor.shutdown()
@@ -0,0 +1,203 @@
+import io
+import logging
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+import pandas as pd
+from config import Config
+from . import crud
+from .data_migration import IngestCheckpoint, IngestStats, accident_records, preprocess_accident_data
+from .database import session_for
+
+logger = logging.getLogger(__name__)
+
+
+def read_csv_header(csv_path: str) -> bytes:
+    """First line of a CSV file, including its line terminator"""
+    with open(csv_path, 'rb') as f:
+        return f.readline()
+
+
+def iter_csv_blocks(
+    csv_path: str,
+    block_size: int,
+    start: Optional[int] = None
+) -> Iterator[Tuple[int, int]]:
+    """Split a CSV body into (start, end) byte ranges ending on record boundaries
+
+    Ranges cover everything after the header line, or after ``start``,
+    which must be a record boundary. Like read_csv_lines, a range is
+    extended line by line while it holds an odd number of quote
+    characters, so a quoted field with embedded newlines is never cut and
+    every ``workers`` setting parses the file the same way.
+    """
+    with open(csv_path, 'rb') as f:
+        header = f.readline()
+        size = os.fstat(f.fileno()).st_size
+        start = max(start or 0, len(header))
+        f.seek(start)
+        while start < size:
+            quotes = f.read(block_size).count(b'"')
+            # Finish the line the cut landed in, then any quoted field left open
+            line = f.readline()
+            quotes += line.count(b'"')
+            while quotes % 2 and line:
+                line = f.readline()
+                quotes += line.count(b'"')
+            end = f.tell()
+            yield start, end
+            start = end
+
+
+def _parse_block(csv_path: str, header: bytes, start: int, end: int) -> Dict[str, Any]:
+    """Worker: read, parse and preprocess one byte range into insert parameters"""
+    started = time.perf_counter()
+    with open(csv_path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    chunk = pd.read_csv(io.BytesIO(header + data))
+    parsed = time.perf_counter()
+
+    records = accident_records(preprocess_accident_data(chunk))
+    return {
+        'records': records,
+        'rows_read': len(chunk),
+        'end': end,
+        'parse_seconds': parsed - started,
+        'preprocess_seconds': time.perf_counter() - parsed
+    }
+
+
+def load_csv_parallel(
+    csv_path: str,
+    workers: int,
+    block_size: Optional[int] = None,
+    queue_blocks: Optional[int] = None,
+    commit_every: Optional[int] = None,
+    strategy: Optional[str] = None,
+    resume: bool = True,
+    progress: Optional[Callable[[IngestStats], None]] = None,
+    should_cancel: Optional[Callable[[], bool]] = None
+) -> Dict[str, Any]:
+    """Parse a CSV in parallel worker processes and insert it with one writer
+
+    Workers parse and preprocess byte ranges of ``block_size`` bytes; this
+    thread is the only database writer, as SQLite allows one. At most
+    ``queue_blocks`` blocks are submitted but not yet written, so parsers
+    wait for a slow writer instead of buffering the whole file. Blocks
+    are written in file order, so duplicate handling matches the
+    sequential loader, as do checkpointing, ``resume``, ``progress`` and
+    ``should_cancel``; blocks still being parsed when a load is cancelled
+    are discarded.
+    """
+    block_size = block_size or Config.INGEST_BLOCK_BYTES
+    queue_blocks = queue_blocks or Config.INGEST_QUEUE_BLOCKS or 2 * workers
+    commit_every = commit_every or Config.INGEST_COMMIT_ROWS
+    strategy = strategy or Config.INGEST_DEDUP_STRATEGY
+
+    logger.info(f"Loading data from {csv_path} with {workers} parser processes")
+
+    header = read_csv_header(csv_path)
+    stats = IngestStats(workers=workers)
+    stats.total_bytes = os.path.getsize(csv_path)
+    pending = deque()
+
+    db = session_for("bulk_load")
+    crud_obj = crud.CRUD(db)
+    try:
+        checkpoint = IngestCheckpoint(crud_obj, csv_path, len(header), resume=resume)
+    except Exception:
+        db.close()
+        raise
+    if checkpoint.completed:
+        db.close()
+        logger.info(f"{csv_path} is unchanged and already loaded, skipping")
+        stats.skipped_unchanged = True
+        stats.bytes_read = stats.start_offset = stats.total_bytes
+        stats.finish()
+        return stats.to_dict()
+
+    offset = stats.bytes_read = stats.start_offset = checkpoint.offset
+    if offset > len(header):
+        logger.info(f"Resuming {csv_path} at byte {offset} of {stats.total_bytes}")
+    blocks = iter_csv_blocks(csv_path, block_size, start=offset)
+
+    ctx = multiprocessing.get_context("spawn")
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=ctx)
+    try:
+        checkpoint.begin()
+        uncommitted = 0
+
+        def fill():
+            # Backpressure: only keep queue_blocks blocks in flight
+            while len(pending) < queue_blocks:
+                block = next(blocks, None)
+                if block is None:
+                    return
+                pending.append(pool.submit(_parse_block, csv_path, header, *block))
+            stats.max_queue_depth = max(stats.max_queue_depth, len(pending))
+
+        fill()
+        while pending:
+            if should_cancel and should_cancel():
+                stats.cancelled = True
+                logger.info("Data migration cancelled")
+                break
+            future = pending.popleft()
+
+            waited = time.perf_counter()
+            result = future.result()
+            stats.writer_wait_seconds += time.perf_counter() - waited
+            fill()
+
+            started = time.perf_counter()
+            records = result['records']
+            inserted, skipped = crud_obj.insert_accidents_skip_existing(
+                records, strategy=strategy, commit=False
+            )
+            uncommitted += len(records)
+            offset = result['end']
+            stats.rows_inserted += inserted
+            if uncommitted >= commit_every:
+                checkpoint.record(offset, stats.rows_inserted)
+                db.commit()
+                uncommitted = 0
+            stats.write_seconds += time.perf_counter() - started
+
+            stats.chunks += 1
+            stats.rows_read += result['rows_read']
+            stats.rows_invalid += result['rows_read'] - len(records)
+            stats.rows_skipped += skipped
+            stats.parse_seconds += result['parse_seconds']
+            stats.preprocess_seconds += result['preprocess_seconds']
+            stats.bytes_read = offset
+            logger.info(f"Loaded {inserted} records, total: {stats.rows_inserted}")
+            if progress:
+                progress(stats)
+
+        started = time.perf_counter()
+        checkpoint.record(offset, stats.rows_inserted)
+        if not stats.cancelled:
+            checkpoint.complete()
+        db.commit()
+        stats.write_seconds += time.perf_counter() - started
+
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Failed to load data: {e}")
+        raise
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+        db.close()
+
+    stats.finish()
+    result = stats.to_dict()
+    logger.info(
+        f"Data migration completed. Total records loaded: {stats.rows_inserted} "
+        f"({result['rows_per_second']:.0f} rows/sec with {workers} workers, "
+        f"writer waited {stats.writer_wait_seconds:.1f}s)"
+    )
+    return result
@@ -0,0 +1,157 @@
+import logging
+import queue
+import threading
+from typing import Any, Dict, Optional
+from sqlalchemy import func, select
+from config import Config
+from .jobs import JobStore, Job, QUEUED, DONE, FAILED, CANCELLED
+from .database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# Rows loaded by a sample_only migration
+SAMPLE_SIZE = 1000
+
+
+def count_accidents() -> int:
+    """Number of rows in the accidents table"""
+    from .models import Accident
+
+    db = SessionLocal()
+    try:
+        return db.execute(select(func.count()).select_from(Accident.__table__)).scalar_one()
+    finally:
+        db.close()
+
+
+def load_sample_to_db(size: int = SAMPLE_SIZE) -> Dict[str, Any]:
+    """Insert a random sample of the CSV data, for testing"""
+    from . import crud
+    from .ml_model.model_training import AccidentPredictor
+
+    # Only the data is needed; do not load or train a model
+    predictor = AccidentPredictor(use_database=False, initialize=False)
+    predictor.load_and_preprocess_data()
+    sample_data = predictor.data.sample(n=min(size, len(predictor.data)), random_state=42)
+
+    db = SessionLocal()
+    try:
+        count = crud.CRUD(db).create_accidents_bulk(sample_data.to_dict('records'))
+    finally:
+        db.close()
+    return {"rows_read": len(sample_data), "rows_inserted": count}
+
+
+class IngestionJobRunner:
+    """Run CSV ingestion jobs one at a time on a background thread
+
+    Ingestion is bound by the database writer (SQLite allows one), so jobs
+    run serially; parallel parsing, when configured, happens in the
+    loader's own worker processes. Progress (rows parsed, inserted and
+    skipped as duplicates, rows/sec, ETA) is copied to the job after every
+    chunk, and cancellation stops the load at the next chunk boundary.
+    """
+
+    def __init__(self, store: JobStore):
+        self.store = store
+        self._queue: "queue.Queue[Optional[Job]]" = queue.Queue()
+        self._thread = None
+
+    def start(self):
+        """Start the job runner thread"""
+        self._thread = threading.Thread(target=self._run, name="ingestion-jobs", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the runner, cancelling queued and running jobs"""
+        for job in self.store.list(kind="ingestion"):
+            if not job.finished:
+                self.cancel(job.id)
+        self._queue.put(None)
+        if self._thread:
+            self._thread.join(timeout=30)
+            self._thread = None
+
+    def submit(self, params: Optional[Dict[str, Any]] = None) -> Job:
+        """Queue an ingestion job"""
+        job = self.store.create("ingestion", params)
+        self._queue.put(job)
+        logger.info(f"Ingestion job {job.id} queued")
+        return job
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """Cancel a queued or running job"""
+        job = self.store.get(job_id)
+        if job is None or job.finished:
+            return job
+
+        job.cancel_requested = True
+        if job.status == QUEUED:
+            job.finish(CANCELLED)
+        logger.info(f"Ingestion job {job.id} cancellation requested")
+        return job
+
+    def _run(self):
+        """Runner loop: execute queued jobs in order"""
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            if job.finished:
+                continue
+            try:
+                self._execute(job)
+            except Exception as e:
+                logger.error(f"Ingestion job {job.id} failed: {e}")
+                job.finish(FAILED, error=f"{type(e).__name__}: {e}")
+
+    def _execute(self, job: Job):
+        """Run one job on this thread"""
+        from .data_migration import load_csv_to_db
+
+        job.start()
+        job.set_stage("loading", 0.0)
+        before_count = count_accidents()
+
+        if job.params.get("sample_only"):
+            result = load_sample_to_db()
+        else:
+            def progress(stats):
+                job.update(
+                    progress=stats.bytes_read / stats.total_bytes if stats.total_bytes else None,
+                    rows_parsed=stats.rows_read,
+                    rows_inserted=stats.rows_inserted,
+                    rows_skipped=stats.rows_skipped,
+                    rows_invalid=stats.rows_invalid,
+                    rows_per_second=stats.rows_read / stats.elapsed_seconds if stats.elapsed_seconds else 0.0,
+                    eta_seconds=stats.eta_seconds,
+                    resumed_from_offset=stats.start_offset
+                )
+
+            result = load_csv_to_db(
+                csv_path=job.params.get("csv_path"),
+                workers=job.params.get("workers"),
+                resume=job.params.get("resume", True),
+                progress=progress,
+                should_cancel=lambda: job.cancel_requested
+            )
+            if result is None:
+                raise FileNotFoundError(
+                    f"CSV file not found: {job.params.get('csv_path') or Config.DATA_PATH}"
+                )
+
+        after_count = count_accidents()
+        result = dict(
+            result,
+            records_before=before_count,
+            records_after=after_count,
+            records_added=after_count - before_count
+        )
+
+        if result.get("cancelled"):
+            job.finish(CANCELLED, result=result)
+            logger.info(f"Ingestion job {job.id} cancelled after {result['rows_inserted']} rows")
+            return
+
+        job.finish(DONE, result=result)
+        logger.info(f"Ingestion job {job.id} completed")
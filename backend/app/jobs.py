@@ -0,0 +1,141 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED_STATES = (DONE, FAILED, CANCELLED)
+
+
+class Job:
+    """State of one background job (training, ingestion, ...)"""
+
+    def __init__(self, kind: str, params: Optional[Dict[str, Any]] = None):
+        self.id = f"{kind.upper()}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{str(uuid.uuid4())[:8]}"
+        self.kind = kind
+        self.params = params or {}
+        self.status = QUEUED
+        self.stage = None
+        self.progress = 0.0
+        self.message = None
+        self.result = None
+        self.error = None
+        self.counters: Dict[str, Any] = {}
+        self.cancel_requested = False
+
+        self.created_at = datetime.now()
+        self.started_at = None
+        self.finished_at = None
+        self.stage_seconds: Dict[str, float] = {}
+        self._stage_started = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Mark the job as running"""
+        with self._lock:
+            self.status = RUNNING
+            self.started_at = datetime.now()
+
+    def set_stage(self, stage: str, progress: Optional[float] = None, message: Optional[str] = None):
+        """Enter a new stage, recording how long the previous one took"""
+        with self._lock:
+            self._close_stage()
+            self.stage = stage
+            self._stage_started = time.perf_counter()
+            if progress is not None:
+                self.progress = progress
+            if message is not None:
+                self.message = message
+
+    def update(self, progress: Optional[float] = None, **counters):
+        """Update progress and free-form counters within the current stage"""
+        with self._lock:
+            if progress is not None:
+                self.progress = progress
+            self.counters.update(counters)
+
+    def finish(self, status: str, result: Any = None, error: Optional[str] = None):
+        """Mark the job as finished"""
+        with self._lock:
+            self._close_stage()
+            self.status = status
+            self.result = result
+            self.error = error
+            self.finished_at = datetime.now()
+            if status == DONE:
+                self.progress = 1.0
+
+    def _close_stage(self):
+        if self.stage is not None and self._stage_started is not None:
+            self.stage_seconds[self.stage] = (
+                self.stage_seconds.get(self.stage, 0.0) + time.perf_counter() - self._stage_started
+            )
+            self._stage_started = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert job to dictionary"""
+        with self._lock:
+            end = self.finished_at or datetime.now()
+            return {
+                "job_id": self.id,
+                "kind": self.kind,
+                "status": self.status,
+                "stage": self.stage,
+                "progress": round(self.progress, 4),
+                "message": self.message,
+                "params": self.params,
+                "counters": dict(self.counters),
+                "result": self.result,
+                "error": self.error,
+                "cancel_requested": self.cancel_requested,
+                "created_at": self.created_at.isoformat(),
+                "started_at": self.started_at.isoformat() if self.started_at else None,
+                "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+                "elapsed_seconds": (end - self.started_at).total_seconds() if self.started_at else None,
+                "stage_seconds": dict(self.stage_seconds)
+            }
+
+
+class JobStore:
+    """Thread-safe registry of recent jobs"""
+
+    def __init__(self, max_history: int = 100):
+        self.max_history = max_history
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def create(self, kind: str, params: Optional[Dict[str, Any]] = None) -> Job:
+        """Create and register a new job"""
+        job = Job(kind, params)
+        with self._lock:
+            self._jobs[job.id] = job
+            # Forget the oldest finished jobs beyond the history limit
+            while len(self._jobs) > self.max_history:
+                oldest = next((j for j in self._jobs.values() if j.finished), None)
+                if oldest is None:
+                    break
+                del self._jobs[oldest.id]
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Get job by ID"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list(self, kind: Optional[str] = None) -> List[Job]:
+        """List jobs, newest first"""
+        with self._lock:
+            jobs = [job for job in self._jobs.values() if kind is None or job.kind == kind]
+        return list(reversed(jobs))
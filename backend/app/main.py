@@ -1,20 +1,48 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
+import asyncio
+import time
 import pandas as pd
 import numpy as np
 from config import Config
 from .routes import router
 import logging
-from .database import init_db, get_db
+from .database import init_db, get_db, SessionLocal
 from .data_migration import run_migration
 from .admin_routes import router as admin_router
+from .batching import PredictionBatcher
+from .executors import get_executor_stats, shutdown_executors, run_cpu
+from .write_behind import PredictionWriter
+from .jobs import JobStore
+from .training_jobs import TrainingJobRunner, install_trained_version
+from .ingestion_jobs import IngestionJobRunner
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+async def load_predictor(app: FastAPI):
+    """Load (or train) the model in the background, warm it up, then mark ready"""
+    from .ml_model.model_training import AccidentPredictor
+    
+    app.state.model_status = "loading"
+    started = time.perf_counter()
+    try:
+        predictor = await run_cpu(AccidentPredictor)
+        await run_cpu(predictor.compact_data)
+        await run_cpu(predictor.warm_up)
+        
+        app.state.predictor = predictor
+        app.state.model_status = "ready"
+        app.state.model_load_seconds = time.perf_counter() - started
+        logger.info(f"ML model loaded and warmed up in {app.state.model_load_seconds:.1f}s")
+    except Exception as e:
+        logger.error(f"Failed to load ML model: {e}")
+        app.state.model_status = "failed"
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for startup/shutdown events"""
@@ -32,21 +60,68 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Database initialization failed: {e}")
     
-    # Load ML model
-    try:
-        from .ml_model.model_training import AccidentPredictor
-        app.state.predictor = AccidentPredictor()
-        logger.info("ML model loaded successfully")
-    except Exception as e:
-        logger.error(f"Failed to load ML model: {e}")
-        app.state.predictor = None
+    # Load ML model in the background so the server accepts connections
+    # immediately; /api/ready reports when predictions can be served
+    app.state.predictor = None
+    app.state.model_status = "loading"
+    app.state.model_load_seconds = None
+    app.state.model_loader = asyncio.create_task(load_predictor(app))
+    
+    # Start micro-batcher for concurrent predictions
+    app.state.batcher = None
+    if Config.PREDICTION_BATCHING:
+        app.state.batcher = PredictionBatcher(
+            get_predictor=lambda: app.state.predictor,
+            max_batch_size=Config.BATCH_MAX_SIZE,
+            max_wait_us=Config.BATCH_MAX_WAIT_US
+        )
+        app.state.batcher.start()
+    
+    # Start write-behind buffer for prediction history
+    app.state.prediction_writer = None
+    if Config.PREDICTION_WRITE_BEHIND:
+        app.state.prediction_writer = PredictionWriter(
+            session_factory=SessionLocal,
+            batch_size=Config.WRITE_BEHIND_BATCH_SIZE,
+            flush_interval=Config.WRITE_BEHIND_FLUSH_INTERVAL_MS / 1000,
+            max_pending=Config.WRITE_BEHIND_MAX_PENDING,
+            max_retries=Config.WRITE_BEHIND_MAX_RETRIES,
+            retry_delay=Config.WRITE_BEHIND_RETRY_DELAY_MS / 1000
+        )
+        app.state.prediction_writer.start()
+    
+    # Start training job runner; promoted versions hot-swap the served model
+    app.state.jobs = JobStore()
+    app.state.training_jobs = TrainingJobRunner(
+        app.state.jobs,
+        on_complete=lambda job, result: install_trained_version(app.state, result)
+    )
+    app.state.training_jobs.start()
+    
+    # Start ingestion job runner for /api/db/migrate
+    app.state.ingestion_jobs = IngestionJobRunner(app.state.jobs)
+    app.state.ingestion_jobs.start()
+    
+    # Optional shadow scorer, started from the admin model endpoints
+    app.state.shadow = None
     
     yield
     
     # Shutdown
     logger.info("Shutting down...")
+    if not app.state.model_loader.done():
+        app.state.model_loader.cancel()
+    app.state.training_jobs.stop()
+    app.state.ingestion_jobs.stop()
+    if app.state.shadow:
+        app.state.shadow.stop()
+    if app.state.batcher:
+        await app.state.batcher.stop()
+    if app.state.prediction_writer:
+        app.state.prediction_writer.stop()
     if app.state.predictor:
         app.state.predictor.cleanup()
+    shutdown_executors()
 
 # Create FastAPI app
 app = FastAPI(
@@ -78,12 +153,14 @@ async def root():
         "database": "SQLite",
         "endpoints": {
             "health": "/api/health",
+            "ready": "/api/ready",
             "predict": "/api/predict",
             "data_stats": "/api/data/stats",
             "hotspots": "/api/data/hotspots",
             "features": "/api/data/features",
             "database": "/api/db/stats",
-            "migrate": "/api/db/migrate"  # Optional endpoint to trigger migration
+            "migrate": "/api/db/migrate",  # Optional endpoint to trigger migration
+            "migration_jobs": "/api/db/migrate/jobs"
         }
     }
 
@@ -93,6 +170,31 @@ async def health_check():
     return {
         "status": "healthy",
         "model_loaded": app.state.predictor is not None,
+        "model_status": app.state.model_status,
+        "model_version": app.state.predictor.model_version if app.state.predictor else None,
         "database": "initialized",
-        "service": "Intelligent Road Accident Analysis Platform"
-    }
\ No newline at end of file
+        "service": "Intelligent Road Accident Analysis Platform",
+        "batching": app.state.batcher.get_stats() if app.state.batcher else None,
+        "prediction_cache": app.state.predictor.cache.get_stats() if app.state.predictor else None,
+        "data_memory_bytes": (
+            sum(entry["bytes_after"] for entry in app.state.predictor.data_memory_report.values())
+            if app.state.predictor and app.state.predictor.data_memory_report else None
+        ),
+        "executors": get_executor_stats(),
+        "prediction_writer": (
+            app.state.prediction_writer.get_stats() if app.state.prediction_writer else None
+        )
+    }
+
+@app.get("/api/ready")
+async def readiness_check():
+    """Readiness probe: 200 once the model is loaded and warmed up, else 503"""
+    ready = app.state.model_status == "ready" and app.state.predictor is not None
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "ready": ready,
+            "model_status": app.state.model_status,
+            "model_load_seconds": app.state.model_load_seconds
+        }
+    )
@@ -0,0 +1,87 @@
+import hashlib
+import json
+import os
+import joblib
+import numpy as np
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+from .forest_engine import FlatForest
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_FORMAT_VERSION = 1
+
+
+def _bundle_checksum(meta: Dict[str, Any], arrays: Dict[str, np.ndarray]) -> str:
+    """SHA-256 over the bundle metadata and every array's dtype, shape and bytes"""
+    digest = hashlib.sha256()
+    digest.update(json.dumps(meta, sort_keys=True, default=str).encode())
+    for name in sorted(arrays):
+        array = np.ascontiguousarray(arrays[name])
+        digest.update(f"{name}:{array.dtype.str}:{array.shape}".encode())
+        digest.update(array.data)
+    return digest.hexdigest()
+
+
+def save_bundle(
+    path: str,
+    forest: FlatForest,
+    feature_names: List[str],
+    label_classes: List[str],
+    feature_importances: np.ndarray,
+    metrics: Optional[Dict[str, Any]] = None
+):
+    """Save a single-file model bundle
+
+    The bundle is an uncompressed joblib file, so its arrays are stored
+    raw and can be memory-mapped on load: every worker maps the same
+    read-only pages from the page cache instead of unpickling a private
+    copy of the forest.
+    """
+    arrays = dict(forest.to_arrays())
+    arrays['feature_importances'] = np.ascontiguousarray(feature_importances, dtype=np.float64)
+
+    meta = {
+        'format_version': BUNDLE_FORMAT_VERSION,
+        'feature_names': list(feature_names),
+        'label_classes': list(label_classes),
+        'metrics': metrics or {}
+    }
+
+    payload = {
+        'meta': meta,
+        'arrays': arrays,
+        'checksum': _bundle_checksum(meta, arrays)
+    }
+
+    # Write next to the target and rename so readers never see a partial file
+    tmp_path = f"{path}.tmp"
+    joblib.dump(payload, tmp_path)
+    os.replace(tmp_path, path)
+    logger.info(f"Model bundle saved to {path}")
+
+
+def load_bundle(
+    path: str,
+    mmap: bool = True,
+    verify: bool = True
+) -> Tuple[FlatForest, Dict[str, Any], np.ndarray]:
+    """Load a model bundle, memory-mapping its arrays read-only
+
+    Returns the flattened forest, the metadata (feature names, label
+    classes, metrics) and the feature importances. Raises ValueError if the
+    format is unknown or the checksum does not match.
+    """
+    payload = joblib.load(path, mmap_mode='r' if mmap else None)
+
+    meta = payload['meta']
+    arrays = payload['arrays']
+
+    if meta.get('format_version') != BUNDLE_FORMAT_VERSION:
+        raise ValueError(f"Unsupported model bundle format: {meta.get('format_version')}")
+
+    if verify and _bundle_checksum(meta, arrays) != payload['checksum']:
+        raise ValueError(f"Model bundle checksum mismatch: {path}")
+
+    feature_importances = arrays.pop('feature_importances')
+    return FlatForest.from_arrays(arrays), meta, feature_importances
@@ -0,0 +1,154 @@
+import threading
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from typing import Dict, List, Any, Iterable, Optional
+
+# Feature columns used by the model, in the order prepare_features selects them
+NUMERIC_FEATURES = [
+    'longitude', 'latitude', 'hour', 'day_of_week', 'is_weekend',
+    'speed_limit', 'month'
+]
+
+CATEGORICAL_FEATURES = [
+    'weather_conditions', 'light_conditions', 'road_type',
+    'road_surface_conditions', 'junction_detail', 'urban_or_rural_area',
+    'time_of_day'
+]
+
+
+def categorize_hour(hour: int) -> str:
+    """Map an hour of the day to its time_of_day bucket"""
+    if hour < 6:
+        return 'Night'
+    elif hour < 12:
+        return 'Morning'
+    elif hour < 18:
+        return 'Afternoon'
+    return 'Evening'
+
+
+def parse_accident_date(value: Any) -> datetime:
+    """Parse a request date: ISO first, then anything pandas understands
+
+    Raises ValueError for values that are not a date.
+    """
+    try:
+        return datetime.strptime(str(value)[:10], '%Y-%m-%d')
+    except ValueError:
+        pass
+    try:
+        date = pd.to_datetime(value)
+    except (ValueError, TypeError, OverflowError):
+        date = pd.NaT
+    if pd.isna(date):
+        raise ValueError(f"Invalid accident_date: {value!r}")
+    return date
+
+
+def derive_features(input_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Derive the date/time features the model uses from a raw request"""
+    derived = dict(input_data)
+
+    if 'accident_date' in input_data:
+        date = parse_accident_date(input_data['accident_date'])
+        day_of_week = date.weekday()
+        derived['year'] = date.year
+        derived['month'] = date.month
+        derived['day'] = date.day
+        derived['day_of_week'] = day_of_week
+        derived['is_weekend'] = int(day_of_week in (5, 6))
+
+    if 'accident_time' in input_data:
+        try:
+            hour = datetime.strptime(str(input_data['accident_time']), '%H:%M').hour
+        except ValueError:
+            hour = 12
+        derived['hour'] = hour
+        derived['time_of_day'] = categorize_hour(hour)
+
+    return derived
+
+
+class FeatureEncoder:
+    """Encode prediction inputs into the model's one-hot feature layout
+
+    The layout is compiled once from the trained feature names: numeric
+    columns map to fixed slots and every (column, category) pair produced by
+    ``pd.get_dummies`` maps to its index, so encoding a request is a handful
+    of dict lookups writing into a preallocated row.
+    """
+
+    def __init__(self, feature_names: List[str]):
+        self.feature_names = list(feature_names)
+        self.n_features = len(self.feature_names)
+        self.numeric_slots = []
+        self.category_index = {}
+
+        numeric = set(NUMERIC_FEATURES)
+        # Longest prefix first so e.g. "road_type" never shadows a longer name
+        prefixes = sorted(CATEGORICAL_FEATURES, key=len, reverse=True)
+
+        for i, feature in enumerate(self.feature_names):
+            if feature in numeric:
+                self.numeric_slots.append((feature, i))
+                continue
+            for column in prefixes:
+                if feature.startswith(column + '_'):
+                    self.category_index[(column, feature[len(column) + 1:])] = i
+                    break
+
+        self.categorical_columns = sorted({column for column, _ in self.category_index})
+        self._local = threading.local()
+
+    def encode_derived(self, derived: Dict[str, Any], out: np.ndarray) -> np.ndarray:
+        """Write an already-derived input into ``out`` (must be zeroed)"""
+        for column, i in self.numeric_slots:
+            value = derived.get(column)
+            if value is not None:
+                out[i] = value
+
+        for column in self.categorical_columns:
+            if column in derived:
+                i = self.category_index.get((column, str(derived[column])))
+                if i is not None:
+                    out[i] = 1
+
+        return out
+
+    def encode(self, input_data: Dict[str, Any], out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Encode a single raw input into a feature row
+
+        Without ``out`` a preallocated per-thread row is reused, so the
+        result must be consumed before the next call on the same thread.
+        """
+        if out is None:
+            out = getattr(self._local, 'row', None)
+            if out is None:
+                out = self._local.row = np.zeros(self.n_features, dtype=np.float64)
+        out.fill(0)
+        return self.encode_derived(derive_features(input_data), out)
+
+    def encode_batch(
+        self,
+        records: Iterable[Dict[str, Any]],
+        errors: Optional[Dict[int, Exception]] = None
+    ) -> np.ndarray:
+        """Encode many raw inputs into a single (n_samples, n_features) matrix
+
+        With ``errors``, an input whose features cannot be derived leaves its
+        row zeroed and its exception is stored under its index instead of
+        failing the whole batch.
+        """
+        records = list(records)
+        matrix = np.zeros((len(records), self.n_features), dtype=np.float64)
+        for i, (row, input_data) in enumerate(zip(matrix, records)):
+            if errors is None:
+                self.encode_derived(derive_features(input_data), row)
+                continue
+            try:
+                self.encode_derived(derive_features(input_data), row)
+            except Exception as e:
+                row.fill(0)
+                errors[i] = e
+        return matrix
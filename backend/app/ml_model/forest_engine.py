@@ -0,0 +1,143 @@
+import numpy as np
+from typing import Dict, Optional
+
+
+class FlatForest:
+    """Flattened tree-ensemble inference engine
+
+    All trees of a fitted ``RandomForestClassifier`` are exported into
+    contiguous NumPy arrays (split feature, threshold, left/right child and
+    per-node class probabilities). Leaves point to themselves, so a batch of
+    rows is evaluated by stepping every (row, tree) pair down one level at a
+    time for ``max_depth`` vectorized steps, without sklearn's per-call
+    validation and joblib dispatch.
+
+    Probabilities match ``RandomForestClassifier.predict_proba`` bit for bit:
+    inputs are compared as float32 against float64 thresholds like sklearn's
+    tree code, leaf values are normalized the same way and trees are summed
+    in estimator order before dividing by the number of trees. The result
+    does not depend on the model's ``n_jobs``: with several jobs sklearn's
+    threads add trees in completion order, so its own output may differ
+    from the sequential sum in the last bits from call to call.
+    """
+
+    def __init__(
+        self,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        children_left: np.ndarray,
+        children_right: np.ndarray,
+        leaf_proba: np.ndarray,
+        roots: np.ndarray,
+        max_depth: int,
+        children: Optional[np.ndarray] = None
+    ):
+        self.feature = feature
+        self.threshold = threshold
+        self.children_left = children_left
+        self.children_right = children_right
+        self.leaf_proba = leaf_proba
+        self.roots = roots
+        self.max_depth = int(max_depth)
+        self.n_trees = len(roots)
+        self.n_classes = leaf_proba.shape[1]
+        # Children interleaved as (right, left) per node, so one step is a
+        # single gather at 2 * node + go_left (persisted, so a memory-mapped
+        # bundle shares it too)
+        if children is None:
+            children = np.stack([children_right, children_left], axis=1).ravel()
+        self.children = np.ascontiguousarray(children)
+
+    @classmethod
+    def from_sklearn(cls, model) -> "FlatForest":
+        """Export a fitted RandomForestClassifier"""
+        n_classes = int(model.n_classes_)
+        features, thresholds, lefts, rights, probas, roots = [], [], [], [], [], []
+        max_depth = 0
+        offset = 0
+
+        for estimator in model.estimators_:
+            tree = estimator.tree_
+            n_nodes = tree.node_count
+            node_ids = np.arange(n_nodes, dtype=np.intp)
+            is_leaf = tree.children_left == -1
+
+            # Leaves loop back to themselves and split on feature 0 harmlessly
+            features.append(np.where(is_leaf, 0, tree.feature).astype(np.intp))
+            thresholds.append(tree.threshold.astype(np.float64))
+            lefts.append(np.where(is_leaf, node_ids, tree.children_left).astype(np.intp) + offset)
+            rights.append(np.where(is_leaf, node_ids, tree.children_right).astype(np.intp) + offset)
+
+            # Same normalization as DecisionTreeClassifier.predict_proba
+            proba = tree.value[:, 0, :n_classes].astype(np.float64)
+            normalizer = proba.sum(axis=1)[:, np.newaxis]
+            normalizer[normalizer == 0.0] = 1.0
+            probas.append(proba / normalizer)
+
+            roots.append(offset)
+            max_depth = max(max_depth, tree.max_depth)
+            offset += n_nodes
+
+        return cls(
+            feature=np.ascontiguousarray(np.concatenate(features)),
+            threshold=np.ascontiguousarray(np.concatenate(thresholds)),
+            children_left=np.ascontiguousarray(np.concatenate(lefts)),
+            children_right=np.ascontiguousarray(np.concatenate(rights)),
+            leaf_proba=np.ascontiguousarray(np.concatenate(probas)),
+            roots=np.asarray(roots, dtype=np.intp),
+            max_depth=max_depth
+        )
+
+    def apply(self, X: np.ndarray) -> np.ndarray:
+        """Return the leaf node index reached in every tree, shape (n_samples, n_trees)"""
+        # sklearn trees evaluate float32 inputs
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        n_samples, n_features = X.shape
+        values = X.ravel()
+        row_offsets = (np.arange(n_samples, dtype=np.intp) * n_features)[:, np.newaxis]
+        nodes = np.broadcast_to(self.roots, (n_samples, self.n_trees)).copy()
+
+        for _ in range(self.max_depth):
+            go_left = values[row_offsets + self.feature[nodes]] <= self.threshold[nodes]
+            nodes = self.children[2 * nodes + go_left]
+
+        return nodes
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """Class probabilities averaged over all trees"""
+        leaves = self.apply(X)
+        proba = np.zeros((leaves.shape[0], self.n_classes), dtype=np.float64)
+
+        # Accumulate in estimator order, as sklearn does
+        for t in range(self.n_trees):
+            proba += self.leaf_proba[leaves[:, t]]
+
+        proba /= self.n_trees
+        return proba
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """Export the engine's arrays (for persistence)"""
+        return {
+            'feature': self.feature,
+            'threshold': self.threshold,
+            'children_left': self.children_left,
+            'children_right': self.children_right,
+            'leaf_proba': self.leaf_proba,
+            'roots': self.roots,
+            'children': self.children,
+            'max_depth': np.asarray(self.max_depth)
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray]) -> "FlatForest":
+        """Rebuild an engine from ``to_arrays`` output"""
+        return cls(
+            feature=arrays['feature'],
+            threshold=arrays['threshold'],
+            children_left=arrays['children_left'],
+            children_right=arrays['children_right'],
+            leaf_proba=arrays['leaf_proba'],
+            roots=arrays['roots'],
+            max_depth=int(arrays['max_depth']),
+            children=arrays.get('children')
+        )
@@ -0,0 +1,108 @@
+from typing import Any, Dict, Iterable, Tuple
+import logging
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_bool_dtype, is_float_dtype, is_integer_dtype, is_object_dtype
+
+logger = logging.getLogger(__name__)
+
+# Columns stored as int32 days since 1970-01-01
+DATE_COLUMNS = ('accident_date',)
+
+# Object columns with at most this share of distinct values become categories
+MAX_CATEGORY_RATIO = 0.5
+
+
+def dates_to_days(values: pd.Series) -> pd.Series:
+    """Convert dates (date objects, strings or datetime64) to int32 day numbers"""
+    dates = pd.to_datetime(values, errors='coerce')
+    return pd.Series(
+        dates.values.astype('datetime64[D]').astype(np.int64).astype(np.int32),
+        index=values.index,
+        name=values.name
+    )
+
+
+def days_to_dates(values: pd.Series) -> pd.Series:
+    """Convert int32 day numbers back to datetime64"""
+    return pd.to_datetime(values.astype(np.int64), unit='D')
+
+
+def day_number(value: Any) -> int:
+    """Day number of a single date-like value"""
+    return int(pd.Timestamp(value).to_datetime64().astype('datetime64[D]').astype(np.int64))
+
+
+def _downcast_float(values: pd.Series) -> pd.Series:
+    """float64 -> float32 only when every value round-trips exactly"""
+    narrow = values.astype(np.float32)
+    if np.array_equal(narrow.astype(np.float64).values, values.values, equal_nan=True):
+        return narrow
+    return values
+
+
+def compact_frame(
+    df: pd.DataFrame,
+    date_columns: Iterable[str] = DATE_COLUMNS,
+    max_category_ratio: float = MAX_CATEGORY_RATIO
+) -> Tuple[pd.DataFrame, Dict[str, Dict[str, Any]]]:
+    """Shrink a frame losslessly and report memory per column
+
+    Low-cardinality object columns become ``category``, integers are
+    downcast to the narrowest type holding their range, floats become
+    float32 only if no value changes, and date columns become int32 day
+    numbers (skipped if a value cannot be parsed). Returns the new frame
+    and ``{column: {dtype_before, dtype_after, bytes_before, bytes_after}}``.
+    """
+    before = df.memory_usage(deep=True, index=False)
+    dtypes_before = df.dtypes.astype(str)
+    columns = {}
+
+    for name in df.columns:
+        values = df[name]
+
+        if name in date_columns:
+            dates = pd.to_datetime(values, errors='coerce')
+            # Day numbers cannot hold missing dates; keep those columns as-is
+            if dates.notna().all():
+                values = dates_to_days(dates)
+        elif is_bool_dtype(values):
+            pass
+        elif is_integer_dtype(values):
+            values = pd.to_numeric(values, downcast='integer')
+        elif is_float_dtype(values):
+            values = _downcast_float(values)
+        elif is_object_dtype(values) and len(values):
+            if values.nunique(dropna=True) / len(values) <= max_category_ratio:
+                values = values.astype('category')
+
+        columns[name] = values
+
+    compacted = pd.DataFrame(columns, index=df.index)
+    after = compacted.memory_usage(deep=True, index=False)
+
+    report = {
+        name: {
+            'dtype_before': dtypes_before[name],
+            'dtype_after': str(compacted[name].dtype),
+            'bytes_before': int(before[name]),
+            'bytes_after': int(after[name])
+        }
+        for name in df.columns
+    }
+    return compacted, report
+
+
+def log_memory_report(report: Dict[str, Dict[str, Any]]):
+    """Log bytes per column before and after compaction"""
+    total_before = sum(entry['bytes_before'] for entry in report.values())
+    total_after = sum(entry['bytes_after'] for entry in report.values())
+
+    logger.info(
+        f"Data memory: {total_before / 1e6:.1f} MB -> {total_after / 1e6:.1f} MB"
+    )
+    for name, entry in sorted(report.items(), key=lambda item: -item[1]['bytes_before']):
+        logger.info(
+            f"  {name:<25} {entry['dtype_before']:>10} -> {entry['dtype_after']:<10} "
+            f"{entry['bytes_before']:>12,} -> {entry['bytes_after']:>12,} bytes"
+        )
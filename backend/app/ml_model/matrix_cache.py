@@ -0,0 +1,112 @@
+import hashlib
+import json
+import os
+from typing import Any, Dict, Optional, Tuple
+import logging
+import numpy as np
+from sqlalchemy import func, select
+
+logger = logging.getLogger(__name__)
+
+# Bump when featurization changes so older matrices are not reused
+MATRIX_FORMAT_VERSION = 1
+
+MATRIX_ARRAYS = ('X_train', 'X_test', 'y_train', 'y_test')
+
+
+def source_fingerprint(db, extra: Optional[Dict[str, Any]] = None) -> str:
+    """Fingerprint of the accidents table: row count, max id, max updated_at and schema
+
+    ``extra`` carries the settings that shape the matrix (feature lists,
+    row limit); any change to them or to the data yields a new key.
+
+    Inserts and deletes change the count or max id. Updates are seen
+    through updated_at, which the column's ``onupdate`` sets for ORM
+    flushes and for Core or ORM ``update()`` statements alike. Writes that
+    bypass SQLAlchemy (raw SQL, the sqlite3 shell) or set updated_at
+    themselves are not detected: clear MATRIX_CACHE_DIR after such edits.
+    """
+    from ..models import Accident
+
+    table = Accident.__table__
+    row_count, max_id, max_updated_at = db.execute(
+        select(func.count(), func.max(table.c.id), func.max(table.c.updated_at))
+    ).one()
+
+    source = {
+        'format_version': MATRIX_FORMAT_VERSION,
+        'row_count': row_count,
+        'max_id': max_id,
+        'max_updated_at': str(max_updated_at),
+        'schema': [(column.name, str(column.type)) for column in table.columns],
+        'extra': extra or {}
+    }
+    return hashlib.sha256(json.dumps(source, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class MatrixCache:
+    """On-disk cache of featurized training matrices keyed by source fingerprint
+
+    Each entry is one compressed ``.npz`` holding the train/test split as
+    float32 features and integer labels, plus the encoder metadata
+    (feature names, label classes, ...) as JSON. Only the newest
+    ``max_entries`` files are kept.
+    """
+
+    def __init__(self, directory: str, max_entries: int = 3):
+        self.directory = directory
+        self.max_entries = max_entries
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, f"matrix_{key[:24]}.npz")
+
+    def load(self, key: str) -> Optional[Tuple[Dict[str, np.ndarray], Dict[str, Any]]]:
+        """Load the arrays and metadata stored under ``key``, or None"""
+        path = self.path(key)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with np.load(path, allow_pickle=False) as npz:
+                meta = json.loads(str(npz['meta']))
+                if meta.get('key') != key:
+                    return None
+                arrays = {name: npz[name] for name in MATRIX_ARRAYS}
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable matrix cache {path}: {e}")
+            return None
+
+        # Mark as recently used so pruning keeps it
+        os.utime(path)
+        logger.info(f"Training matrix loaded from cache {path}")
+        return arrays, meta
+
+    def save(self, key: str, arrays: Dict[str, np.ndarray], meta: Dict[str, Any]):
+        """Store arrays and metadata under ``key``"""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path(key)
+
+        # np.savez appends ".npz" to names without it
+        tmp_path = f"{path}.tmp.npz"
+        np.savez_compressed(
+            tmp_path,
+            meta=np.array(json.dumps(dict(meta, key=key), default=str)),
+            **{name: arrays[name] for name in MATRIX_ARRAYS}
+        )
+        os.replace(tmp_path, path)
+        logger.info(f"Training matrix cached to {path}")
+        self._prune()
+
+    def _prune(self):
+        """Remove the least recently used entries beyond ``max_entries``"""
+        entries = [
+            os.path.join(self.directory, name)
+            for name in os.listdir(self.directory)
+            if name.startswith("matrix_") and name.endswith(".npz") and ".tmp" not in name
+        ]
+        entries.sort(key=os.path.getmtime, reverse=True)
+        for path in entries[self.max_entries:]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
@@ -1,12 +1,14 @@
 import pandas as pd
 import numpy as np
+import os
 import json
+import time
 import joblib
 from datetime import datetime
 from typing import Dict, List, Any, Optional, Tuple
 import logging
 from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split, GridSearchCV
+from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import LabelEncoder, StandardScaler
 from sklearn.pipeline import Pipeline
 from sklearn.compose import ColumnTransformer
@@ -16,34 +18,112 @@ from sklearn.metrics import (
     f1_score, confusion_matrix, classification_report
 )
 import warnings
+from .feature_encoder import FeatureEncoder, NUMERIC_FEATURES, CATEGORICAL_FEATURES
+from .prediction_cache import PredictionCache
+from .forest_engine import FlatForest
+from .artifacts import save_bundle, load_bundle
+from .registry import ModelRegistry
+from .matrix_cache import MatrixCache, MATRIX_ARRAYS, source_fingerprint
+from .frame_compaction import compact_frame, log_memory_report, days_to_dates, day_number
+from pandas.api.types import is_integer_dtype
 warnings.filterwarnings('ignore')
 
 logger = logging.getLogger(__name__)
 
+# Accident columns loaded from the database for training and analytics
+TRAINING_COLUMNS = [
+    'id', 'severity', 'longitude', 'latitude', 'accident_date', 'accident_time',
+    'weather_conditions', 'light_conditions', 'road_type', 'speed_limit',
+    'road_surface_conditions', 'junction_detail', 'urban_or_rural_area',
+    'year', 'month', 'day', 'hour', 'day_of_week', 'is_weekend', 'time_of_day'
+]
+
+# Representative request used to warm up a freshly loaded model
+WARMUP_INPUT = {
+    "accident_date": "2023-01-15",
+    "accident_time": "14:30",
+    "longitude": -0.1278,
+    "latitude": 51.5074,
+    "weather_conditions": "Fine no high winds",
+    "light_conditions": "Daylight",
+    "road_type": "Single carriageway",
+    "speed_limit": 60,
+    "road_surface_conditions": "Dry",
+    "junction_detail": "Not at junction or within 20 metres",
+    "urban_or_rural_area": "Urban"
+}
+
+# RandomForest hyperparameters used unless a tuned set is given
+DEFAULT_MODEL_PARAMS = {
+    'n_estimators': 100,
+    'max_depth': 10,
+    'min_samples_split': 5,
+    'min_samples_leaf': 2
+}
+
+class FullRetrainRequired(Exception):
+    """Raised when an incremental update is not possible and a full retrain is needed"""
+
+
 class AccidentPredictor:
     """Machine Learning model for accident severity prediction"""
     
-    def __init__(self, model_path: str = None, data_path: str = None, use_database: bool = True):
+    def __init__(
+        self,
+        model_path: str = None,
+        data_path: str = None,
+        use_database: bool = True,
+        initialize: bool = True,
+        model_version: Optional[str] = None
+    ):
         self.model = None
+        self.flat_forest = None
+        self.feature_importances = None
         self.preprocessor = None
         self.label_encoder = None
         self.feature_names = []
+        self.encoder = None
+        self.top_factors = {}
         self.data = None
         self.metrics = {}
+        self.fit_seconds = None
+        self.training_rows = None
+        self.max_accident_id = None
+        self.lineage = {}
+        self.data_source = None
+        self.data_memory_report = None
+        self._training_matrix = None
         self.use_database = use_database  # Flag to use database or CSV
         
         # Configuration
         from config import Config
         self.config = Config
         
+        # Results cache, invalidated whenever a model is loaded or trained
+        self.cache = PredictionCache(
+            max_size=Config.PREDICTION_CACHE_SIZE,
+            ttl_seconds=Config.PREDICTION_CACHE_TTL
+        )
+        
         # Paths
         self.model_path = model_path or Config.MODEL_PATH
         self.preprocessor_path = Config.PREPROCESSOR_PATH
         self.features_path = Config.FEATURES_PATH
+        self.bundle_path = Config.MODEL_BUNDLE_PATH
         self.data_path = data_path or Config.DATA_PATH
         
-        # Initialize
-        self._initialize()
+        # Serve the promoted registry version unless told otherwise; models
+        # saved at the legacy paths outside the registry are "unversioned"
+        self.registry = ModelRegistry(Config.MODEL_REGISTRY_DIR)
+        if model_version is None and model_path is None:
+            model_version = self.registry.current_version()
+        self.model_version = model_version or "unversioned"
+        if model_version:
+            self._use_model_dir(self.registry.version_dir(model_version))
+        
+        # Initialize (callers managing load/train themselves pass initialize=False)
+        if initialize:
+            self._initialize()
     
     def _initialize(self):
         """Initialize the predictor by loading or training model"""
@@ -60,10 +140,21 @@ class AccidentPredictor:
             logger.info(f"No saved model found or loading failed: {e}. Training new model...")
             self.load_and_preprocess_data()
             self.train_model()
-            self.save_model()
+            try:
+                self.publish_version(promote=True)
+            except Exception as e:
+                logger.error(f"Failed to register model version: {e}")
+                self.save_model()
+    
+    def _use_model_dir(self, model_dir: str):
+        """Point the artifact paths at a model version directory"""
+        self.model_path = os.path.join(model_dir, "model.pkl")
+        self.features_path = os.path.join(model_dir, "feature_names.json")
+        self.bundle_path = os.path.join(model_dir, "model_bundle.joblib")
     
     def load_and_preprocess_data(self):
         """Load and preprocess the accident data from database or CSV"""
+        self._training_matrix = None
         try:
             if self.use_database:
                 # Load from database
@@ -82,53 +173,60 @@ class AccidentPredictor:
             # Create sample data for development
             self._create_sample_data()
     
-    def _load_from_database(self):
-        """Load data from database"""
+    def compact_data(self):
+        """Shrink the analytics frame in place and log its memory per column
+        
+        Only for serving predictors: the compacted frame (categories, day
+        numbers) is read by the analytics methods, not by training.
+        """
+        if self.data is None or not self.config.COMPACT_DATA:
+            return
+        
+        self.data, self.data_memory_report = compact_frame(self.data)
+        self._training_matrix = None
+        log_memory_report(self.data_memory_report)
+    
+    def _accident_dates(self, df: pd.DataFrame) -> pd.Series:
+        """accident_date as datetime64, whether stored as day numbers or dates"""
+        if is_integer_dtype(df['accident_date']):
+            return days_to_dates(df['accident_date'])
+        return pd.to_datetime(df['accident_date'])
+    
+    @staticmethod
+    def _format_date(value) -> str:
+        """Render an accident_date value (day numbers as YYYY-MM-DD)"""
+        if isinstance(value, (int, np.integer)):
+            return str(np.datetime64(int(value), 'D'))
+        return str(value)
+    
+    def _load_from_database(self, after_id: Optional[int] = None):
+        """Load data from database (only rows with id > ``after_id`` if given)"""
         try:
             # Import here to avoid circular imports
             from ..database import SessionLocal
             from .. import crud
             
             db = SessionLocal()
-            crud_obj = crud.CRUD(db)
-            
-            # Get all accidents (consider limiting for large datasets)
-            accidents = crud_obj.get_accidents(limit=100000)  # Limit for training
+            try:
+                # Column-wise load straight into NumPy arrays
+                columns = crud.CRUD(db).load_accident_columns(
+                    TRAINING_COLUMNS,
+                    limit=self.config.TRAINING_MAX_ROWS,
+                    after_id=after_id,
+                    chunk_size=self.config.TRAINING_LOAD_CHUNK_SIZE
+                )
+            finally:
+                db.close()
             
-            if not accidents:
+            if len(columns['id']) == 0 and after_id is None:
                 logger.warning("No data in database. Falling back to CSV.")
                 self._load_from_csv()
-                db.close()
                 return
             
-            # Convert to DataFrame
-            data_dicts = []
-            for accident in accidents:
-                data_dicts.append({
-                    'severity': accident.severity,
-                    'longitude': accident.longitude,
-                    'latitude': accident.latitude,
-                    'accident_date': accident.accident_date,
-                    'accident_time': accident.accident_time,
-                    'weather_conditions': accident.weather_conditions,
-                    'light_conditions': accident.light_conditions,
-                    'road_type': accident.road_type,
-                    'speed_limit': accident.speed_limit,
-                    'road_surface_conditions': accident.road_surface_conditions,
-                    'junction_detail': accident.junction_detail,
-                    'urban_or_rural_area': accident.urban_or_rural_area,
-                    'year': accident.year,
-                    'month': accident.month,
-                    'day': accident.day,
-                    'hour': accident.hour,
-                    'day_of_week': accident.day_of_week,
-                    'is_weekend': accident.is_weekend,
-                    'time_of_day': accident.time_of_day
-                })
+            # Object columns holding only booleans become bool
+            self.data = pd.DataFrame(columns, copy=False).infer_objects()
+            self.data_source = 'database'
             
-            self.data = pd.DataFrame(data_dicts)
-            
-            db.close()
             logger.info(f"Loaded {len(self.data)} records from database")
             
         except Exception as e:
@@ -139,6 +237,7 @@ class AccidentPredictor:
         """Load data from CSV file"""
         try:
             self.data = pd.read_csv(self.data_path)
+            self.data_source = 'csv'
             
             # Sample if data is too large
             if len(self.data) > 100000:
@@ -275,21 +374,14 @@ class AccidentPredictor:
             labels=['Night', 'Morning', 'Afternoon', 'Evening']
         )
         
+        self.data_source = 'sample'
         logger.info("Created sample data for development")
     
     def prepare_features(self):
         """Prepare features for model training"""
         # Define features to use
-        feature_cols = [
-            'longitude', 'latitude', 'hour', 'day_of_week', 'is_weekend',
-            'speed_limit', 'month'
-        ]
-        
-        categorical_cols = [
-            'weather_conditions', 'light_conditions', 'road_type',
-            'road_surface_conditions', 'junction_detail', 'urban_or_rural_area',
-            'time_of_day'
-        ]
+        feature_cols = list(NUMERIC_FEATURES)
+        categorical_cols = list(CATEGORICAL_FEATURES)
         
         # Add categorical columns that exist
         categorical_cols = [col for col in categorical_cols if col in self.data.columns]
@@ -311,8 +403,8 @@ class AccidentPredictor:
         )
         
         # For simplicity, we'll use pandas get_dummies
-        X_train_processed = pd.get_dummies(X_train, columns=categorical_features)
-        X_test_processed = pd.get_dummies(X_test, columns=categorical_features)
+        X_train_processed = pd.get_dummies(X_train, columns=categorical_cols)
+        X_test_processed = pd.get_dummies(X_test, columns=categorical_cols)
         
         # Align columns
         X_test_processed = X_test_processed.reindex(columns=X_train_processed.columns, fill_value=0)
@@ -321,29 +413,126 @@ class AccidentPredictor:
         
         return X_train_processed, X_test_processed, y_train, y_test
     
-    def train_model(self):
-        """Train the Random Forest model"""
-        # Prepare data
+    def load_training_matrix(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Featurized train/test split, reused from the matrix cache when possible
+        
+        When training from the database, the split is cached on disk under a
+        fingerprint of the accidents table; an unchanged table skips loading,
+        preprocessing and one-hot encoding entirely. Data is loaded on demand
+        otherwise.
+        """
+        if self._training_matrix is not None:
+            return self._training_matrix
+        
+        cache = key = None
+        if self.use_database and self.config.MATRIX_CACHE_ENABLED:
+            try:
+                from ..database import SessionLocal
+                
+                db = SessionLocal()
+                try:
+                    key = source_fingerprint(db, extra={
+                        'numeric_features': NUMERIC_FEATURES,
+                        'categorical_features': CATEGORICAL_FEATURES,
+                        'max_rows': self.config.TRAINING_MAX_ROWS
+                    })
+                finally:
+                    db.close()
+                cache = MatrixCache(self.config.MATRIX_CACHE_DIR, self.config.MATRIX_CACHE_MAX_ENTRIES)
+                cached = cache.load(key)
+                if cached is not None:
+                    arrays, meta = cached
+                    self.feature_names = meta['feature_names']
+                    self.label_encoder = LabelEncoder()
+                    self.label_encoder.classes_ = np.array(meta['label_classes'])
+                    self.training_rows = meta['training_rows']
+                    self.max_accident_id = meta['max_accident_id']
+                    self.preprocessor = {
+                        'feature_names': self.feature_names,
+                        'label_encoder': self.label_encoder,
+                        'categorical_columns': meta['categorical_columns']
+                    }
+                    self._training_matrix = tuple(arrays[name] for name in MATRIX_ARRAYS)
+                    return self._training_matrix
+            except Exception as e:
+                logger.warning(f"Matrix cache unavailable: {e}")
+                cache = None
+        
+        if self.data is None:
+            self.load_and_preprocess_data()
+        
         X_train, X_test, y_train, y_test = self.prepare_features()
+        self.training_rows = int(len(self.data))
+        self.max_accident_id = self._max_accident_id()
+        self.preprocessor = {
+            'feature_names': self.feature_names,
+            'label_encoder': self.label_encoder,
+            'categorical_columns': self.data.select_dtypes(include=['object']).columns.tolist()
+        }
+        
+        # sklearn forests fit on float32, so this is lossless for training
+        split = (
+            np.ascontiguousarray(X_train, dtype=np.float32),
+            np.ascontiguousarray(X_test, dtype=np.float32),
+            np.asarray(y_train),
+            np.asarray(y_test)
+        )
+        
+        # Only database data is described by the fingerprint
+        if cache is not None and self.data_source == 'database':
+            try:
+                cache.save(key, dict(zip(MATRIX_ARRAYS, split)), {
+                    'feature_names': self.feature_names,
+                    'label_classes': self.label_encoder.classes_.tolist(),
+                    'categorical_columns': self.preprocessor['categorical_columns'],
+                    'training_rows': self.training_rows,
+                    'max_accident_id': self.max_accident_id
+                })
+            except Exception as e:
+                logger.warning(f"Failed to cache training matrix: {e}")
+        
+        self._training_matrix = split
+        return split
+    
+    def train_model(self, params: Optional[Dict[str, Any]] = None):
+        """Train the Random Forest model (``params`` override DEFAULT_MODEL_PARAMS)"""
+        # Prepare data
+        X_train, X_test, y_train, y_test = self.load_training_matrix()
         
         # Train Random Forest
+        model_params = {**DEFAULT_MODEL_PARAMS, **(params or {})}
         self.model = RandomForestClassifier(
-            n_estimators=100,
-            max_depth=10,
-            min_samples_split=5,
-            min_samples_leaf=2,
+            **model_params,
             random_state=42,
             n_jobs=-1,
             class_weight='balanced'
         )
         
+        fit_started = time.perf_counter()
         self.model.fit(X_train, y_train)
+        self.fit_seconds = time.perf_counter() - fit_started
+        
+        self._evaluate(X_test, y_test)
+        
+        self.lineage = {
+            'training_mode': 'full',
+            'base_version': None,
+            'incremental_rounds': 0,
+            'n_estimators': len(self.model.estimators_),
+            'model_params': model_params,
+            'max_accident_id': self.max_accident_id,
+            'full_fit_seconds': self.fit_seconds,
+            'full_training_rows': self.training_rows
+        }
+        
+        logger.info(f"Model trained with accuracy: {self.metrics['accuracy']:.3f}")
         
-        # Make predictions
+        self._compile_encoder()
+    
+    def _evaluate(self, X_test, y_test):
+        """Compute held-out metrics for the current model"""
         y_pred = self.model.predict(X_test)
-        y_pred_proba = self.model.predict_proba(X_test)
         
-        # Calculate metrics
         self.metrics = {
             'accuracy': accuracy_score(y_test, y_pred),
             'precision': precision_score(y_test, y_pred, average='weighted'),
@@ -356,115 +545,266 @@ class AccidentPredictor:
                 self.model.feature_importances_[:20]
             ))
         }
+    
+    def _max_accident_id(self) -> Optional[int]:
+        """High-water mark of the loaded training data (None if not from the database)"""
+        if 'id' not in self.data.columns or self.data['id'].isnull().all():
+            return None
+        return int(self.data['id'].max())
+    
+    def train_incremental(self, base_version: Optional[str] = None) -> Dict[str, Any]:
+        """Add trees fitted on accidents ingested since the base version was trained
         
-        logger.info(f"Model trained with accuracy: {self.metrics['accuracy']:.3f}")
+        The base version's forest is loaded and extended with warm_start, so
+        the new trees see only rows above its ``max_accident_id`` high-water
+        mark and are merged into the same forest. Raises FullRetrainRequired
+        when this is not possible or a periodic full rebuild is due.
+        """
+        config = self.config
+        base_version = base_version or self.registry.current_version()
+        base = self.registry.get(base_version) if base_version else None
+        
+        if base is None:
+            raise FullRetrainRequired("No registered base version")
+        if not self.use_database:
+            raise FullRetrainRequired("Incremental training needs the database as data source")
+        if base.get('max_accident_id') is None or base.get('n_estimators') is None:
+            raise FullRetrainRequired(f"Base version {base_version} has no high-water mark")
+        
+        rounds = base.get('incremental_rounds', 0) + 1
+        if config.FULL_RETRAIN_EVERY and rounds > config.FULL_RETRAIN_EVERY:
+            raise FullRetrainRequired(f"Periodic full rebuild due after {rounds - 1} incremental rounds")
+        
+        n_estimators = base['n_estimators'] + config.INCREMENTAL_TREES
+        if n_estimators > config.MAX_FOREST_TREES:
+            raise FullRetrainRequired(f"Forest would exceed {config.MAX_FOREST_TREES} trees")
+        
+        # Rows ingested since the base version
+        self._load_from_database(after_id=base['max_accident_id'])
+        new_rows = int(len(self.data))
+        if new_rows < config.INCREMENTAL_MIN_ROWS:
+            return {'skipped': True, 'new_rows': new_rows, 'base_version': base_version}
+        self._preprocess_data()
+        
+        # Extend the base version's estimator
+        self._use_model_dir(self.registry.version_dir(base_version))
+        self.model = joblib.load(self.model_path)
+        with open(self.features_path, 'r') as f:
+            preprocessor_info = json.load(f)
+        self.feature_names = preprocessor_info['feature_names']
+        self.label_encoder = LabelEncoder()
+        self.label_encoder.classes_ = np.array(preprocessor_info['label_classes'])
+        
+        unseen = set(self.data['severity']) - set(self.label_encoder.classes_)
+        if unseen:
+            raise FullRetrainRequired(f"New severity classes: {sorted(unseen)}")
+        
+        # Same contiguous float32 matrix as a full fit, so trees split on identical values
+        X = np.ascontiguousarray(self._featurize(self.data), dtype=np.float32)
+        y = self.label_encoder.transform(self.data['severity'])
+        try:
+            X_train, X_test, y_train, y_test = train_test_split(
+                X, y, test_size=0.2, random_state=42, stratify=y
+            )
+        except ValueError:
+            X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+        
+        # Trees fitted on a subset of the classes would have misaligned outputs
+        if len(np.unique(y_train)) != len(self.label_encoder.classes_):
+            raise FullRetrainRequired("New data does not cover every severity class")
+        
+        self.model.set_params(warm_start=True, n_estimators=n_estimators)
+        fit_started = time.perf_counter()
+        self.model.fit(X_train, y_train)
+        self.fit_seconds = time.perf_counter() - fit_started
+        self.model.set_params(warm_start=False)
+        
+        # Older rows were the base version's training data and cannot be held
+        # out, so the metrics cover new rows only and are labelled as such
+        self._evaluate(X_test, y_test)
+        self.metrics = {
+            (name if name == 'feature_importance' else f'new_rows_{name}'): value
+            for name, value in self.metrics.items()
+        }
+        self.training_rows = base['training_rows'] + new_rows
+        
+        self.lineage = {
+            'training_mode': 'incremental',
+            'base_version': base_version,
+            'incremental_rounds': rounds,
+            'n_estimators': n_estimators,
+            'model_params': base.get('model_params'),
+            'new_rows': new_rows,
+            'max_accident_id': self._max_accident_id(),
+            'full_fit_seconds': base.get('full_fit_seconds'),
+            'full_training_rows': base.get('full_training_rows')
+        }
         
-        # Create simple preprocessor for inference
         self.preprocessor = {
             'feature_names': self.feature_names,
             'label_encoder': self.label_encoder,
-            'categorical_columns': self.data.select_dtypes(include=['object']).columns.tolist()
+            'categorical_columns': preprocessor_info.get('categorical_columns', [])
+        }
+        self._compile_encoder()
+        
+        # A full fit scales roughly linearly with rows; compare against that
+        full_seconds = self.lineage['full_fit_seconds']
+        full_rows = self.lineage['full_training_rows']
+        estimated_full = full_seconds * self.training_rows / full_rows if full_seconds and full_rows else None
+        
+        logger.info(
+            f"Incremental training added {config.INCREMENTAL_TREES} trees on {new_rows} rows "
+            f"in {self.fit_seconds:.1f}s (full retrain estimate: {estimated_full or 0:.1f}s)"
+        )
+        return {
+            'skipped': False,
+            'new_rows': new_rows,
+            'base_version': base_version,
+            'fit_seconds': self.fit_seconds,
+            'last_full_fit_seconds': full_seconds,
+            'estimated_full_fit_seconds': estimated_full,
+            'speedup': estimated_full / self.fit_seconds if estimated_full and self.fit_seconds else None
         }
     
+    def _featurize(self, data: pd.DataFrame) -> pd.DataFrame:
+        """One-hot encode rows into the current model's feature columns"""
+        categorical_cols = [col for col in CATEGORICAL_FEATURES if col in data.columns]
+        feature_cols = [col for col in NUMERIC_FEATURES if col in data.columns] + categorical_cols
+        
+        # Categories unseen by the base model are dropped
+        X = pd.get_dummies(data[feature_cols], columns=categorical_cols)
+        return X.reindex(columns=self.feature_names, fill_value=0)
+    
+    def _compile_encoder(self):
+        """Build the feature encoder and cached factors for the loaded model"""
+        self.encoder = FeatureEncoder(self.feature_names)
+        self.cache.clear()
+        
+        # Optional flattened inference engine (already set when loaded from a bundle)
+        if self.model is not None:
+            self.feature_importances = self.model.feature_importances_
+            if self.config.INFERENCE_ENGINE == 'flat':
+                self.flat_forest = FlatForest.from_sklearn(self.model)
+            else:
+                self.flat_forest = None
+        
+        # Feature importances are fixed per model, so rank them once
+        importances = self.feature_importances
+        top_features_indices = np.argsort(importances)[-5:][::-1]
+        self.top_factors = {
+            self.feature_names[i]: float(importances[i])
+            for i in top_features_indices
+        }
+    
+    def _build_result(self, probabilities: np.ndarray) -> Dict[str, Any]:
+        """Turn one row of class probabilities into a prediction result"""
+        predicted_class = np.argmax(probabilities)
+        confidence = probabilities[predicted_class]
+        
+        # Decode severity
+        severity = self.label_encoder.classes_[predicted_class]
+        
+        # Check if needs manual review
+        needs_review = confidence < self.config.CONFIDENCE_THRESHOLD
+        
+        return {
+            'severity': severity,
+            'severity_code': int(predicted_class),
+            'confidence': float(confidence),
+            'needs_manual_review': bool(needs_review),
+            'factors': dict(self.top_factors),
+            'model_version': self.model_version,
+            'timestamp': datetime.now().isoformat()
+        }
+    
+    def _predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """Class probabilities from the configured inference engine"""
+        if self.flat_forest is not None:
+            return self.flat_forest.predict_proba(X)
+        return self.model.predict_proba(X)
+    
+    def warm_up(self):
+        """Run warmup inferences so the first real request pays no first-call costs
+        
+        Goes through the encoder and inference engine directly, so the
+        prediction cache and its statistics are left untouched.
+        """
+        row = self.encoder.encode(WARMUP_INPUT).reshape(1, -1)
+        self._predict_proba(row)
+        self._predict_proba(self.encoder.encode_batch([WARMUP_INPUT] * 8))
+    
+    def _cached_result(self, cached: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy a cached result with a fresh timestamp"""
+        result = dict(cached)
+        result['factors'] = dict(cached['factors'])
+        result['timestamp'] = datetime.now().isoformat()
+        return result
+    
     def predict(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Make prediction for input data"""
         try:
-            # Convert input to DataFrame
-            input_df = pd.DataFrame([input_data])
-            
-            # Extract features from date/time
-            if 'accident_date' in input_df.columns:
-                input_df['accident_date'] = pd.to_datetime(input_df['accident_date'])
-                input_df['year'] = input_df['accident_date'].dt.year
-                input_df['month'] = input_df['accident_date'].dt.month
-                input_df['day'] = input_df['accident_date'].dt.day
-                input_df['day_of_week'] = input_df['accident_date'].dt.dayofweek
-                input_df['is_weekend'] = input_df['day_of_week'].isin([5, 6]).astype(int)
-            
-            if 'accident_time' in input_df.columns:
-                # Convert time string to hour
-                try:
-                    time_obj = datetime.strptime(str(input_data['accident_time']), '%H:%M')
-                    input_df['hour'] = time_obj.hour
-                except:
-                    input_df['hour'] = 12
-                
-                # Categorize time of day
-                hour = input_df['hour'].iloc[0]
-                if hour < 6:
-                    time_of_day = 'Night'
-                elif hour < 12:
-                    time_of_day = 'Morning'
-                elif hour < 18:
-                    time_of_day = 'Afternoon'
-                else:
-                    time_of_day = 'Evening'
-                input_df['time_of_day'] = time_of_day
-            
-            # Prepare features
-            features_to_use = []
-            for feature in self.feature_names:
-                if feature in input_df.columns:
-                    features_to_use.append(feature)
-                else:
-                    # Check if it's a one-hot encoded feature
-                    base_feature = feature.split('_')[0]
-                    if base_feature in input_df.columns:
-                        # Create one-hot encoding
-                        value = str(input_df[base_feature].iloc[0])
-                        encoded_feature = f"{base_feature}_{value}"
-                        if encoded_feature in self.feature_names:
-                            features_to_use.append(encoded_feature)
-                        else:
-                            features_to_use.append(feature)  # Will be set to 0
-            
-            # Create feature vector
-            feature_vector = np.zeros(len(self.feature_names))
-            for i, feature in enumerate(self.feature_names):
-                if feature in features_to_use:
-                    # Find which input column contributes to this feature
-                    for col in input_df.columns:
-                        if col == feature:
-                            feature_vector[i] = input_df[col].iloc[0]
-                            break
-                        elif '_' in feature:
-                            # Check if it's a one-hot encoding
-                            base, val = feature.split('_', 1)
-                            if base == col and str(input_df[col].iloc[0]) == val:
-                                feature_vector[i] = 1
-                                break
-            
-            # Make prediction
-            probabilities = self.model.predict_proba([feature_vector])[0]
-            predicted_class = np.argmax(probabilities)
-            confidence = probabilities[predicted_class]
-            
-            # Decode severity
-            severity = self.label_encoder.inverse_transform([predicted_class])[0]
-            
-            # Check if needs manual review
-            needs_review = confidence < self.config.CONFIDENCE_THRESHOLD
-            
-            # Get top contributing factors
-            top_features_indices = np.argsort(self.model.feature_importances_)[-5:][::-1]
-            top_factors = {
-                self.feature_names[i]: float(self.model.feature_importances_[i])
-                for i in top_features_indices
-            }
+            feature_vector = self.encoder.encode(input_data)
             
-            return {
-                'severity': severity,
-                'severity_code': int(predicted_class),
-                'confidence': float(confidence),
-                'needs_manual_review': needs_review,
-                'factors': top_factors,
-                'timestamp': datetime.now().isoformat()
-            }
+            # The encoded vector is the canonical cache key
+            key = feature_vector.tobytes()
+            cached = self.cache.get(key)
+            if cached is not None:
+                return self._cached_result(cached)
+            
+            probabilities = self._predict_proba(feature_vector.reshape(1, -1))[0]
+            result = self._build_result(probabilities)
+            self.cache.put(key, result)
+            return self._cached_result(result)
             
         except Exception as e:
             logger.error(f"Prediction error: {e}")
             raise
     
+    def predict_batch(
+        self,
+        inputs: List[Dict[str, Any]],
+        return_exceptions: bool = False
+    ) -> List[Any]:
+        """Make predictions for many inputs with a single model call
+        
+        With ``return_exceptions``, an input that cannot be encoded (e.g. an
+        unparseable date) gets its exception in place of a result and the
+        rest of the batch is still scored; otherwise the first one raises.
+        """
+        if not inputs:
+            return []
+        
+        try:
+            errors = {} if return_exceptions else None
+            feature_matrix = self.encoder.encode_batch(inputs, errors)
+            keys = [row.tobytes() for row in feature_matrix]
+            
+            results = [None] * len(inputs)
+            missing = []
+            for i, key in enumerate(keys):
+                if errors and i in errors:
+                    results[i] = errors[i]
+                    continue
+                cached = self.cache.get(key)
+                if cached is not None:
+                    results[i] = self._cached_result(cached)
+                else:
+                    missing.append(i)
+            
+            # Score all cache misses with one model call
+            if missing:
+                probabilities = self._predict_proba(feature_matrix[missing])
+                for i, row in zip(missing, probabilities):
+                    result = self._build_result(row)
+                    self.cache.put(keys[i], result)
+                    results[i] = self._cached_result(result)
+            
+            return results
+            
+        except Exception as e:
+            logger.error(f"Batch prediction error: {e}")
+            raise
+    
     def get_data_statistics(self) -> Dict[str, Any]:
         """Get statistics about the data"""
         if self.data is None:
@@ -474,8 +814,8 @@ class AccidentPredictor:
             'total_records': int(len(self.data)),
             'severity_distribution': self.data['severity'].value_counts().to_dict(),
             'date_range': {
-                'min': str(self.data['accident_date'].min()) if 'accident_date' in self.data.columns else None,
-                'max': str(self.data['accident_date'].max()) if 'accident_date' in self.data.columns else None
+                'min': self._format_date(self.data['accident_date'].min()) if 'accident_date' in self.data.columns else None,
+                'max': self._format_date(self.data['accident_date'].max()) if 'accident_date' in self.data.columns else None
             },
             'geographic_range': {
                 'longitude': {
@@ -522,10 +862,12 @@ class AccidentPredictor:
         
         # Filter by date if date column exists
         if 'accident_date' in df.columns:
+            # Compacted frames hold day numbers
+            as_days = is_integer_dtype(df['accident_date'])
             if min_date:
-                df = df[df['accident_date'] >= pd.to_datetime(min_date)]
+                df = df[df['accident_date'] >= (day_number(min_date) if as_days else pd.to_datetime(min_date))]
             if max_date:
-                df = df[df['accident_date'] <= pd.to_datetime(max_date)]
+                df = df[df['accident_date'] <= (day_number(max_date) if as_days else pd.to_datetime(max_date))]
         
         # Filter by severity
         if severity_filter:
@@ -545,7 +887,7 @@ class AccidentPredictor:
                     'latitude': float(row['latitude']),
                     'longitude': float(row['longitude']),
                     'severity': row['severity'],
-                    'date': str(row['accident_date']) if 'accident_date' in row else None,
+                    'date': self._format_date(row['accident_date']) if 'accident_date' in row else None,
                     'weather': row.get('weather_conditions'),
                     'road_type': row.get('road_type')
                 })
@@ -563,7 +905,7 @@ class AccidentPredictor:
             return {'error': 'Date column not available'}
         
         # Group by time frequency
-        df['date'] = pd.to_datetime(df['accident_date'])
+        df['date'] = self._accident_dates(df)
         
         if frequency == 'daily':
             df['period'] = df['date'].dt.date
@@ -574,7 +916,7 @@ class AccidentPredictor:
         elif frequency == 'yearly':
             df['period'] = df['date'].dt.year
         
-        trends = df.groupby(['period', 'severity']).size().unstack(fill_value=0).reset_index()
+        trends = df.groupby(['period', 'severity'], observed=True).size().unstack(fill_value=0).reset_index()
         
         # Convert to list format
         result = []
@@ -591,28 +933,94 @@ class AccidentPredictor:
         """Get model performance metrics"""
         return self.metrics
     
-    def save_model(self):
-        """Save model and preprocessor"""
+    def get_training_summary(self) -> Dict[str, Any]:
+        """Get a compact, JSON-friendly summary of the last training run"""
+        # Incremental versions are scored on held-out new rows only
+        prefix = 'new_rows_' if 'new_rows_accuracy' in self.metrics else ''
+        return {
+            **{
+                f'{prefix}{name}': float(self.metrics.get(f'{prefix}{name}', 0))
+                for name in ('accuracy', 'precision', 'recall', 'f1_score')
+            },
+            'training_rows': self.training_rows or (int(len(self.data)) if self.data is not None else 0),
+            'n_features': len(self.feature_names),
+            'fit_seconds': self.fit_seconds,
+            'model_version': self.model_version
+        }
+    
+    def publish_version(self, promote: bool = False) -> str:
+        """Save the trained model as a new immutable registry version"""
+        version, staging = self.registry.create_staging()
+        try:
+            self._use_model_dir(staging)
+            self.save_model(raise_errors=True)
+            
+            summary = self.get_training_summary()
+            summary.pop('model_version')
+            final_dir = self.registry.finalize(version, staging, {
+                **summary,
+                'created_at': datetime.now().isoformat(),
+                'inference_engine': self.config.INFERENCE_ENGINE,
+                **self.lineage,
+                'label_classes': self.label_encoder.classes_.tolist() if self.label_encoder else []
+            })
+        except Exception:
+            self.registry.discard(staging)
+            raise
+        
+        self._use_model_dir(final_dir)
+        self.model_version = version
+        # Cached results carry the version they were scored under
+        self.cache.clear()
+        if promote:
+            self.registry.promote(version)
+        return version
+    
+    def save_model(self, raise_errors: bool = False):
+        """Save model and preprocessor
+        
+        Files are written to a temporary name and renamed into place, so a
+        process loading the model never sees a partially written artifact.
+        """
         try:
             # Save model
-            joblib.dump(self.model, self.model_path)
+            joblib.dump(self.model, f"{self.model_path}.tmp")
+            os.replace(f"{self.model_path}.tmp", self.model_path)
             
             # Save preprocessor info
-            with open(self.features_path, 'w') as f:
+            with open(f"{self.features_path}.tmp", 'w') as f:
                 json.dump({
                     'feature_names': self.feature_names,
                     'categorical_columns': self.preprocessor['categorical_columns'] if self.preprocessor else [],
                     'label_classes': self.label_encoder.classes_.tolist() if self.label_encoder else []
                 }, f)
+            os.replace(f"{self.features_path}.tmp", self.features_path)
+            
+            # Save single-file bundle for memory-mapped loading
+            save_bundle(
+                self.bundle_path,
+                forest=FlatForest.from_sklearn(self.model),
+                feature_names=self.feature_names,
+                label_classes=self.label_encoder.classes_.tolist() if self.label_encoder else [],
+                feature_importances=self.model.feature_importances_,
+                metrics=self.metrics
+            )
             
             logger.info(f"Model saved to {self.model_path}")
             
         except Exception as e:
             logger.error(f"Failed to save model: {e}")
+            if raise_errors:
+                raise
     
     def load_model(self):
         """Load saved model and preprocessor"""
         try:
+            # The flat engine only needs the memory-mapped bundle
+            if self.config.INFERENCE_ENGINE == 'flat' and os.path.exists(self.bundle_path):
+                self._load_bundle()
+                return
+            
             # Load model
             self.model = joblib.load(self.model_path)
             
@@ -627,14 +1035,38 @@ class AccidentPredictor:
             if 'label_classes' in preprocessor_info and preprocessor_info['label_classes']:
                 self.label_encoder.classes_ = np.array(preprocessor_info['label_classes'])
             
+            self._compile_encoder()
+            
             logger.info(f"Model loaded from {self.model_path}")
             
         except Exception as e:
             logger.error(f"Failed to load model: {e}")
             raise
     
+    def _load_bundle(self):
+        """Load the flattened model from the memory-mapped bundle"""
+        self.flat_forest, meta, self.feature_importances = load_bundle(
+            self.bundle_path,
+            mmap=self.config.MODEL_MMAP,
+            verify=self.config.VERIFY_MODEL_CHECKSUM
+        )
+        
+        # No sklearn estimator is kept in this mode
+        self.model = None
+        self.feature_names = meta['feature_names']
+        self.metrics = meta['metrics']
+        
+        self.label_encoder = LabelEncoder()
+        self.label_encoder.classes_ = np.array(meta['label_classes'])
+        
+        self._compile_encoder()
+        
+        logger.info(f"Model bundle loaded from {self.bundle_path}")
+    
     def cleanup(self):
         """Cleanup resources"""
+        self.cache.clear()
         self.model = None
+        self.flat_forest = None
         self.data = None
         self.preprocessor = None
\ No newline at end of file
@@ -0,0 +1,192 @@
+import json
+import os
+import shutil
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+
+try:
+    import fcntl
+except ImportError:  # Windows: only threads of one process are serialized
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Serializes pointer updates between registry instances of this process
+# when file locks are unavailable
+_process_lock = threading.Lock()
+
+
+def _write_json_atomic(path: str, data: Any):
+    """Write JSON to a temporary file and rename it into place"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, indent=2, default=str)
+    os.replace(tmp_path, path)
+
+
+class ModelRegistry:
+    """Directory of immutable, versioned model artifacts
+
+    Layout::
+
+        <root>/<version>/model.pkl, feature_names.json, model_bundle.joblib,
+                         metadata.json
+        <root>/CURRENT        version currently promoted for serving
+        <root>/history.json   promotion history, used for rollback
+
+    A version is written into a staging directory and renamed into place
+    once complete, and is never modified afterwards. Updates of CURRENT and
+    history.json hold an exclusive lock on ``<root>/.lock``, so every
+    registry instance, in any process, sees them one at a time.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    @property
+    def current_path(self) -> str:
+        return os.path.join(self.root, "CURRENT")
+
+    @property
+    def history_path(self) -> str:
+        return os.path.join(self.root, "history.json")
+
+    @property
+    def lock_path(self) -> str:
+        return os.path.join(self.root, ".lock")
+
+    @contextmanager
+    def _locked(self):
+        """Exclusive lock on the registry pointer across threads and processes"""
+        if fcntl is None:
+            with _process_lock:
+                yield
+            return
+
+        os.makedirs(self.root, exist_ok=True)
+        with open(self.lock_path, 'a') as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def version_dir(self, version: str) -> str:
+        """Directory holding a version's artifacts"""
+        return os.path.join(self.root, version)
+
+    def create_staging(self) -> Tuple[str, str]:
+        """Allocate a new version id and an empty staging directory for it"""
+        version = f"v{datetime.now().strftime('%Y%m%d_%H%M%S')}_{str(uuid.uuid4())[:6]}"
+        staging = os.path.join(self.root, f".staging_{version}")
+        os.makedirs(staging, exist_ok=True)
+        return version, staging
+
+    def finalize(self, version: str, staging: str, metadata: Dict[str, Any]) -> str:
+        """Write metadata and publish a staged version"""
+        size_bytes = sum(
+            os.path.getsize(os.path.join(staging, name)) for name in os.listdir(staging)
+        )
+        metadata = dict(metadata, version=version, size_bytes=size_bytes)
+        _write_json_atomic(os.path.join(staging, "metadata.json"), metadata)
+
+        final_dir = self.version_dir(version)
+        os.rename(staging, final_dir)
+        logger.info(f"Registered model version {version} ({size_bytes} bytes)")
+        return final_dir
+
+    def discard(self, staging: str):
+        """Remove an unfinished staging directory"""
+        shutil.rmtree(staging, ignore_errors=True)
+
+    def exists(self, version: str) -> bool:
+        return os.path.isfile(os.path.join(self.version_dir(version), "metadata.json"))
+
+    def get(self, version: str) -> Optional[Dict[str, Any]]:
+        """Get a version's metadata"""
+        if not self.exists(version):
+            return None
+        with open(os.path.join(self.version_dir(version), "metadata.json")) as f:
+            return json.load(f)
+
+    def list_versions(self) -> List[Dict[str, Any]]:
+        """List all registered versions, newest first"""
+        if not os.path.isdir(self.root):
+            return []
+
+        current = self.current_version()
+        versions = []
+        for name in os.listdir(self.root):
+            if name.startswith(".") or not self.exists(name):
+                continue
+            metadata = self.get(name)
+            metadata["current"] = name == current
+            versions.append(metadata)
+
+        return sorted(versions, key=lambda m: m.get("created_at", ""), reverse=True)
+
+    def current_version(self) -> Optional[str]:
+        """Version currently promoted for serving, if any"""
+        try:
+            with open(self.current_path) as f:
+                version = f.read().strip()
+        except FileNotFoundError:
+            return None
+        return version if version and self.exists(version) else None
+
+    def _read_history(self) -> List[str]:
+        try:
+            with open(self.history_path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return []
+
+    def _set_current(self, version: str):
+        tmp_path = f"{self.current_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(version)
+        os.replace(tmp_path, self.current_path)
+
+    def promote(self, version: str):
+        """Make ``version`` the served model"""
+        with self._locked():
+            if not self.exists(version):
+                raise ValueError(f"Unknown model version: {version}")
+
+            history = self._read_history()
+            if not history or history[-1] != version:
+                history.append(version)
+            self._set_current(version)
+            _write_json_atomic(self.history_path, history)
+            logger.info(f"Promoted model version {version}")
+
+    def previous_version(self) -> str:
+        """Version a rollback would return to"""
+        history = self._read_history()
+        if len(history) < 2:
+            raise ValueError("No previous model version to roll back to")
+        return history[-2]
+
+    def rollback(self, expected: Optional[str] = None) -> str:
+        """Return to the previously promoted version
+
+        With ``expected``, fails instead if the previous version is no
+        longer that one (another promotion happened in between).
+        """
+        with self._locked():
+            history = self._read_history()
+            if len(history) < 2:
+                raise ValueError("No previous model version to roll back to")
+            if expected is not None and history[-2] != expected:
+                raise ValueError(f"Previous model version changed (now {history[-2]})")
+
+            history.pop()
+            version = history[-1]
+            self._set_current(version)
+            _write_json_atomic(self.history_path, history)
+            logger.info(f"Rolled back to model version {version}")
+            return version
@@ -0,0 +1,249 @@
+import math
+import multiprocessing
+import os
+import random
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, List, Optional
+import logging
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import accuracy_score, f1_score
+from sklearn.model_selection import ParameterGrid
+
+logger = logging.getLogger(__name__)
+
+# Hyperparameters explored by the tuning job
+DEFAULT_SEARCH_SPACE = {
+    'n_estimators': [50, 100, 200],
+    'max_depth': [8, 10, 14, 20],
+    'min_samples_split': [2, 5, 10],
+    'min_samples_leaf': [1, 2, 5],
+    'max_features': ['sqrt', 0.3]
+}
+
+# Rows scored one at a time to measure single-request latency
+LATENCY_SAMPLE_ROWS = 200
+
+
+def save_design_matrix(directory: str, X_train, X_test, y_train, y_test) -> Dict[str, str]:
+    """Write the featurized train/test split as .npy files workers can memory-map"""
+    arrays = {
+        'X_train': np.ascontiguousarray(X_train, dtype=np.float32),
+        'X_test': np.ascontiguousarray(X_test, dtype=np.float32),
+        'y_train': np.ascontiguousarray(y_train),
+        'y_test': np.ascontiguousarray(y_test)
+    }
+    paths = {}
+    for name, array in arrays.items():
+        paths[name] = os.path.join(directory, f"{name}.npy")
+        np.save(paths[name], array)
+    return paths
+
+
+def _evaluate_candidate(
+    params: Dict[str, Any],
+    paths: Dict[str, str],
+    fraction: float,
+    engine: str,
+    seed: int = 42
+) -> Dict[str, Any]:
+    """Fit one candidate on a fraction of the cached training rows and score it
+
+    Runs in a pool worker; the design matrix is memory-mapped, so every
+    worker shares the parent's pages instead of receiving a pickled copy.
+    """
+    cpu_started = time.process_time()
+    X_train = np.load(paths['X_train'], mmap_mode='r')
+    y_train = np.load(paths['y_train'], mmap_mode='r')
+    X_test = np.load(paths['X_test'], mmap_mode='r')
+    y_test = np.load(paths['y_test'], mmap_mode='r')
+
+    n_rows = max(1, int(len(X_train) * fraction))
+    if n_rows < len(X_train):
+        rows = np.sort(np.random.RandomState(seed).choice(len(X_train), n_rows, replace=False))
+    else:
+        rows = slice(None)
+
+    model = RandomForestClassifier(
+        random_state=seed, n_jobs=1, class_weight='balanced', **params
+    )
+    fit_started = time.perf_counter()
+    model.fit(X_train[rows], y_train[rows])
+    fit_seconds = time.perf_counter() - fit_started
+
+    y_pred = model.predict(X_test)
+
+    # Latency is measured with the engine that would serve the model
+    if engine == 'flat':
+        from .forest_engine import FlatForest
+        scorer = FlatForest.from_sklearn(model)
+    else:
+        scorer = model
+
+    sample = np.asarray(X_test[:LATENCY_SAMPLE_ROWS])
+    latencies = []
+    for row in sample:
+        started = time.perf_counter()
+        scorer.predict_proba(row.reshape(1, -1))
+        latencies.append(time.perf_counter() - started)
+    latencies_ms = np.array(latencies) * 1000
+
+    return {
+        'params': params,
+        'fraction': fraction,
+        'training_rows': int(n_rows),
+        'accuracy': float(accuracy_score(y_test, y_pred)),
+        'f1_score': float(f1_score(y_test, y_pred, average='weighted')),
+        'fit_seconds': fit_seconds,
+        'cpu_seconds': time.process_time() - cpu_started,
+        'latency_p50_ms': float(np.percentile(latencies_ms, 50)),
+        'latency_p99_ms': float(np.percentile(latencies_ms, 99)),
+        'n_nodes': int(sum(tree.tree_.node_count for tree in model.estimators_))
+    }
+
+
+def successive_halving(
+    paths: Dict[str, str],
+    search_space: Optional[Dict[str, List[Any]]] = None,
+    max_candidates: int = 27,
+    eta: int = 3,
+    min_fraction: float = 0.1,
+    time_budget: Optional[float] = None,
+    cpu_budget: Optional[float] = None,
+    max_workers: Optional[int] = None,
+    latency_budget_ms: Optional[float] = None,
+    engine: str = 'sklearn',
+    progress: Optional[Callable[[float, str], None]] = None
+) -> Dict[str, Any]:
+    """Successive-halving search over a process pool
+
+    Every round fits the surviving candidates on a growing fraction of the
+    training rows (``min_fraction`` times ``eta`` per round) and keeps the
+    best ``1/eta`` by accuracy, until one candidate is left or the full
+    training set is used. No new fits start once the wall-clock
+    (``time_budget``) or summed worker CPU (``cpu_budget``) budget is
+    spent; the leaderboard then reflects the rounds that completed.
+
+    Latencies (and so ``meets_latency_budget``) are measured in the tuning
+    worker, one row at a time with the serving engine's scorer while other
+    candidates may be fitting. They rank candidates against each other;
+    they are not the serving path's p99, which adds request encoding,
+    caching and executor queueing.
+    """
+    grid = list(ParameterGrid(search_space or DEFAULT_SEARCH_SPACE))
+    candidates = random.Random(42).sample(grid, min(max_candidates, len(grid)))
+    max_workers = max_workers or os.cpu_count() or 2
+
+    started = time.perf_counter()
+    cpu_used = 0.0
+    budget_exhausted = False
+    rounds = []
+    leaderboard: List[Dict[str, Any]] = []
+
+    n_rounds = max(1, math.ceil(math.log(len(candidates), eta))) if len(candidates) > 1 else 1
+    fraction = max(min_fraction, eta ** -(n_rounds - 1))
+
+    def over_budget() -> bool:
+        if time_budget is not None and time.perf_counter() - started >= time_budget:
+            return True
+        return cpu_budget is not None and cpu_used >= cpu_budget
+
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=ctx) as pool:
+        round_number = 0
+        while candidates and not budget_exhausted:
+            round_number += 1
+            results = []
+            queue = list(candidates)
+            running = set()
+
+            while queue or running:
+                while queue and len(running) < max_workers and not over_budget():
+                    running.add(pool.submit(
+                        _evaluate_candidate, queue.pop(0), paths, fraction, engine
+                    ))
+                if queue and over_budget():
+                    budget_exhausted = True
+                    queue = []
+                if not running:
+                    break
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        logger.error(f"Tuning candidate failed: {e}")
+                        continue
+                    result['round'] = round_number
+                    cpu_used += result['cpu_seconds']
+                    results.append(result)
+
+            leaderboard.extend(results)
+            rounds.append({
+                'round': round_number,
+                'fraction': fraction,
+                'candidates': len(candidates),
+                'completed': len(results),
+                'elapsed_seconds': time.perf_counter() - started
+            })
+            if progress:
+                progress(min(fraction, 1.0), f"Round {round_number}: {len(results)} candidates at {fraction:.0%} of rows")
+
+            if not results or len(results) == 1 or round_number >= n_rounds or fraction >= 1.0:
+                break
+            if over_budget():
+                budget_exhausted = True
+                break
+
+            results.sort(key=lambda r: r['accuracy'], reverse=True)
+            candidates = [r['params'] for r in results[:max(1, len(results) // eta)]]
+            fraction = min(1.0, fraction * eta)
+
+    # Candidates that survived furthest rank first, then by accuracy
+    leaderboard.sort(key=lambda r: (r['round'], r['accuracy']), reverse=True)
+    for entry in leaderboard:
+        entry['meets_latency_budget'] = (
+            entry['latency_p99_ms'] <= latency_budget_ms if latency_budget_ms else None
+        )
+
+    eligible = [r for r in leaderboard if r['meets_latency_budget'] is not False]
+    best = eligible[0] if eligible else (leaderboard[0] if leaderboard else None)
+
+    return {
+        'best': best,
+        'leaderboard': leaderboard,
+        'rounds': rounds,
+        'elapsed_seconds': time.perf_counter() - started,
+        'cpu_seconds': cpu_used,
+        'budget_exhausted': budget_exhausted,
+        'latency_budget_ms': latency_budget_ms,
+        'latency_measured_in': 'tuning_worker',
+        'engine': engine
+    }
+
+
+def tune(predictor, progress: Optional[Callable[[float, str], None]] = None, **options) -> Dict[str, Any]:
+    """Featurize the predictor's data once (or reuse the cached matrix) and run the search over it"""
+    from config import Config
+
+    X_train, X_test, y_train, y_test = predictor.load_training_matrix()
+
+    os.makedirs(Config.TUNING_CACHE_DIR, exist_ok=True)
+    directory = tempfile.mkdtemp(prefix="design_", dir=Config.TUNING_CACHE_DIR)
+    try:
+        paths = save_design_matrix(directory, X_train, X_test, y_train, y_test)
+        return successive_halving(
+            paths,
+            max_candidates=options.get('max_candidates', Config.TUNING_MAX_CANDIDATES),
+            time_budget=options.get('time_budget', Config.TUNING_TIME_BUDGET),
+            cpu_budget=options.get('cpu_budget', Config.TUNING_CPU_BUDGET),
+            max_workers=options.get('max_workers', Config.TUNING_WORKERS),
+            latency_budget_ms=options.get('latency_budget_ms', Config.PREDICTION_P99_BUDGET_MS),
+            engine=Config.INFERENCE_ENGINE,
+            progress=progress
+        )
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Date, Time, Boolean
+from sqlalchemy import Column, Integer, BigInteger, String, Float, DateTime, Text, Date, Time, Boolean, Index, text
 from sqlalchemy.ext.declarative import declarative_base
 import datetime
 from .database import Base
@@ -6,6 +6,19 @@ from .database import Base
 class Accident(Base):
     """Accident data model"""
     __tablename__ = "accidents"
+    __table_args__ = (
+        # get_accidents / get_hotspots / get_temporal_trends by severity and
+        # date; also covers the per-severity counts
+        Index("ix_accidents_severity_date", "severity", "accident_date"),
+        # Newest-first listing and training loads without a severity filter,
+        # date range statistics
+        Index("ix_accidents_accident_date", "accident_date"),
+        # Bounding-box filters and geographic range statistics
+        Index("ix_accidents_location", "latitude", "longitude"),
+        Index("ix_accidents_longitude", "longitude"),
+        # Covers the top weather conditions aggregate
+        Index("ix_accidents_weather_conditions", "weather_conditions"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     accident_index = Column(String, unique=True, index=True)
@@ -64,6 +77,14 @@ class Accident(Base):
 class Prediction(Base):
     """Prediction history model"""
     __tablename__ = "predictions"
+    __table_args__ = (
+        # get_predictions: newest first, optionally only those needing review
+        Index("ix_predictions_created_at", "created_at"),
+        Index("ix_predictions_review_created_at", "needs_manual_review", "created_at"),
+        # get_prediction_metrics: partial index holding only predictions
+        # with a known outcome, so counting them never reads the rest
+        Index("ix_predictions_reviewed", "is_correct", sqlite_where=text("is_correct IS NOT NULL")),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     prediction_id = Column(String, unique=True, index=True)
@@ -130,4 +151,46 @@ class User(Base):
             "is_admin": self.is_admin,
             "is_active": self.is_active,
             "created_at": self.created_at.isoformat() if self.created_at else None
-        }
\ No newline at end of file
+        }
+
+class IngestState(Base):
+    """Ingestion checkpoint of one CSV file
+    
+    ``offset`` is the byte position just past the last committed chunk; it
+    is written in the same transaction as that chunk's rows, so a restarted
+    load resumes exactly where the committed data ends.
+    """
+    __tablename__ = "ingest_state"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    path = Column(String, unique=True, index=True, nullable=False)
+    
+    # Fingerprint of the file the checkpoint belongs to
+    size = Column(BigInteger, nullable=False)
+    mtime = Column(Float, nullable=False)
+    content_hash = Column(String, nullable=False)
+    
+    offset = Column(BigInteger, nullable=False, default=0)
+    rows_committed = Column(Integer, default=0)
+    completed = Column(Boolean, default=False)
+    
+    # Timestamps
+    started_at = Column(DateTime, default=datetime.datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
+    completed_at = Column(DateTime, nullable=True)
+    
+    def to_dict(self):
+        """Convert model to dictionary"""
+        return {
+            "id": self.id,
+            "path": self.path,
+            "size": self.size,
+            "mtime": self.mtime,
+            "content_hash": self.content_hash,
+            "offset": self.offset,
+            "rows_committed": self.rows_committed,
+            "completed": self.completed,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+            "completed_at": self.completed_at.isoformat() if self.completed_at else None
+        }
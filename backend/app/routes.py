@@ -1,16 +1,22 @@
-from fastapi import APIRouter, HTTPException, Query, Depends
-from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from fastapi import APIRouter, HTTPException, Query, Depends, Request
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError, field_validator
+from typing import List, Optional, Dict, Any, Tuple
 import pandas as pd
+import numpy as np
 import json
 import logging
-from datetime import datetime
+import time
+from datetime import date, datetime
 import uuid
 from .ml_model.model_training import AccidentPredictor
+from .ml_model.feature_encoder import parse_accident_date
 from .database import get_db
 from . import crud
 from sqlalchemy.orm import Session
 from .auth import get_current_admin_user
+from .models import User
+from config import Config
+from .executors import run_db, run_cpu
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -30,6 +36,12 @@ class PredictionRequest(BaseModel):
     junction_detail: str = Field(..., description="Junction details")
     urban_or_rural_area: str = Field(..., description="Urban or rural area")
     
+    @field_validator("accident_date")
+    @classmethod
+    def check_accident_date(cls, value):
+        parse_accident_date(value)
+        return value
+    
     class Config:
         schema_extra = {
             "example": {
@@ -55,8 +67,23 @@ class PredictionResponse(BaseModel):
     needs_manual_review: bool
     factors: Dict[str, Any]
     timestamp: str
+    model_version: Optional[str] = None
     prediction_id: Optional[str] = None
 
+class BatchPredictionItem(BaseModel):
+    """Per-item result of a batch prediction"""
+    index: int
+    status: str
+    prediction: Optional[PredictionResponse] = None
+    error: Optional[Any] = None
+
+class BatchPredictionResponse(BaseModel):
+    """Response model for batch prediction"""
+    total: int
+    succeeded: int
+    failed: int
+    results: List[BatchPredictionItem]
+
 class HotspotRequest(BaseModel):
     """Request model for hotspot analysis"""
     min_date: Optional[str] = None
@@ -69,6 +96,51 @@ class UpdatePredictionOutcome(BaseModel):
     actual_severity: str = Field(..., description="Actual severity (Fatal, Serious, Slight)")
     actual_severity_code: int = Field(..., description="Actual severity code")
 
+class AccidentFeedRecord(BaseModel):
+    """One accident pushed to the real-time feed"""
+    accident_index: str = Field(..., min_length=1, description="Unique accident reference")
+    longitude: float = Field(..., description="Longitude coordinate", ge=-180, le=180)
+    latitude: float = Field(..., description="Latitude coordinate", ge=-90, le=90)
+    accident_date: date = Field(..., description="Date of accident (YYYY-MM-DD)")
+    accident_time: Optional[str] = Field(None, description="Time of accident (HH:MM)")
+    severity: str = Field(..., description="Fatal, Serious, Slight (or 1, 2, 3)")
+    weather_conditions: Optional[str] = None
+    light_conditions: Optional[str] = None
+    road_type: Optional[str] = None
+    speed_limit: Optional[int] = Field(None, ge=0, le=200)
+    road_surface_conditions: Optional[str] = None
+    junction_detail: Optional[str] = None
+    urban_or_rural_area: Optional[str] = None
+    
+    @field_validator("severity", mode="before")
+    @classmethod
+    def check_severity(cls, value):
+        value = str(value)
+        if value not in ("1", "2", "3", "Fatal", "Serious", "Slight"):
+            raise ValueError("severity must be Fatal, Serious, Slight, 1, 2 or 3")
+        return value
+
+class AccidentFeedItem(BaseModel):
+    """Per-record result of a feed submission"""
+    index: int
+    status: str
+    accident_index: Optional[str] = None
+    error: Optional[Any] = None
+
+class AccidentFeedResponse(BaseModel):
+    """Response model for the accident feed"""
+    total: int
+    inserted: int
+    duplicates: int
+    invalid: int
+    failed: int
+    elapsed_seconds: float
+    records_per_second: float
+    results: List[AccidentFeedItem]
+
+# Validates a whole feed in one pydantic-core call
+_FEED_ADAPTER = TypeAdapter(List[AccidentFeedRecord])
+
 @router.post("/predict", response_model=PredictionResponse)
 async def predict_severity(
     request: PredictionRequest, 
@@ -84,14 +156,17 @@ async def predict_severity(
         # Convert request to dict
         input_data = request.dict()
         
-        # Make prediction
-        prediction = app.state.predictor.predict(input_data)
+        # Make prediction (micro-batched with concurrent requests when enabled)
+        if app.state.batcher:
+            prediction = await app.state.batcher.submit(input_data)
+        else:
+            prediction = await run_cpu(app.state.predictor.predict, input_data)
         
         # Save prediction to database
         crud_obj = crud.CRUD(db)
         
         # Generate prediction ID
-        prediction_id = f"PRED_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{str(uuid.uuid4())[:8]}"
+        prediction_id = generate_prediction_id()
         
         prediction_record = {
             "prediction_id": prediction_id,
@@ -99,20 +174,201 @@ async def predict_severity(
             "predicted_severity": prediction["severity"],
             "predicted_severity_code": prediction["severity_code"],
             "confidence": prediction["confidence"],
-            "needs_manual_review": prediction["needs_manual_review"]
+            "needs_manual_review": prediction["needs_manual_review"],
+            "model_version": prediction.get("model_version")
         }
         
-        created_prediction = crud_obj.create_prediction(prediction_record)
+        # Buffer the write when write-behind is enabled, else write now
+        writer = app.state.prediction_writer
+        if not (writer and writer.submit(prediction_record)):
+            await run_db(crud_obj.create_prediction, prediction_record)
+        
+        # Sample for shadow scoring by a candidate model (off the hot path)
+        shadow = getattr(app.state, "shadow", None)
+        if shadow:
+            shadow.offer(input_data, prediction)
         
         # Add prediction ID to response
         prediction["prediction_id"] = prediction_id
         
         return PredictionResponse(**prediction)
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Prediction failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+async def flush_pending_predictions():
+    """Write buffered predictions so lookups by prediction_id can see them"""
+    from main import app
+    
+    writer = getattr(app.state, "prediction_writer", None)
+    if writer and writer.pending_count():
+        await run_db(writer.flush)
+
+def generate_prediction_id() -> str:
+    """Generate a unique prediction ID"""
+    return f"PRED_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{str(uuid.uuid4())[:8]}"
+
+async def parse_batch_body(request: Request) -> List[Any]:
+    """Read a batch body given as a JSON array or as NDJSON"""
+    body = await request.body()
+    content_type = request.headers.get("content-type", "")
+    
+    if "ndjson" in content_type or "jsonlines" in content_type:
+        items = []
+        for line in body.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                items.append(json.loads(line))
+            except json.JSONDecodeError as e:
+                # Keep the slot so item indexes match input lines
+                items.append(e)
+        return items
+    
+    try:
+        items = json.loads(body)
+    except json.JSONDecodeError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid JSON body: {e}")
+    
+    if not isinstance(items, list):
+        raise HTTPException(status_code=400, detail="Batch body must be a JSON array")
+    
+    return items
+
+def validate_feed_items(items: List[Any]) -> Tuple[List[int], List[Dict[str, Any]], Dict[int, Any]]:
+    """Validate feed items in bulk
+    
+    Returns the indexes of valid items, their validated records and the
+    errors of invalid items by index. A failed pass drops the items it
+    reports and validates the rest again, so the common all-valid case
+    costs a single call.
+    """
+    errors: Dict[int, Any] = {}
+    candidates = []
+    for index, item in enumerate(items):
+        if isinstance(item, Exception):
+            errors[index] = str(item)
+        elif not isinstance(item, dict):
+            errors[index] = "Item must be a JSON object"
+        else:
+            candidates.append(index)
+    
+    while candidates:
+        try:
+            records = _FEED_ADAPTER.validate_python([items[index] for index in candidates])
+            return candidates, _FEED_ADAPTER.dump_python(records), errors
+        except ValidationError as e:
+            failed: Dict[int, List[Any]] = {}
+            for error in json.loads(e.json(include_url=False)):
+                # The first location element is the position in the list
+                failed.setdefault(error["loc"][0], []).append(
+                    dict(error, loc=error["loc"][1:])
+                )
+            for position, item_errors in failed.items():
+                errors[candidates[position]] = item_errors
+            candidates = [index for position, index in enumerate(candidates) if position not in failed]
+    
+    return [], [], errors
+
+@router.post("/predict/batch", response_model=BatchPredictionResponse)
+async def predict_severity_batch(
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """Predict accident severity for many incidents in one call
+    
+    Accepts a JSON array of prediction requests or NDJSON
+    (``application/x-ndjson``). Items are validated individually; valid items
+    are scored with a single model call and stored with one bulk insert.
+    """
+    try:
+        from main import app
+        
+        if not app.state.predictor:
+            raise HTTPException(status_code=503, detail="ML model not loaded")
+        
+        items = await parse_batch_body(request)
+        
+        if len(items) > Config.MAX_PREDICTION_BATCH_SIZE:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Batch too large (max {Config.MAX_PREDICTION_BATCH_SIZE} items)"
+            )
+        
+        results = [None] * len(items)
+        valid_indexes = []
+        valid_inputs = []
+        
+        # Validate each item so one bad record does not fail the whole batch
+        for index, item in enumerate(items):
+            if isinstance(item, Exception):
+                results[index] = BatchPredictionItem(index=index, status="error", error=str(item))
+                continue
+            if not isinstance(item, dict):
+                results[index] = BatchPredictionItem(
+                    index=index, status="error", error="Item must be a JSON object"
+                )
+                continue
+            try:
+                valid_inputs.append(PredictionRequest(**item).dict())
+                valid_indexes.append(index)
+            except ValidationError as e:
+                results[index] = BatchPredictionItem(index=index, status="error", error=json.loads(e.json()))
+        
+        # Score all valid items with one model call; an item that still
+        # cannot be encoded fails on its own
+        predictions = await run_cpu(
+            app.state.predictor.predict_batch, valid_inputs, return_exceptions=True
+        )
+        
+        prediction_records = []
+        scored = []
+        for index, input_data, prediction in zip(valid_indexes, valid_inputs, predictions):
+            if isinstance(prediction, Exception):
+                results[index] = BatchPredictionItem(index=index, status="error", error=str(prediction))
+                continue
+            scored.append((input_data, prediction))
+            prediction_id = generate_prediction_id()
+            prediction_records.append({
+                "prediction_id": prediction_id,
+                "input_data": json.dumps(input_data),
+                "predicted_severity": prediction["severity"],
+                "predicted_severity_code": prediction["severity_code"],
+                "confidence": prediction["confidence"],
+                "needs_manual_review": prediction["needs_manual_review"],
+                "model_version": prediction.get("model_version")
+            })
+            prediction["prediction_id"] = prediction_id
+            results[index] = BatchPredictionItem(
+                index=index, status="ok", prediction=PredictionResponse(**prediction)
+            )
+        
+        # Save all predictions with a single bulk insert
+        crud_obj = crud.CRUD(db)
+        await run_db(crud_obj.create_predictions_bulk, prediction_records)
+        
+        shadow = getattr(app.state, "shadow", None)
+        if shadow:
+            for input_data, prediction in scored:
+                shadow.offer(input_data, prediction)
+        
+        return BatchPredictionResponse(
+            total=len(items),
+            succeeded=len(prediction_records),
+            failed=len(items) - len(prediction_records),
+            results=results
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Batch prediction failed: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.put("/predictions/{prediction_id}/outcome")
 async def update_prediction_outcome(
     prediction_id: str,
@@ -130,7 +386,9 @@ async def update_prediction_outcome(
         if actual_severity_code is None:
             raise HTTPException(status_code=400, detail="Invalid severity value")
         
-        updated_prediction = crud_obj.update_prediction_outcome(
+        await flush_pending_predictions()
+        updated_prediction = await run_db(
+            crud_obj.update_prediction_outcome,
             prediction_id=prediction_id,
             actual_severity=outcome.actual_severity,
             actual_severity_code=actual_severity_code
@@ -146,6 +404,8 @@ async def update_prediction_outcome(
             "is_correct": updated_prediction.is_correct
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to update prediction outcome: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -160,7 +420,7 @@ async def get_data_statistics(
         if source == "database":
             # Get statistics from database
             crud_obj = crud.CRUD(db)
-            stats = crud_obj.get_accident_statistics()
+            stats = await run_db(crud_obj.get_accident_statistics)
             stats["source"] = "database"
         else:
             # Get statistics from model (backward compatibility)
@@ -168,11 +428,13 @@ async def get_data_statistics(
             if not app.state.predictor:
                 raise HTTPException(status_code=503, detail="ML model not loaded")
             
-            stats = app.state.predictor.get_data_statistics()
+            stats = await run_cpu(app.state.predictor.get_data_statistics)
             stats["source"] = "model"
         
         return stats
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to get statistics: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -186,9 +448,11 @@ async def get_available_features():
         if not app.state.predictor:
             raise HTTPException(status_code=503, detail="ML model not loaded")
         
-        features = app.state.predictor.get_feature_options()
+        features = await run_cpu(app.state.predictor.get_feature_options)
         return features
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to get features: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -214,7 +478,8 @@ async def get_accident_hotspots(
             if request.max_date:
                 end_date = datetime.strptime(request.max_date, "%Y-%m-%d").date()
             
-            hotspots = crud_obj.get_hotspots(
+            hotspots = await run_db(
+                crud_obj.get_hotspots,
                 limit=request.limit,
                 severity_filter=request.severity_filter,
                 start_date=start_date,
@@ -227,7 +492,8 @@ async def get_accident_hotspots(
             if not app.state.predictor:
                 raise HTTPException(status_code=503, detail="ML model not loaded")
             
-            hotspots = app.state.predictor.get_hotspots(
+            hotspots = await run_cpu(
+                app.state.predictor.get_hotspots,
                 min_date=request.min_date,
                 max_date=request.max_date,
                 severity_filter=request.severity_filter,
@@ -236,6 +502,8 @@ async def get_accident_hotspots(
         
         return hotspots
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to get hotspots: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -252,7 +520,7 @@ async def get_temporal_trends(
         if source == "database":
             # Get trends from database
             crud_obj = crud.CRUD(db)
-            trends = crud_obj.get_temporal_trends(frequency, severity)
+            trends = await run_db(crud_obj.get_temporal_trends, frequency, severity)
         else:
             # Get trends from model (backward compatibility)
             from main import app
@@ -260,10 +528,12 @@ async def get_temporal_trends(
             if not app.state.predictor:
                 raise HTTPException(status_code=503, detail="ML model not loaded")
             
-            trends = app.state.predictor.get_temporal_trends(frequency, severity)
+            trends = await run_cpu(app.state.predictor.get_temporal_trends, frequency, severity)
         
         return trends
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to get trends: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -280,6 +550,8 @@ async def get_model_metrics():
         metrics = app.state.predictor.get_model_metrics()
         return metrics
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to get model metrics: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -288,7 +560,7 @@ async def get_model_metrics():
 @router.get("/db/stats")
 async def get_database_statistics(db: Session = Depends(get_db)):
     """Get database statistics"""
-    try:
+    def collect_stats():
         crud_obj = crud.CRUD(db)
         stats = crud_obj.get_accident_statistics()
         
@@ -305,56 +577,138 @@ async def get_database_statistics(db: Session = Depends(get_db)):
         }
         
         return stats
+    
+    try:
+        return await run_db(collect_stats)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to get database statistics: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.post("/db/migrate")
+def get_ingestion_runner():
+    """Get the app's ingestion job runner"""
+    from main import app
+    
+    runner = getattr(app.state, "ingestion_jobs", None)
+    if runner is None:
+        raise HTTPException(status_code=503, detail="Ingestion job runner not available")
+    return runner
+
+@router.post("/db/migrate", status_code=202)
 async def migrate_data(
     sample_only: bool = Query(False, description="Load only sample data (1000 records)"),
-    db: Session = Depends(get_db)
+    workers: Optional[int] = Query(None, ge=1, description="CSV parser processes (default: INGEST_WORKERS)"),
+    resume: bool = Query(True, description="Resume from the file's checkpoint; skip it if already fully loaded")
 ):
-    """Trigger data migration from CSV to database"""
+    """Trigger data migration from CSV to database
+    
+    The migration runs as a background job; poll its progress with
+    GET /db/migrate/jobs/{job_id} and cancel it with DELETE.
+    """
     try:
-        from .data_migration import load_csv_to_db
-        
-        # Get current count
-        crud_obj = crud.CRUD(db)
-        before_count = crud_obj.get_accident_statistics()["total_records"]
-        
-        # Run migration
-        if sample_only:
-            # Load sample data for testing
-            from .ml_model.model_training import AccidentPredictor
-            predictor = AccidentPredictor(use_database=False)
-            sample_data = predictor.data.sample(n=min(1000, len(predictor.data)), random_state=42)
-            
-            # Convert to list of dictionaries
-            records = sample_data.to_dict('records')
-            
-            # Insert sample data
-            count = crud_obj.create_accidents_bulk(records)
-            after_count = before_count + count
-            
-            message = f"Sample data ({count} records) loaded successfully"
-        else:
-            # Load full data
-            load_csv_to_db()
-            after_count = crud_obj.get_accident_statistics()["total_records"]
-            message = "Full data migration completed"
+        params = {"sample_only": sample_only, "resume": resume}
+        if workers is not None:
+            params["workers"] = workers
+        job = get_ingestion_runner().submit(params)
         
         return {
-            "status": "success",
-            "message": message,
-            "records_before": before_count,
-            "records_after": after_count,
-            "records_added": after_count - before_count,
-            "sample_only": sample_only
+            "status": "accepted",
+            "message": "Data migration job submitted",
+            "job": job.to_dict()
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Migration failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/db/migrate/jobs")
+async def list_migration_jobs():
+    """List recent data migration jobs"""
+    runner = get_ingestion_runner()
+    return {"jobs": [job.to_dict() for job in runner.store.list(kind="ingestion")]}
+
+@router.get("/db/migrate/jobs/{job_id}")
+async def get_migration_job(job_id: str):
+    """Get migration job progress: rows parsed, inserted, skipped, rows/sec and ETA"""
+    job = get_ingestion_runner().store.get(job_id)
+    if not job or job.kind != "ingestion":
+        raise HTTPException(status_code=404, detail="Migration job not found")
+    return job.to_dict()
+
+@router.delete("/db/migrate/jobs/{job_id}")
+async def cancel_migration_job(job_id: str):
+    """Cancel a queued or running migration job
+    
+    A running load stops at the next chunk boundary; rows already
+    written are kept.
+    """
+    job = get_ingestion_runner().cancel(job_id)
+    if not job or job.kind != "ingestion":
+        raise HTTPException(status_code=404, detail="Migration job not found")
+    return job.to_dict()
+
+@router.post("/db/accidents/feed", response_model=AccidentFeedResponse)
+async def ingest_accident_feed(
+    request: Request,
+    commit_every: Optional[int] = Query(None, ge=1, description="Records per transaction (default: FEED_COMMIT_ROWS)"),
+    db: Session = Depends(get_db),
+    current_admin: User = Depends(get_current_admin_user)
+):
+    """Ingest accidents pushed by an external system (admin only)
+    
+    Accepts a JSON array of accident records or NDJSON
+    (``application/x-ndjson``). Records are validated in bulk, derived
+    fields (year, month, hour, time of day, ...) are computed column-wise
+    with missing values stored as NULL, and valid records are inserted
+    in batches of ``commit_every`` per transaction. Every record gets a
+    status: inserted, duplicate, invalid or failed.
+    """
+    from .accident_feed import store_accident_feed, INVALID
+    
+    try:
+        started = time.perf_counter()
+        items = await parse_batch_body(request)
+        
+        if len(items) > Config.MAX_FEED_RECORDS:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Feed too large (max {Config.MAX_FEED_RECORDS} records)"
+            )
+        
+        valid_indexes, records, errors = await run_cpu(validate_feed_items, items)
+        statuses = await run_db(store_accident_feed, db, records, commit_every)
+        
+        results = [None] * len(items)
+        for index, error in errors.items():
+            results[index] = AccidentFeedItem(index=index, status=INVALID, error=error)
+        for index, record, status in zip(valid_indexes, records, statuses):
+            results[index] = AccidentFeedItem(
+                index=index, status=status, accident_index=record["accident_index"]
+            )
+        
+        counts = {}
+        for item in results:
+            counts[item.status] = counts.get(item.status, 0) + 1
+        elapsed = time.perf_counter() - started
+        
+        return AccidentFeedResponse(
+            total=len(items),
+            inserted=counts.get("inserted", 0),
+            duplicates=counts.get("duplicate", 0),
+            invalid=counts.get("invalid", 0),
+            failed=counts.get("failed", 0),
+            elapsed_seconds=elapsed,
+            records_per_second=len(items) / elapsed if elapsed else 0.0,
+            results=results
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Accident feed ingestion failed: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.get("/db/accidents")
 async def get_accidents_from_db(
     skip: int = Query(0, ge=0),
@@ -381,7 +735,8 @@ async def get_accidents_from_db(
         if end_date:
             end_date_obj = datetime.strptime(end_date, "%Y-%m-%d").date()
         
-        accidents = crud_obj.get_accidents(
+        accidents = await run_db(
+            crud_obj.get_accidents,
             skip=skip,
             limit=limit,
             severity=severity,
@@ -399,6 +754,8 @@ async def get_accidents_from_db(
             "limit": limit,
             "accidents": [accident.to_dict() for accident in accidents]
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to get accidents: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -411,7 +768,7 @@ async def get_accident_by_id(
     """Get accident by ID"""
     try:
         crud_obj = crud.CRUD(db)
-        accident = crud_obj.get_accident(accident_id)
+        accident = await run_db(crud_obj.get_accident, accident_id)
         
         if not accident:
             raise HTTPException(status_code=404, detail="Accident not found")
@@ -435,7 +792,8 @@ async def get_predictions_history(
     """Get prediction history"""
     try:
         crud_obj = crud.CRUD(db)
-        predictions = crud_obj.get_predictions(
+        predictions = await run_db(
+            crud_obj.get_predictions,
             skip=skip,
             limit=limit,
             needs_review=needs_review
@@ -459,6 +817,8 @@ async def get_predictions_history(
             "sort_order": sort_order,
             "predictions": [prediction.to_dict() for prediction in predictions]
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to get predictions: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -473,9 +833,12 @@ async def get_prediction_by_id(
         crud_obj = crud.CRUD(db)
         
         # Search by prediction_id
-        prediction = db.query(crud.models.Prediction).filter(
-            crud.models.Prediction.prediction_id == prediction_id
-        ).first()
+        await flush_pending_predictions()
+        prediction = await run_db(
+            lambda: db.query(crud.models.Prediction).filter(
+                crud.models.Prediction.prediction_id == prediction_id
+            ).first()
+        )
         
         if not prediction:
             raise HTTPException(status_code=404, detail="Prediction not found")
@@ -495,7 +858,7 @@ async def get_prediction_by_id(
 @router.get("/db/prediction-metrics")
 async def get_prediction_metrics(db: Session = Depends(get_db)):
     """Get prediction performance metrics"""
-    try:
+    def compute():
         crud_obj = crud.CRUD(db)
         metrics = crud_obj.get_prediction_metrics()
         
@@ -522,6 +885,11 @@ async def get_prediction_metrics(db: Session = Depends(get_db)):
             metrics["severity_wise_accuracy"] = severity_stats
         
         return metrics
+    
+    try:
+        return await run_db(compute)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to get prediction metrics: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -533,7 +901,7 @@ async def get_feature_distribution(
     db: Session = Depends(get_db)
 ):
     """Get distribution of a specific feature"""
-    try:
+    def compute():
         # Get all accidents
         crud_obj = crud.CRUD(db)
         
@@ -583,7 +951,11 @@ async def get_feature_distribution(
             "severity_filter": severity,
             "stats": stats
         }
-        
+    
+    try:
+        return await run_db(compute)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to get feature distribution: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -597,26 +969,38 @@ async def clear_database_data(
     if not confirm:
         raise HTTPException(status_code=400, detail="Must confirm with confirm=true")
     
+    def clear_tables():
+        try:
+            # Get counts before deletion
+            accident_count = db.query(crud.models.Accident).count()
+            prediction_count = db.query(crud.models.Prediction).count()
+            
+            # Delete all records; ingestion checkpoints go in the same
+            # transaction, or a resumed load would skip the deleted rows
+            db.query(crud.models.Prediction).delete()
+            db.query(crud.models.Accident).delete()
+            checkpoint_count = db.query(crud.models.IngestState).delete()
+            db.commit()
+            return accident_count, prediction_count, checkpoint_count
+        except Exception:
+            db.rollback()
+            raise
+    
     try:
-        # Get counts before deletion
-        accident_count = db.query(crud.models.Accident).count()
-        prediction_count = db.query(crud.models.Prediction).count()
-        
-        # Delete all records
-        db.query(crud.models.Prediction).delete()
-        db.query(crud.models.Accident).delete()
-        db.commit()
+        accident_count, prediction_count, checkpoint_count = await run_db(clear_tables)
         
         return {
             "status": "success",
             "message": "Database cleared successfully",
             "records_deleted": {
                 "accidents": accident_count,
-                "predictions": prediction_count
+                "predictions": prediction_count,
+                "ingest_checkpoints": checkpoint_count
             }
         }
+    except HTTPException:
+        raise
     except Exception as e:
-        db.rollback()
         logger.error(f"Failed to clear database: {e}")
         raise HTTPException(status_code=500, detail=str(e))
     
@@ -645,13 +1029,12 @@ async def get_system_info(current_admin: User = Depends(get_current_admin_user))
 async def clear_cache(current_admin: User = Depends(get_current_admin_user)):
     """Clear application cache (admin only)"""
     try:
-        # Clear predictor cache if exists
-        if hasattr(app.state, 'predictor'):
-            app.state.predictor.cleanup()
+        from main import app
+        from .training_jobs import load_and_swap_predictor
         
-        # Reinitialize predictor
-        from .ml_model.model_training import AccidentPredictor
-        app.state.predictor = AccidentPredictor()
+        # Reload the saved model and swap it in; the new predictor starts
+        # with an empty result cache and in-flight requests finish on the old one
+        await run_cpu(load_and_swap_predictor, app.state)
         
         return {
             "status": "success",
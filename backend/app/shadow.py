@@ -0,0 +1,179 @@
+import logging
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ShadowScorer:
+    """Score a sample of live requests with a candidate model version
+
+    ``offer`` is called on the request path with the input and the result
+    that was served; it only samples and appends to a bounded queue, so the
+    hot path never waits on the candidate. A background thread drains the
+    queue in batches, scores each batch with both the serving and the
+    candidate model (bypassing their caches, so latencies are comparable)
+    and records per-row latency and how often the candidate agrees with
+    the severity that was actually served.
+    """
+
+    def __init__(
+        self,
+        candidate: Any,
+        get_primary: Callable[[], Any],
+        sample_rate: float = 0.1,
+        batch_size: int = 64,
+        max_pending: int = 5000,
+        flush_interval: float = 1.0
+    ):
+        self.candidate = candidate
+        self.get_primary = get_primary
+        self.sample_rate = sample_rate
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._pending: deque = deque(maxlen=max_pending)
+        self._condition = threading.Condition()
+        self._stopping = False
+        self._thread = None
+        self.started_at = None
+
+        # Comparison metrics
+        self.total_offered = 0
+        self.total_sampled = 0
+        self.total_dropped = 0
+        self.total_scored = 0
+        self.agreements = 0
+        self.disagreements: Dict[str, int] = {}
+        self.total_confidence_delta = 0.0
+        self.candidate_seconds = 0.0
+        self.primary_seconds = 0.0
+        self.primary_rows = 0
+        self.batches = 0
+        self.errors = 0
+        self.last_error = None
+
+    @property
+    def candidate_version(self) -> Optional[str]:
+        return getattr(self.candidate, "model_version", None)
+
+    def start(self):
+        """Start the background scoring thread"""
+        self._stopping = False
+        self.started_at = time.time()
+        self._thread = threading.Thread(target=self._run, name="shadow-scorer", daemon=True)
+        self._thread.start()
+        logger.info(
+            f"Shadow scoring started for {self.candidate_version} "
+            f"(sample_rate={self.sample_rate})"
+        )
+
+    def stop(self):
+        """Stop the scoring thread, discarding unscored samples"""
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        self.candidate.cleanup()
+        logger.info(f"Shadow scoring stopped for {self.candidate_version}")
+
+    def offer(self, input_data: Dict[str, Any], served: Dict[str, Any]):
+        """Sample a served prediction for shadow scoring; never blocks"""
+        self.total_offered += 1
+        if random.random() >= self.sample_rate:
+            return
+
+        with self._condition:
+            if len(self._pending) == self._pending.maxlen:
+                # Oldest sample is evicted by the deque
+                self.total_dropped += 1
+            self._pending.append((input_data, served))
+            self.total_sampled += 1
+            if len(self._pending) >= self.batch_size:
+                self._condition.notify()
+
+    def _run(self):
+        """Scoring loop: wake on batch size, timeout or shutdown"""
+        while True:
+            with self._condition:
+                if not self._stopping and len(self._pending) < self.batch_size:
+                    self._condition.wait(self.flush_interval)
+                if self._stopping:
+                    return
+                batch = [
+                    self._pending.popleft()
+                    for _ in range(min(self.batch_size, len(self._pending)))
+                ]
+            if batch:
+                try:
+                    self._score(batch)
+                except Exception as e:
+                    self.errors += 1
+                    self.last_error = str(e)
+                    logger.error(f"Shadow scoring failed: {e}")
+
+    def _score(self, batch):
+        """Score one batch with both models and record the comparison"""
+        inputs = [item[0] for item in batch]
+
+        X = self.candidate.encoder.encode_batch(inputs)
+        started = time.perf_counter()
+        probabilities = self.candidate._predict_proba(X)
+        self.candidate_seconds += time.perf_counter() - started
+
+        primary = self.get_primary()
+        if primary is not None:
+            X_primary = primary.encoder.encode_batch(inputs)
+            started = time.perf_counter()
+            primary._predict_proba(X_primary)
+            self.primary_seconds += time.perf_counter() - started
+            self.primary_rows += len(inputs)
+
+        for (_, served), row in zip(batch, probabilities):
+            shadow = self.candidate._build_result(row)
+            self.total_confidence_delta += shadow['confidence'] - served['confidence']
+            if shadow['severity'] == served['severity']:
+                self.agreements += 1
+            else:
+                key = f"{served['severity']}->{shadow['severity']}"
+                self.disagreements[key] = self.disagreements.get(key, 0) + 1
+
+        self.total_scored += len(batch)
+        self.batches += 1
+
+    def pending_count(self) -> int:
+        """Number of sampled requests not yet scored"""
+        with self._condition:
+            return len(self._pending)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get agreement and latency comparison"""
+        scored = self.total_scored
+        return {
+            "running": self._thread is not None,
+            "candidate_version": self.candidate_version,
+            "sample_rate": self.sample_rate,
+            "started_at": self.started_at,
+            "offered": self.total_offered,
+            "sampled": self.total_sampled,
+            "dropped": self.total_dropped,
+            "pending": self.pending_count(),
+            "scored": scored,
+            "batches": self.batches,
+            "agreement_rate": self.agreements / scored if scored else None,
+            "disagreements": dict(self.disagreements),
+            "avg_confidence_delta": self.total_confidence_delta / scored if scored else None,
+            "candidate_latency_us_per_row": (
+                self.candidate_seconds / scored * 1e6 if scored else None
+            ),
+            "primary_latency_us_per_row": (
+                self.primary_seconds / self.primary_rows * 1e6 if self.primary_rows else None
+            ),
+            "errors": self.errors,
+            "last_error": self.last_error
+        }
@@ -0,0 +1,168 @@
+import io
+import logging
+import time
+import zlib
+from typing import Any, Dict, List, Optional
+import pandas as pd
+from config import Config
+from . import crud
+from .data_migration import IngestStats, accident_records, preprocess_accident_data
+from .database import session_for
+
+logger = logging.getLogger(__name__)
+
+# Most decompressed bytes produced per step, so one small gzip piece
+# cannot expand into an unbounded buffer
+DECOMPRESS_STEP_BYTES = 1024 * 1024
+
+GZIP_MAGIC = b'\x1f\x8b'
+
+
+class CsvStreamLoader:
+    """Parse a CSV byte stream incrementally and insert it chunk by chunk
+
+    Bytes are passed to ``feed`` as they arrive; complete lines are
+    collected until ``batch_size`` rows are available, which are then
+    parsed, preprocessed and inserted like a chunk of load_csv_to_db
+    (duplicates skipped, a commit every ``commit_every`` rows). Memory is
+    bounded by one chunk plus one decompression step, whatever the stream
+    length. Gzip input, including multi-member files, is decompressed on
+    the fly; ``compressed=None`` detects it from the first bytes.
+
+    Rows committed before an ``abort`` stay loaded (``rows_committed``
+    counts them); sending the same file again skips them as duplicates.
+
+    Quoted fields with embedded newlines are not supported.
+    """
+
+    def __init__(
+        self,
+        batch_size: Optional[int] = None,
+        commit_every: Optional[int] = None,
+        strategy: Optional[str] = None,
+        compressed: Optional[bool] = None
+    ):
+        self.batch_size = batch_size or Config.INGEST_CHUNK_SIZE
+        self.commit_every = commit_every or Config.INGEST_COMMIT_ROWS
+        self.strategy = strategy or Config.INGEST_DEDUP_STRATEGY
+        self.compressed = compressed
+        self.stats = IngestStats()
+
+        self._decompressor = None
+        self._header: Optional[bytes] = None
+        self._partial = b''
+        self._lines: List[bytes] = []
+        self._uncommitted = 0
+        self.rows_committed = 0
+        self._db = session_for("bulk_load")
+        self._crud = crud.CRUD(self._db)
+
+    def feed(self, data: bytes):
+        """Consume the next piece of the (possibly compressed) stream"""
+        if not data:
+            return
+        self.stats.bytes_read += len(data)
+
+        if self.compressed is None:
+            self.compressed = data[:2] == GZIP_MAGIC
+            if self.compressed:
+                logger.info("Upload is gzip-compressed")
+        if not self.compressed:
+            self._feed_text(data)
+            return
+
+        while data:
+            if self._decompressor is None:
+                self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            self._feed_text(self._decompressor.decompress(data, DECOMPRESS_STEP_BYTES))
+            data = self._decompressor.unconsumed_tail
+            if self._decompressor.eof:
+                # Concatenated gzip members: start over on what follows
+                data = self._decompressor.unused_data + data
+                self._decompressor = None
+
+    def finish(self) -> Dict[str, Any]:
+        """Load the remaining rows, commit and return ingestion stats"""
+        try:
+            if self._decompressor is not None:
+                self._feed_text(self._decompressor.flush())
+                if not self._decompressor.eof:
+                    raise ValueError("Truncated gzip stream")
+            if self._partial.strip():
+                self._add_lines([self._partial])
+            self._partial = b''
+            if self._lines:
+                self._write_chunk(self._lines)
+                self._lines = []
+
+            started = time.perf_counter()
+            self._db.commit()
+            self.rows_committed = self.stats.rows_inserted
+            self.stats.write_seconds += time.perf_counter() - started
+        except Exception:
+            self.abort()
+            raise
+        self._db.close()
+
+        self.stats.finish()
+        result = self.stats.to_dict()
+        logger.info(
+            f"Stream ingestion completed. Total records loaded: {self.stats.rows_inserted} "
+            f"({result['rows_per_second']:.0f} rows/sec, {self.stats.rows_skipped} duplicates skipped)"
+        )
+        return result
+
+    def abort(self) -> int:
+        """Roll back uncommitted rows, release the session and return the rows kept"""
+        self._db.rollback()
+        self._db.close()
+        return self.rows_committed
+
+    def _feed_text(self, data: bytes):
+        """Split decompressed bytes into lines and load full chunks"""
+        if not data:
+            return
+        lines = (self._partial + data).split(b'\n')
+        # The last piece is incomplete until its newline arrives
+        self._partial = lines.pop()
+
+        if self._header is None and lines:
+            self._header = lines.pop(0)
+        self._add_lines(lines)
+
+    def _add_lines(self, lines: List[bytes]):
+        self._lines.extend(line for line in lines if line.strip())
+        while len(self._lines) >= self.batch_size:
+            chunk, self._lines = self._lines[:self.batch_size], self._lines[self.batch_size:]
+            self._write_chunk(chunk)
+
+    def _write_chunk(self, lines: List[bytes]):
+        """Parse, preprocess and insert one chunk of CSV lines"""
+        if self._header is None:
+            raise ValueError("CSV stream has no header line")
+
+        started = time.perf_counter()
+        chunk = pd.read_csv(io.BytesIO(b'\n'.join([self._header] + lines)))
+        self.stats.parse_seconds += time.perf_counter() - started
+
+        started = time.perf_counter()
+        records = accident_records(preprocess_accident_data(chunk))
+        self.stats.preprocess_seconds += time.perf_counter() - started
+
+        started = time.perf_counter()
+        inserted, skipped = self._crud.insert_accidents_skip_existing(
+            records, strategy=self.strategy, commit=False
+        )
+        self._uncommitted += len(records)
+        self.stats.rows_inserted += inserted
+        if self._uncommitted >= self.commit_every:
+            self._db.commit()
+            self._uncommitted = 0
+            self.rows_committed = self.stats.rows_inserted
+        self.stats.write_seconds += time.perf_counter() - started
+
+        self.stats.chunks += 1
+        self.stats.rows_read += len(chunk)
+        self.stats.rows_invalid += len(chunk) - len(records)
+        self.stats.rows_skipped += skipped
+        logger.info(f"Loaded {inserted} records, total: {self.stats.rows_inserted}")
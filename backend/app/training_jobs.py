@@ -0,0 +1,274 @@
+import logging
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+from typing import Any, Callable, Dict, Optional
+from .jobs import JobStore, Job, QUEUED, DONE, FAILED, CANCELLED
+
+logger = logging.getLogger(__name__)
+
+# Leaderboard entries kept in a tuning job's result
+TUNING_LEADERBOARD_SIZE = 20
+
+
+def _training_worker(params: Dict[str, Any], events):
+    """Entry point of the training process: load data, fit, save artifacts
+
+    The new version is only registered here; promoting it is left to the
+    parent once this process has exited (see install_trained_version), so
+    a job cancelled at any point never moves CURRENT.
+    """
+    # Own process group, so terminating the job also reaches tuning workers
+    if hasattr(os, "setpgrp"):
+        os.setpgrp()
+    try:
+        from config import Config
+        from .ml_model.model_training import AccidentPredictor, FullRetrainRequired
+
+        mode = params.get("mode", Config.TRAINING_MODE)
+        promote = params.get("promote", Config.AUTO_PROMOTE_MODELS)
+        report = {"requested_mode": mode}
+
+        predictor = None
+        if mode == "incremental":
+            events.put(("stage", "incremental_training", 0.1))
+            candidate = AccidentPredictor(initialize=False)
+            try:
+                report.update(candidate.train_incremental())
+                if report["skipped"]:
+                    events.put(("done", dict(report, mode="incremental", promote=False, promoted=False)))
+                    return
+                predictor = candidate
+            except FullRetrainRequired as e:
+                report["fallback_reason"] = str(e)
+
+        if predictor is None:
+            # Data is only loaded and featurized when the matrix cache misses
+            events.put(("stage", "preparing_features", 0.05))
+            predictor = AccidentPredictor(initialize=False)
+            predictor.load_training_matrix()
+
+            model_params = None
+            if mode == "tune":
+                from .ml_model.tuning import tune
+
+                events.put(("stage", "tuning", 0.1))
+                search = tune(
+                    predictor,
+                    progress=lambda fraction, message: events.put(
+                        ("stage", "tuning", 0.1 + 0.6 * fraction, message)
+                    ),
+                    **params.get("tuning", {})
+                )
+                if search["best"] is None:
+                    raise RuntimeError("Tuning produced no successful candidate")
+                model_params = search["best"]["params"]
+                report["tuning"] = dict(search, leaderboard=search["leaderboard"][:TUNING_LEADERBOARD_SIZE])
+
+            events.put(("stage", "training", 0.7 if mode == "tune" else 0.3))
+            predictor.train_model(params=model_params)
+
+        events.put(("stage", "saving", 0.9))
+        predictor.publish_version(promote=False)
+
+        events.put(("done", dict(
+            predictor.get_training_summary(),
+            **report,
+            mode=predictor.lineage.get("training_mode"),
+            promote=promote,
+            promoted=False
+        )))
+    except Exception as e:
+        events.put(("error", f"{type(e).__name__}: {e}"))
+
+
+def load_and_swap_predictor(state, model_version: Optional[str] = None):
+    """Load a model version (default: the promoted one) and atomically install it
+
+    The new predictor is fully loaded and warmed up before a single
+    reference assignment replaces ``state.predictor``; requests that
+    already hold the old predictor finish on it, so it is not cleaned up
+    here and is released once they are done.
+    """
+    from .ml_model.model_training import AccidentPredictor
+
+    predictor = AccidentPredictor(initialize=False, model_version=model_version)
+    predictor.load_model()
+    predictor.load_and_preprocess_data()
+    predictor.compact_data()
+    predictor.warm_up()
+
+    state.predictor = predictor
+    state.model_status = "ready"
+    logger.info(f"Predictor swapped to model version {predictor.model_version}")
+    return predictor
+
+
+def install_trained_version(state, result: Dict[str, Any]):
+    """Serve and promote a finished job's version, if the job asked for it
+
+    The version is swapped in before CURRENT moves to it; if promoting
+    fails, the previous predictor is put back.
+    """
+    if not result.get("promote"):
+        return
+
+    from config import Config
+    from .ml_model.registry import ModelRegistry
+
+    previous = state.predictor
+    load_and_swap_predictor(state, result["model_version"])
+    try:
+        ModelRegistry(Config.MODEL_REGISTRY_DIR).promote(result["model_version"])
+    except Exception:
+        state.predictor = previous
+        raise
+    result["promoted"] = True
+
+
+class TrainingJobRunner:
+    """Run model training jobs one at a time in a separate process
+
+    The fit runs in a spawned process so the web worker's event loop, GIL
+    and memory are unaffected. Progress is reported back over a queue;
+    when a job succeeds ``on_complete(job, result)`` installs the new model.
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        on_complete: Callable[[Job, Dict[str, Any]], None],
+        poll_interval: float = 0.5
+    ):
+        self.store = store
+        self.on_complete = on_complete
+        self.poll_interval = poll_interval
+        self._ctx = multiprocessing.get_context("spawn")
+        self._queue: "queue.Queue[Optional[Job]]" = queue.Queue()
+        self._thread = None
+        self._current: Optional[Job] = None
+        self._process = None
+
+    def start(self):
+        """Start the job runner thread"""
+        self._thread = threading.Thread(target=self._run, name="training-jobs", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the runner, terminating a running training process"""
+        if self._current is not None:
+            self._current.cancel_requested = True
+        if self._process is not None and self._process.is_alive():
+            self._terminate(self._process)
+        self._queue.put(None)
+        if self._thread:
+            self._thread.join(timeout=10)
+            self._thread = None
+
+    def submit(self, params: Optional[Dict[str, Any]] = None, kind: str = "training") -> Job:
+        """Queue a training job"""
+        job = self.store.create(kind, params)
+        self._queue.put(job)
+        logger.info(f"Training job {job.id} queued")
+        return job
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """Cancel a queued or running job"""
+        job = self.store.get(job_id)
+        if job is None or job.finished:
+            return job
+
+        job.cancel_requested = True
+        if job.status == QUEUED:
+            job.finish(CANCELLED)
+        elif job is self._current and self._process is not None:
+            self._terminate(self._process)
+        logger.info(f"Training job {job.id} cancellation requested")
+        return job
+
+    @staticmethod
+    def _terminate(process):
+        """Terminate a training process together with any workers it started"""
+        if hasattr(os, "killpg"):
+            try:
+                os.killpg(process.pid, signal.SIGTERM)
+                return
+            except OSError:
+                # Group not created yet (or already gone): signal the process
+                pass
+        process.terminate()
+
+    def _run(self):
+        """Runner loop: execute queued jobs in order"""
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            if job.finished:
+                continue
+            try:
+                self._execute(job)
+            except Exception as e:
+                logger.error(f"Training job {job.id} crashed: {e}")
+                job.finish(FAILED, error=str(e))
+            finally:
+                self._current = None
+
+    def _execute(self, job: Job):
+        """Run one job in a child process and collect its outcome"""
+        job.start()
+        job.set_stage("starting", 0.0)
+
+        events = self._ctx.Queue()
+        # Not a daemon: tuning jobs start their own process pool, which
+        # daemonic processes may not do; stop() terminates it instead
+        process = self._ctx.Process(
+            target=_training_worker, args=(job.params, events), daemon=False
+        )
+        self._current = job
+        self._process = process
+        process.start()
+
+        outcome = None
+        try:
+            while outcome is None:
+                try:
+                    event = events.get(timeout=self.poll_interval)
+                except queue.Empty:
+                    if process.is_alive():
+                        continue
+                    # Exited without reporting: crashed or terminated
+                    outcome = ("error", f"Training process exited with code {process.exitcode}")
+                    continue
+
+                if event[0] == "stage":
+                    job.set_stage(*event[1:])
+                else:
+                    outcome = event
+        finally:
+            process.join(timeout=5)
+            self._process = None
+
+        if job.cancel_requested:
+            job.finish(CANCELLED)
+            logger.info(f"Training job {job.id} cancelled")
+            return
+
+        if outcome[0] == "error":
+            job.finish(FAILED, error=outcome[1])
+            logger.error(f"Training job {job.id} failed: {outcome[1]}")
+            return
+
+        result = outcome[1]
+        job.set_stage("installing", 0.95)
+        try:
+            self.on_complete(job, result)
+        except Exception as e:
+            job.finish(FAILED, result=result, error=f"Failed to install trained model: {e}")
+            logger.error(f"Training job {job.id} could not install model: {e}")
+            return
+
+        job.finish(DONE, result=result)
+        logger.info(f"Training job {job.id} completed")
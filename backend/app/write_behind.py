@@ -0,0 +1,253 @@
+import datetime
+import json
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List
+from sqlalchemy.orm import Session
+from . import crud
+
+logger = logging.getLogger(__name__)
+
+
+class PredictionWriter:
+    """Write-behind buffer for prediction history
+
+    ``submit`` appends a prediction record to an in-memory buffer and returns
+    immediately; a background thread writes the buffer with one bulk insert
+    whenever it reaches ``batch_size`` records or ``flush_interval`` seconds
+    have passed, and ``stop`` flushes whatever is left on shutdown.
+
+    Durability: a record is only on disk after the flush that contains it
+    commits. Records still buffered are lost if the process dies without
+    running the shutdown hook (crash, SIGKILL, OOM). While the database
+    keeps up that is about one ``batch_size`` or ``flush_interval`` worth,
+    but a failing batch holds the buffer back, so up to ``max_pending``
+    records (plus the failing batch) can be at risk.
+
+    A batch that fails to insert is retried ahead of newer records, up to
+    ``max_retries`` times, with an exponential backoff starting at
+    ``retry_delay`` and capped at ``flush_interval``; retries wait even
+    when the buffer is full, so a brief "database is locked" episode does
+    not use them all up at once. After that it is split
+    in halves until the records that cannot be inserted are isolated; those
+    are dead-lettered (logged with their full contents and counted) so one
+    bad record cannot block the buffer forever. On ``stop`` there is no
+    later cycle, so a failing batch is split straight away.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        batch_size: int = 500,
+        flush_interval: float = 0.5,
+        max_pending: int = 20000,
+        max_retries: int = 3,
+        retry_delay: float = 0.05
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+
+        self._buffer: List[Dict[str, Any]] = []
+        # Batch whose insert failed, retried before anything newer
+        self._failed: List[Dict[str, Any]] = []
+        self._failed_attempts = 0
+        self._condition = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._stopping = False
+        self._thread = None
+
+        # Flush metrics
+        self.total_submitted = 0
+        self.total_written = 0
+        self.total_rejected = 0
+        self.flush_count = 0
+        self.failed_flushes = 0
+        self.total_dead_lettered = 0
+        self.last_flush_size = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self.total_flush_seconds = 0.0
+        self.last_error = None
+
+    def start(self):
+        """Start the background flush thread"""
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="prediction-writer", daemon=True)
+        self._thread.start()
+        logger.info(
+            f"Prediction writer started (batch_size={self.batch_size}, "
+            f"flush_interval={self.flush_interval}s)"
+        )
+
+    def stop(self):
+        """Stop the flush thread and write any buffered records"""
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        self.flush(final=True)
+        logger.info(f"Prediction writer stopped ({self.total_written} records written)")
+
+    def submit(self, record: Dict[str, Any]) -> bool:
+        """Buffer a prediction record
+
+        Returns False when the buffer is full so the caller can fall back
+        to a synchronous write.
+        """
+        record.setdefault("created_at", datetime.datetime.utcnow())
+        with self._condition:
+            if len(self._buffer) >= self.max_pending:
+                self.total_rejected += 1
+                return False
+            self._buffer.append(record)
+            self.total_submitted += 1
+            if len(self._buffer) >= self.batch_size:
+                self._condition.notify()
+        return True
+
+    def pending_count(self) -> int:
+        """Number of records not yet written"""
+        with self._condition:
+            return len(self._buffer) + len(self._failed)
+
+    def flush(self, final: bool = False) -> int:
+        """Write all buffered records now; returns the number written
+
+        A previously failed batch goes first; while it keeps failing, newer
+        records stay buffered behind it. With ``final`` nothing is left for
+        a later retry: failing batches are split and their bad records
+        dead-lettered immediately.
+        """
+        with self._flush_lock:
+            written = 0
+            if self._failed:
+                records, self._failed = self._failed, []
+                self._failed_attempts += 1
+                written += self._write(records, give_up=final or self._failed_attempts > self.max_retries)
+                if self._failed:
+                    return written
+
+            with self._condition:
+                records, self._buffer = self._buffer, []
+            if records:
+                self._failed_attempts = 0
+                written += self._write(records, give_up=final)
+            return written
+
+    def _run(self):
+        """Flush loop: wake on size threshold, timeout or shutdown
+
+        A failed batch is retried after its backoff however full the
+        buffer is; only shutdown cuts the wait short.
+        """
+        while True:
+            with self._condition:
+                if self._failed:
+                    deadline = time.monotonic() + self._backoff()
+                    while not self._stopping:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._condition.wait(remaining)
+                elif not self._stopping and len(self._buffer) < self.batch_size:
+                    self._condition.wait(self.flush_interval)
+                if self._stopping:
+                    return
+            self.flush()
+
+    def _backoff(self) -> float:
+        """Seconds to wait before the next retry of the failed batch"""
+        return min(self.flush_interval, self.retry_delay * 2 ** self._failed_attempts)
+
+    def _write(self, records: List[Dict[str, Any]], give_up: bool = False) -> int:
+        """Bulk insert one batch
+
+        On failure the batch is kept for a retry, or with ``give_up`` split
+        to write what can be written and dead-letter the rest.
+        """
+        try:
+            return self._insert(records)
+        except Exception as e:
+            self.failed_flushes += 1
+            self.last_error = str(e)
+            logger.error(f"Failed to flush {len(records)} predictions: {e}")
+
+        if not give_up:
+            self._failed = records
+            return 0
+        return self._split_write(records)
+
+    def _split_write(self, records: List[Dict[str, Any]]) -> int:
+        """Insert a failing batch in halves, dead-lettering records that fail alone"""
+        if len(records) == 1:
+            try:
+                return self._insert(records)
+            except Exception as e:
+                self.last_error = str(e)
+                self.total_dead_lettered += 1
+                logger.error(
+                    f"Dropping prediction {records[0].get('prediction_id')} that cannot be written "
+                    f"({e}): {json.dumps(records[0], default=str)}"
+                )
+                return 0
+
+        middle = len(records) // 2
+        written = 0
+        for half in (records[:middle], records[middle:]):
+            try:
+                written += self._insert(half)
+            except Exception:
+                written += self._split_write(half)
+        return written
+
+    def _insert(self, records: List[Dict[str, Any]]) -> int:
+        """One bulk insert, recording flush metrics when it succeeds"""
+        started = time.perf_counter()
+        db = self.session_factory()
+        try:
+            crud.CRUD(db).create_predictions_bulk(records)
+        finally:
+            db.close()
+
+        elapsed = time.perf_counter() - started
+        self.flush_count += 1
+        self.total_written += len(records)
+        self.last_flush_size = len(records)
+        self.last_flush_ms = elapsed * 1000
+        self.max_flush_ms = max(self.max_flush_ms, self.last_flush_ms)
+        self.total_flush_seconds += elapsed
+        return len(records)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get buffer and flush metrics"""
+        return {
+            "running": self._thread is not None,
+            "pending": self.pending_count(),
+            "batch_size": self.batch_size,
+            "flush_interval_ms": self.flush_interval * 1000,
+            "total_submitted": self.total_submitted,
+            "total_written": self.total_written,
+            "total_rejected": self.total_rejected,
+            "flush_count": self.flush_count,
+            "failed_flushes": self.failed_flushes,
+            "retrying": len(self._failed),
+            "total_dead_lettered": self.total_dead_lettered,
+            "last_flush_size": self.last_flush_size,
+            "last_flush_ms": self.last_flush_ms,
+            "max_flush_ms": self.max_flush_ms,
+            "avg_flush_ms": (
+                self.total_flush_seconds / self.flush_count * 1000 if self.flush_count else 0
+            ),
+            "last_error": self.last_error,
+            "durability": (
+                f"buffered records (up to max_pending={self.max_pending}, plus a "
+                f"batch being retried) are lost on crash"
+            )
+        }
@@ -0,0 +1,153 @@
+import argparse
+import datetime
+import os
+import random
+import shutil
+import tempfile
+import threading
+import time
+import numpy as np
+from sqlalchemy import create_engine, func, insert, select
+from sqlalchemy.exc import OperationalError
+from app.database import ENGINE_PROFILES, Base, create_profile_engine
+from app import models
+
+
+def seed_accidents(engine, n_rows):
+    """Fill the accidents table with random rows"""
+    rng = random.Random(42)
+    start = datetime.date(2020, 1, 1)
+    rows = [
+        {
+            "accident_index": f"BENCH{i:08d}",
+            "longitude": rng.uniform(-0.5, 0.5),
+            "latitude": rng.uniform(51.0, 52.0),
+            "accident_date": start + datetime.timedelta(days=rng.randrange(3 * 365)),
+            "severity": rng.choice(["Fatal", "Serious", "Slight"]),
+            "hour": rng.randrange(24)
+        }
+        for i in range(n_rows)
+    ]
+    with engine.begin() as conn:
+        conn.execute(insert(models.Accident.__table__), rows)
+
+
+def reader(engine, stop, latencies, errors):
+    """Mix of point lookups and date-range aggregates, like the analytics endpoints"""
+    table = models.Accident.__table__
+    rng = random.Random(threading.get_ident())
+    while not stop.is_set():
+        started = time.perf_counter()
+        try:
+            with engine.connect() as conn:
+                if rng.random() < 0.5:
+                    conn.execute(
+                        select(table).where(table.c.accident_index == f"BENCH{rng.randrange(10000):08d}")
+                    ).all()
+                else:
+                    first = datetime.date(2020, 1, 1) + datetime.timedelta(days=rng.randrange(900))
+                    conn.execute(
+                        select(table.c.severity, func.count())
+                        .where(table.c.accident_date.between(first, first + datetime.timedelta(days=90)))
+                        .group_by(table.c.severity)
+                    ).all()
+            latencies.append(time.perf_counter() - started)
+        except OperationalError:
+            errors.append(1)
+
+
+def writer(engine, stop, latencies, errors, batch_size):
+    """Small insert transactions, like the prediction write-behind flushes"""
+    table = models.Prediction.__table__
+    counter = 0
+    while not stop.is_set():
+        rows = []
+        for _ in range(batch_size):
+            counter += 1
+            rows.append({
+                "prediction_id": f"BENCH_{threading.get_ident()}_{counter}",
+                "input_data": "{}",
+                "predicted_severity": "Slight",
+                "predicted_severity_code": 2,
+                "confidence": 0.9
+            })
+        started = time.perf_counter()
+        try:
+            with engine.begin() as conn:
+                conn.execute(insert(table), rows)
+            latencies.append(time.perf_counter() - started)
+        except OperationalError:
+            errors.append(1)
+
+
+def run_profile(profile, directory, args):
+    """Run the mixed workload against a fresh database using one profile
+
+    ``default`` is the engine as it was before profiles: SQLAlchemy's
+    defaults, rollback journal and no busy_timeout.
+    """
+    url = f"sqlite:///{os.path.join(directory, f'{profile}.db')}"
+    if profile == "default":
+        engine = create_engine(url, connect_args={"check_same_thread": False})
+    else:
+        engine = create_profile_engine(profile, url=url)
+    Base.metadata.create_all(bind=engine)
+    seed_accidents(engine, args.rows)
+
+    stop = threading.Event()
+    read_latencies, write_latencies, errors = [], [], []
+    threads = [
+        threading.Thread(target=reader, args=(engine, stop, read_latencies, errors))
+        for _ in range(args.readers)
+    ] + [
+        threading.Thread(target=writer, args=(engine, stop, write_latencies, errors, args.write_batch))
+        for _ in range(args.writers)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(args.seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+
+    def percentile(values, q):
+        return float(np.percentile(values, q) * 1000) if values else float("nan")
+
+    return {
+        "profile": profile,
+        "reads_per_second": len(read_latencies) / args.seconds,
+        "writes_per_second": len(write_latencies) * args.write_batch / args.seconds,
+        "read_p50_ms": percentile(read_latencies, 50),
+        "read_p99_ms": percentile(read_latencies, 99),
+        "write_p99_ms": percentile(write_latencies, 99),
+        "lock_errors": len(errors)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mixed read/write SQLite load per engine profile")
+    parser.add_argument("--profiles", nargs="+", default=["default"] + list(ENGINE_PROFILES))
+    parser.add_argument("--rows", type=int, default=50000, help="Accidents seeded per database")
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=1)
+    parser.add_argument("--write-batch", type=int, default=50, help="Rows per write transaction")
+    parser.add_argument("--seconds", type=float, default=10)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="db_bench_")
+    try:
+        print(f"{'profile':<10} {'reads/s':>9} {'rows written/s':>15} {'read p50':>9} {'read p99':>9} {'write p99':>10} {'locked':>7}")
+        for profile in args.profiles:
+            result = run_profile(profile, directory, args)
+            print(
+                f"{result['profile']:<10} {result['reads_per_second']:>9.0f} {result['writes_per_second']:>15.0f} "
+                f"{result['read_p50_ms']:>7.2f}ms {result['read_p99_ms']:>7.2f}ms "
+                f"{result['write_p99_ms']:>8.2f}ms {result['lock_errors']:>7}"
+            )
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import argparse
+import datetime
+import os
+import random
+import shutil
+import tempfile
+import time
+from sqlalchemy.orm import Session
+from config import Config
+from app.database import Base, create_profile_engine
+from app.accident_feed import store_accident_feed
+
+
+def feed_records(n, seed=42):
+    """Validated feed records, some without a time or optional fields"""
+    rng = random.Random(seed)
+    start = datetime.date(2020, 1, 1)
+    return [
+        {
+            "accident_index": f"FEED{i:08d}",
+            "longitude": rng.uniform(-3.0, 1.0),
+            "latitude": rng.uniform(50.0, 55.0),
+            "accident_date": start + datetime.timedelta(days=rng.randrange(1500)),
+            "accident_time": f"{rng.randrange(24):02d}:{rng.randrange(60):02d}" if rng.random() < 0.9 else None,
+            "severity": rng.choice(["1", "2", "3", "Slight"]),
+            "weather_conditions": rng.choice(["Fine", "Raining", None]),
+            "light_conditions": rng.choice(["Daylight", "Darkness"]),
+            "road_type": rng.choice(["Single carriageway", "Roundabout"]),
+            "speed_limit": rng.choice([30, 40, 60, 70, None]),
+            "road_surface_conditions": rng.choice(["Dry", "Wet"]),
+            "junction_detail": None,
+            "urban_or_rural_area": rng.choice(["Urban", "Rural"]),
+        }
+        for i in range(n)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Accident feed storage throughput (derivation + batched inserts)")
+    parser.add_argument("--records", type=int, default=Config.MAX_FEED_RECORDS)
+    parser.add_argument("--commit-every", nargs="+", type=int, default=[100, Config.FEED_COMMIT_ROWS, 10000])
+    args = parser.parse_args()
+
+    records = feed_records(args.records)
+    directory = tempfile.mkdtemp(prefix="feed_bench_")
+    try:
+        print(f"{'commit':>7} {'pass':<11} {'time':>8} {'records/s':>10}")
+        for commit_every in args.commit_every:
+            engine = create_profile_engine("oltp", url=f"sqlite:///{os.path.join(directory, f'feed_{commit_every}.db')}")
+            Base.metadata.create_all(bind=engine)
+            for label in ("new", "duplicates"):
+                db = Session(bind=engine, autoflush=False)
+                started = time.perf_counter()
+                store_accident_feed(db, records, commit_every=commit_every)
+                seconds = time.perf_counter() - started
+                db.close()
+                print(f"{commit_every:>7} {label:<11} {seconds:>7.2f}s {len(records) / seconds:>10,.0f}")
+            engine.dispose()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
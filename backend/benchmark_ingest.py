@@ -0,0 +1,105 @@
+import argparse
+import os
+import shutil
+import tempfile
+import time
+import pandas as pd
+from sqlalchemy.orm import Session
+from config import Config
+from app.database import Base, create_profile_engine
+from app.data_migration import accident_records, preprocess_accident_data
+from app import crud
+from benchmark_preprocess import random_accident_frame
+
+STRATEGIES = ["per_row", "on_conflict", "lookup"]
+
+
+def ingest(db, csv_path, strategy, chunk_size, commit_rows):
+    """Load a CSV like load_csv_to_db, returning (rows inserted, longest write transaction)
+
+    ``per_row`` is the former path: one get_accident_by_index SELECT per row,
+    then bulk_save_objects and a commit per chunk. The other strategies go
+    through insert_accidents_skip_existing with a commit every
+    ``commit_rows`` rows. A write transaction holds SQLite's write lock from
+    its first insert until the commit, which is what other writers wait on.
+    """
+    crud_obj = crud.CRUD(db)
+    inserted = 0
+    uncommitted = 0
+    longest = 0.0
+    transaction_started = None
+
+    for chunk in pd.read_csv(csv_path, chunksize=chunk_size):
+        records = accident_records(preprocess_accident_data(chunk))
+
+        if strategy == "per_row":
+            unique = [record for record in records if not crud_obj.get_accident_by_index(record["accident_index"])]
+            if unique:
+                started = time.perf_counter()
+                inserted += crud_obj.create_accidents_bulk(unique)
+                longest = max(longest, time.perf_counter() - started)
+            continue
+
+        if transaction_started is None:
+            transaction_started = time.perf_counter()
+        chunk_inserted, _ = crud_obj.insert_accidents_skip_existing(records, strategy=strategy, commit=False)
+        inserted += chunk_inserted
+        uncommitted += len(records)
+        if uncommitted >= commit_rows:
+            db.commit()
+            longest = max(longest, time.perf_counter() - transaction_started)
+            uncommitted = 0
+            transaction_started = None
+
+    if transaction_started is not None:
+        db.commit()
+        longest = max(longest, time.perf_counter() - transaction_started)
+    return inserted, longest
+
+
+def run(directory, csv_path, n_rows, strategy, chunk_size, commit_rows):
+    """Ingest the CSV into a fresh database twice: once empty, once all duplicates"""
+    url = f"sqlite:///{os.path.join(directory, f'{strategy}_{commit_rows}.db')}"
+    engine = create_profile_engine("bulk_load", url=url)
+    Base.metadata.create_all(bind=engine)
+
+    for label in ("new rows", "duplicates"):
+        db = Session(bind=engine, autoflush=False)
+        started = time.perf_counter()
+        inserted, longest = ingest(db, csv_path, strategy, chunk_size, commit_rows)
+        seconds = time.perf_counter() - started
+        db.close()
+        commit_label = "chunk" if strategy == "per_row" else commit_rows
+        print(
+            f"{strategy:<12} {commit_label:>8} {label:<11} {inserted:>9} {seconds:>8.1f}s "
+            f"{n_rows / seconds:>10,.0f} {longest * 1000:>10.0f}ms"
+        )
+    engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-row vs set-based CSV ingestion")
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--strategies", nargs="+", choices=STRATEGIES, default=STRATEGIES)
+    parser.add_argument("--chunk-size", type=int, default=Config.INGEST_CHUNK_SIZE)
+    parser.add_argument(
+        "--commit-rows", nargs="+", type=int, default=[Config.INGEST_COMMIT_ROWS],
+        help="Rows per transaction for the set-based strategies (several values compare lock hold times)"
+    )
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="ingest_bench_")
+    try:
+        csv_path = os.path.join(directory, "accidents.csv")
+        random_accident_frame(args.rows, bad_rate=0).to_csv(csv_path, index=False)
+
+        print(f"{'strategy':<12} {'commit':>8} {'pass':<11} {'inserted':>9} {'time':>9} {'rows/s':>10} {'longest txn':>11}")
+        for strategy in args.strategies:
+            for commit_rows in ([args.chunk_size] if strategy == "per_row" else args.commit_rows):
+                run(directory, csv_path, args.rows, strategy, args.chunk_size, commit_rows)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
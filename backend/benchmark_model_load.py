@@ -0,0 +1,113 @@
+import argparse
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+import joblib
+import numpy as np
+from app.ml_model.artifacts import load_bundle, save_bundle
+from app.ml_model.forest_engine import FlatForest
+from benchmark_predict import random_requests, train_predictor
+
+MODES = {
+    "pickle": "joblib.load of model.pkl (sklearn engine)",
+    "bundle": "bundle read into the heap (MODEL_MMAP=False)",
+    "mmap": "memory-mapped bundle, checksum verified",
+    "mmap-noverify": "memory-mapped bundle, VERIFY_MODEL_CHECKSUM=False",
+}
+
+
+def memory_mb():
+    """(RSS, anonymous) memory of this process in MB, from /proc/self/smaps_rollup
+
+    Pages of a memory-mapped file count towards RSS but are shared through
+    the page cache; anonymous memory is what each worker holds privately.
+    """
+    values = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                values[parts[0].rstrip(":")] = int(parts[1])
+    return values["Rss"] / 1024, values["Anonymous"] / 1024
+
+
+def load_worker(mode, directory, X, queue):
+    """Load the model one way in a fresh process and score one batch"""
+    rss_before, anon_before = memory_mb()
+    started = time.perf_counter()
+    if mode == "pickle":
+        model = joblib.load(os.path.join(directory, "model.pkl"))
+        predict_proba = model.predict_proba
+    else:
+        forest, _, _ = load_bundle(
+            os.path.join(directory, "model_bundle.joblib"),
+            mmap=mode != "bundle",
+            verify=mode != "mmap-noverify"
+        )
+        predict_proba = forest.predict_proba
+    load_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    predict_proba(X)
+    first_batch_seconds = time.perf_counter() - started
+
+    rss_after, anon_after = memory_mb()
+    queue.put({
+        "load_seconds": load_seconds,
+        "first_batch_seconds": first_batch_seconds,
+        "rss_mb": rss_after - rss_before,
+        "anon_mb": anon_after - anon_before,
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-worker model load time and memory by artifact format")
+    parser.add_argument("--modes", nargs="+", choices=list(MODES), default=list(MODES))
+    parser.add_argument("--trees", type=int, default=300, help="Trees in the benchmark forest")
+    parser.add_argument("--batch", type=int, default=32, help="Rows scored right after loading")
+    parser.add_argument("--repeats", type=int, default=3, help="Fresh worker processes per mode")
+    args = parser.parse_args()
+
+    predictor = train_predictor(args.trees)
+    X = predictor.encoder.encode_batch(random_requests(args.batch))
+
+    directory = tempfile.mkdtemp(prefix="model_load_bench_")
+    try:
+        joblib.dump(predictor.model, os.path.join(directory, "model.pkl"))
+        save_bundle(
+            os.path.join(directory, "model_bundle.joblib"),
+            forest=FlatForest.from_sklearn(predictor.model),
+            feature_names=predictor.feature_names,
+            label_classes=list(predictor.label_encoder.classes_),
+            feature_importances=predictor.model.feature_importances_
+        )
+        for name in ("model.pkl", "model_bundle.joblib"):
+            print(f"{name:<20} {os.path.getsize(os.path.join(directory, name)) / 2**20:>7.1f} MB")
+
+        # Fresh interpreters, so nothing is already unpickled or mapped
+        context = multiprocessing.get_context("spawn")
+        print(f"\n{'mode':<14} {'load':>9} {'first batch':>12} {'RSS':>9} {'private':>9}")
+        for mode in args.modes:
+            results = []
+            for _ in range(args.repeats):
+                queue = context.Queue()
+                process = context.Process(target=load_worker, args=(mode, directory, X, queue))
+                process.start()
+                results.append(queue.get())
+                process.join()
+
+            def median(key):
+                return float(np.median([result[key] for result in results]))
+
+            print(
+                f"{mode:<14} {median('load_seconds') * 1000:>7.1f}ms {median('first_batch_seconds') * 1000:>10.2f}ms "
+                f"{median('rss_mb'):>7.1f}MB {median('anon_mb'):>7.1f}MB"
+            )
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
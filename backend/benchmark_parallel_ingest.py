@@ -0,0 +1,50 @@
+import argparse
+import os
+import shutil
+import tempfile
+
+# load_csv_to_db writes to the configured database, so point it at a
+# scratch file before the app modules create their engines
+SCRATCH_DIR = tempfile.mkdtemp(prefix="parallel_ingest_bench_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(SCRATCH_DIR, 'accidents.db')}"
+
+from config import Config
+from app.data_migration import load_csv_to_db
+from app.database import Base, get_engine
+from app.ingest_pipeline import load_csv_parallel
+from benchmark_preprocess import random_accident_frame
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CSV ingestion throughput by number of parser processes")
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--workers", nargs="+", type=int, default=[1, 2, 4])
+    parser.add_argument("--block-bytes", type=int, default=Config.INGEST_BLOCK_BYTES)
+    args = parser.parse_args()
+
+    try:
+        csv_path = os.path.join(SCRATCH_DIR, "accidents.csv")
+        random_accident_frame(args.rows, bad_rate=0).to_csv(csv_path, index=False)
+        print(f"{args.rows} rows, {os.path.getsize(csv_path) / 2**20:.0f} MB, {os.cpu_count()} CPUs")
+
+        engine = get_engine("bulk_load")
+        print(f"{'workers':>7} {'time':>8} {'rows/s':>10} {'parse':>8} {'preprocess':>11} {'write':>8} {'writer wait':>12}")
+        for workers in args.workers:
+            Base.metadata.drop_all(bind=engine)
+            Base.metadata.create_all(bind=engine)
+            if workers > 1:
+                stats = load_csv_parallel(csv_path, workers, block_size=args.block_bytes, resume=False)
+            else:
+                stats = load_csv_to_db(csv_path, workers=1, resume=False)
+            stages = stats['stage_seconds']
+            print(
+                f"{workers:>7} {stats['elapsed_seconds']:>7.1f}s {stats['rows_per_second']:>10,.0f} "
+                f"{stages['parse']:>7.1f}s {stages['preprocess']:>10.1f}s "
+                f"{stages['write']:>7.1f}s {stats.get('writer_wait_seconds', 0):>11.1f}s"
+            )
+    finally:
+        shutil.rmtree(SCRATCH_DIR, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
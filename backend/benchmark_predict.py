@@ -0,0 +1,145 @@
+import argparse
+import random
+import time
+import pandas as pd
+from app.ml_model.feature_encoder import derive_features
+from app.ml_model.forest_engine import FlatForest
+from app.ml_model.model_training import AccidentPredictor, WARMUP_INPUT
+
+CATEGORY_VALUES = {
+    "weather_conditions": ["Fine", "Rain", "Fog", "Snow", "Fine no high winds"],
+    "light_conditions": ["Daylight", "Darkness", "Dusk"],
+    "road_type": ["Single carriageway", "Dual carriageway", "Roundabout"],
+    "road_surface_conditions": ["Dry", "Wet", "Snow/Ice"],
+    "junction_detail": ["Not at junction", "T junction", "Crossroads"],
+    "urban_or_rural_area": ["Urban", "Rural"],
+}
+
+
+def random_requests(n, seed=42):
+    """Prediction requests with random dates, times, locations and categories"""
+    rng = random.Random(seed)
+    requests = []
+    for _ in range(n):
+        request = dict(WARMUP_INPUT)
+        request.update({
+            "accident_date": f"20{rng.randrange(15, 24)}-{rng.randrange(1, 13):02d}-{rng.randrange(1, 29):02d}",
+            "accident_time": f"{rng.randrange(24):02d}:{rng.randrange(60):02d}",
+            "longitude": rng.uniform(-0.5, 0.5),
+            "latitude": rng.uniform(51.0, 52.0),
+            "speed_limit": rng.choice([30, 40, 50, 60, 70]),
+        })
+        for column, values in CATEGORY_VALUES.items():
+            request[column] = rng.choice(values)
+        requests.append(request)
+    return requests
+
+
+def train_predictor(n_estimators):
+    """Predictor fitted on the built-in synthetic sample data"""
+    predictor = AccidentPredictor(use_database=False, initialize=False)
+    predictor._create_sample_data()
+    predictor.train_model(params={"n_estimators": n_estimators})
+    return predictor
+
+
+def best_of(repeats, fn):
+    """Fastest wall time of ``repeats`` runs, in seconds"""
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def bench_encode(predictor, args):
+    """FeatureEncoder against a one-row DataFrame through get_dummies + reindex"""
+    print(f"{'requests':>8} {'get_dummies':>12} {'encode':>10} {'encode_batch':>13} {'speedup':>8}")
+    for size in args.sizes:
+        requests = random_requests(size)
+
+        def dataframe():
+            for request in requests:
+                predictor._featurize(pd.DataFrame([derive_features(request)]))
+
+        def encode():
+            for request in requests:
+                predictor.encoder.encode(request)
+
+        dataframe_seconds = best_of(args.repeats, dataframe)
+        encode_seconds = best_of(args.repeats, encode)
+        batch_seconds = best_of(args.repeats, lambda: predictor.encoder.encode_batch(requests))
+        print(
+            f"{size:>8} {dataframe_seconds / size * 1e6:>10.1f}us {encode_seconds / size * 1e6:>8.1f}us "
+            f"{batch_seconds / size * 1e6:>11.1f}us {dataframe_seconds / encode_seconds:>7.0f}x"
+        )
+
+
+def bench_batch(predictor, args):
+    """Looped predict() against one predict_batch() call, cache bypassed"""
+    print(f"{'batch':>6} {'loop':>10} {'batch call':>11} {'speedup':>8}")
+    for size in args.sizes:
+        requests = random_requests(size)
+
+        def loop():
+            predictor.cache.clear()
+            for request in requests:
+                predictor.predict(request)
+
+        def batch():
+            predictor.cache.clear()
+            predictor.predict_batch(requests)
+
+        loop_seconds = best_of(args.repeats, loop)
+        batch_seconds = best_of(args.repeats, batch)
+        print(
+            f"{size:>6} {loop_seconds * 1000:>8.1f}ms {batch_seconds * 1000:>9.1f}ms "
+            f"{loop_seconds / batch_seconds:>7.1f}x"
+        )
+
+
+def bench_engine(predictor, args):
+    """FlatForest against RandomForestClassifier.predict_proba on encoded batches"""
+    model = predictor.model
+    flat = FlatForest.from_sklearn(model)
+    n_jobs = model.n_jobs
+    print(f"{'batch':>6} {'sklearn n_jobs=1':>17} {'sklearn n_jobs=-1':>18} {'flat':>10} {'speedup':>8}")
+    for size in args.sizes:
+        X = predictor.encoder.encode_batch(random_requests(size))
+
+        model.set_params(n_jobs=1)
+        sequential_seconds = best_of(args.repeats, lambda: model.predict_proba(X))
+        model.set_params(n_jobs=-1)
+        parallel_seconds = best_of(args.repeats, lambda: model.predict_proba(X))
+        model.set_params(n_jobs=n_jobs)
+        flat_seconds = best_of(args.repeats, lambda: flat.predict_proba(X))
+        print(
+            f"{size:>6} {sequential_seconds * 1000:>15.2f}ms {parallel_seconds * 1000:>16.2f}ms "
+            f"{flat_seconds * 1000:>8.2f}ms {min(sequential_seconds, parallel_seconds) / flat_seconds:>7.1f}x"
+        )
+
+
+BENCHMARKS = {
+    "encode": bench_encode,
+    "batch": bench_batch,
+    "engine": bench_engine,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prediction path timings on a synthetic model")
+    parser.add_argument("--benchmarks", nargs="+", choices=list(BENCHMARKS), default=list(BENCHMARKS))
+    parser.add_argument("--sizes", nargs="+", type=int, default=[1, 32, 256, 4096])
+    parser.add_argument("--trees", type=int, default=100, help="Trees in the benchmark forest")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    predictor = train_predictor(args.trees)
+    for name in args.benchmarks:
+        print(f"\n== {name} ==")
+        BENCHMARKS[name](predictor, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+import argparse
+import time
+from datetime import time as time_of_day
+import numpy as np
+import pandas as pd
+from app.data_migration import _categorize_time, _parse_time, preprocess_accident_data
+
+VALID_TIMES = [f"{h:02d}:{m:02d}" for h in range(24) for m in range(60)] + ["7:05", "9:5", "08:30:00"]
+# Malformed, out-of-range and empty values the CSVs contain in practice
+BAD_TIMES = ["24:00", "23:60", "", " ", "abc", "12", "-1:30", " 7:30", "7:30 ", "1:2:3", "::", "12:xx", "٣:٤٥"]
+BAD_DATES = ["", "garbage", "2021-02-30", "31/31/2021", "0000-00-00"]
+
+
+def random_accident_frame(n_rows, seed=0, bad_rate=0.05, date_format="%Y-%m-%d"):
+    """Raw CSV-like frame with a share of missing, malformed and edge-case values"""
+    rng = np.random.default_rng(seed)
+    bad = rng.random(n_rows) < bad_rate
+
+    times = rng.choice(np.array(VALID_TIMES, dtype=object), n_rows)
+    times[bad] = rng.choice(np.array(BAD_TIMES + [np.nan, None], dtype=object), int(bad.sum()))
+
+    days = pd.Timestamp("2015-01-01") + pd.to_timedelta(rng.integers(0, 3650, n_rows), unit="D")
+    dates = days.strftime(date_format).to_numpy(dtype=object)
+    bad_dates = rng.random(n_rows) < bad_rate
+    dates[bad_dates] = rng.choice(np.array(BAD_DATES + [np.nan], dtype=object), int(bad_dates.sum()))
+
+    speed = rng.choice([20, 30, 40, 50, 60, 70], n_rows).astype(float)
+    speed[rng.random(n_rows) < bad_rate] = np.nan
+    weather = rng.choice(np.array(["Fine", "Raining", "Snowing", "Fog", None], dtype=object), n_rows)
+
+    return pd.DataFrame({
+        "Accident_Index": [f"ACC{i:08d}" for i in range(n_rows)],
+        "Longitude": rng.uniform(-3, 1, n_rows),
+        "Latitude": rng.uniform(50, 55, n_rows),
+        "Date": dates,
+        "Time": times,
+        "Accident_Severity": rng.choice(np.array(["1", "2", "3", "Slight", "bad", None], dtype=object), n_rows),
+        "Weather_Conditions": weather,
+        "Speed_limit": speed,
+    })
+
+
+def rowwise_preprocess(df):
+    """preprocess_accident_data as it was before vectorization (per-row apply)"""
+    column_mapping = {
+        'Accident_Index': 'accident_index', 'Longitude': 'longitude', 'Latitude': 'latitude',
+        'Date': 'accident_date', 'Time': 'accident_time', 'Accident_Severity': 'severity',
+        'Weather_Conditions': 'weather_conditions', 'Light_Conditions': 'light_conditions',
+        'Road_Type': 'road_type', 'Speed_limit': 'speed_limit',
+        'Road_Surface_Conditions': 'road_surface_conditions', 'Junction_Detail': 'junction_detail',
+        'Urban_or_Rural_Area': 'urban_or_rural_area'
+    }
+    df = df.rename(columns={k: v for k, v in column_mapping.items() if k in df.columns})
+
+    if 'accident_date' in df.columns:
+        df['accident_date'] = pd.to_datetime(df['accident_date'], errors='coerce').dt.date
+    if 'accident_time' in df.columns:
+        df['accident_time'] = df['accident_time'].apply(_parse_time)
+        df['hour'] = df['accident_time'].apply(lambda x: x.hour if x else None)
+    if 'severity' in df.columns:
+        severity_mapping = {
+            '1': 'Fatal', '2': 'Serious', '3': 'Slight',
+            'Fatal': 'Fatal', 'Serious': 'Serious', 'Slight': 'Slight'
+        }
+        df['severity'] = df['severity'].map(severity_mapping)
+    if 'accident_date' in df.columns:
+        dates = pd.to_datetime(df['accident_date'])
+        df['year'] = dates.dt.year
+        df['month'] = dates.dt.month
+        df['day'] = dates.dt.day
+        df['day_of_week'] = dates.dt.dayofweek
+        df['is_weekend'] = df['day_of_week'].isin([5, 6]).astype(bool)
+    if 'hour' in df.columns:
+        df['time_of_day'] = df['hour'].apply(_categorize_time)
+
+    numeric_cols = df.select_dtypes(include=[np.number]).columns
+    categorical_cols = df.select_dtypes(include=['object']).columns
+    for col in numeric_cols:
+        if df[col].isnull().any():
+            df[col] = df[col].fillna(df[col].median())
+    for col in categorical_cols:
+        if df[col].isnull().any():
+            df[col] = df[col].fillna('Unknown')
+    return df
+
+
+def timed(fn, df):
+    """Wall time of one call on a copy of ``df``, in seconds"""
+    df = df.copy()
+    started = time.perf_counter()
+    fn(df)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Row-wise vs vectorized preprocess_accident_data")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--bad-rate", type=float, default=0.05, help="Share of malformed dates and times")
+    parser.add_argument("--skip-rowwise", action="store_true", help="Only time the vectorized version")
+    args = parser.parse_args()
+
+    df = random_accident_frame(args.rows, bad_rate=args.bad_rate)
+    print(f"{args.rows} rows, {args.bad_rate:.0%} malformed dates/times")
+
+    vectorized = timed(preprocess_accident_data, df)
+    print(f"vectorized {vectorized:>8.2f}s  {args.rows / vectorized:>12,.0f} rows/s")
+    if not args.skip_rowwise:
+        rowwise = timed(rowwise_preprocess, df)
+        print(f"row-wise   {rowwise:>8.2f}s  {args.rows / rowwise:>12,.0f} rows/s  ({rowwise / vectorized:.1f}x slower)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+import argparse
+import datetime
+import multiprocessing
+import os
+import random
+import resource
+import shutil
+import tempfile
+import time
+import pandas as pd
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from app.database import Base, create_profile_engine
+from app import crud, models
+from app.ml_model.model_training import TRAINING_COLUMNS
+
+CATEGORIES = {
+    "weather_conditions": ["Fine", "Raining", "Snowing", "Fog", None],
+    "light_conditions": ["Daylight", "Darkness", "Dusk"],
+    "road_type": ["Single carriageway", "Dual carriageway", "Roundabout"],
+    "road_surface_conditions": ["Dry", "Wet", "Snow/Ice"],
+    "junction_detail": ["Not at junction", "T junction", "Crossroads"],
+    "urban_or_rural_area": ["Urban", "Rural"],
+    "time_of_day": ["Night", "Morning", "Afternoon", "Evening"],
+}
+
+
+def seed_accidents(engine, n_rows, batch_size=50000, first_index=0, seed=42):
+    """Fill the accidents table with random rows carrying every training column"""
+    rng = random.Random(seed)
+    start = datetime.date(2015, 1, 1)
+    end = first_index + n_rows
+    for first in range(first_index, end, batch_size):
+        rows = []
+        for i in range(first, min(first + batch_size, end)):
+            day = start + datetime.timedelta(days=rng.randrange(3650))
+            hour = rng.randrange(24)
+            row = {
+                "accident_index": f"BENCH{i:08d}",
+                "longitude": rng.uniform(-3.0, 1.0),
+                "latitude": rng.uniform(50.0, 55.0),
+                "accident_date": day,
+                "accident_time": datetime.time(hour, rng.randrange(60)),
+                "severity": rng.choice(["Fatal", "Serious", "Slight"]),
+                # Some NULLs, so speed_limit takes the float/NaN path
+                "speed_limit": rng.choice([20, 30, 40, 50, 60, 70, None]),
+                "year": day.year,
+                "month": day.month,
+                "day": day.day,
+                "hour": hour,
+                "day_of_week": day.weekday(),
+                "is_weekend": day.weekday() >= 5,
+            }
+            for column, values in CATEGORIES.items():
+                row[column] = rng.choice(values)
+            rows.append(row)
+        with engine.begin() as conn:
+            conn.execute(insert(models.Accident.__table__), rows)
+
+
+def load_orm(db, limit, chunk_size):
+    """The former training load: ORM objects through get_accidents, then per-row dicts"""
+    accidents = crud.CRUD(db).get_accidents(limit=limit)
+    return pd.DataFrame([
+        {column: getattr(accident, column) for column in TRAINING_COLUMNS}
+        for accident in accidents
+    ])
+
+
+def load_columns(db, limit, chunk_size):
+    """load_accident_columns straight into NumPy arrays"""
+    return pd.DataFrame(
+        crud.CRUD(db).load_accident_columns(TRAINING_COLUMNS, limit=limit, chunk_size=chunk_size),
+        copy=False
+    )
+
+
+LOADERS = {
+    "orm": load_orm,
+    "columns": load_columns,
+}
+
+
+def load_worker(name, url, limit, chunk_size, queue):
+    """Run one loader in a fresh process and report its time and peak memory"""
+    engine = create_profile_engine("analytics", url=url)
+    db = Session(bind=engine)
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    started = time.perf_counter()
+    frame = LOADERS[name](db, limit, chunk_size)
+    seconds = time.perf_counter() - started
+
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    queue.put({
+        "rows": len(frame),
+        "seconds": seconds,
+        "peak_mb": (peak_kb - baseline_kb) / 1024,
+        "frame_mb": frame.memory_usage(deep=True).sum() / 2**20,
+    })
+    db.close()
+    engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ORM vs column-wise loading of training data")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Accidents seeded and loaded")
+    parser.add_argument("--loaders", nargs="+", choices=list(LOADERS), default=list(LOADERS))
+    parser.add_argument("--chunk-size", type=int, default=50000)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="training_load_bench_")
+    try:
+        url = f"sqlite:///{os.path.join(directory, 'accidents.db')}"
+        engine = create_profile_engine("bulk_load", url=url)
+        Base.metadata.create_all(bind=engine)
+        started = time.perf_counter()
+        seed_accidents(engine, args.rows)
+        engine.dispose()
+        print(f"Seeded {args.rows} accidents in {time.perf_counter() - started:.1f}s")
+
+        # A fresh process per loader, so peak RSS is not shared between them
+        context = multiprocessing.get_context("spawn")
+        print(f"{'loader':<8} {'rows':>9} {'time':>8} {'rows/s':>10} {'peak RSS':>9} {'frame':>8}")
+        for name in args.loaders:
+            queue = context.Queue()
+            process = context.Process(target=load_worker, args=(name, url, args.rows, args.chunk_size, queue))
+            process.start()
+            result = queue.get()
+            process.join()
+            print(
+                f"{name:<8} {result['rows']:>9} {result['seconds']:>7.2f}s {result['rows'] / result['seconds']:>10,.0f} "
+                f"{result['peak_mb']:>7.0f}MB {result['frame_mb']:>6.0f}MB"
+            )
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import argparse
+import gzip
+import io
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+
+# The loader writes to the configured database, so point it at a scratch
+# file before the app modules create their engines (spawned workers
+# re-import this module and inherit the directory through the environment)
+SCRATCH_DIR = os.environ.get("UPLOAD_BENCH_DIR") or tempfile.mkdtemp(prefix="upload_bench_")
+os.environ["UPLOAD_BENCH_DIR"] = SCRATCH_DIR
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(SCRATCH_DIR, 'accidents.db')}"
+
+import pandas as pd
+from app.database import ENGINE_PROFILES, Base, get_engine
+from app.stream_ingest import CsvStreamLoader
+from benchmark_preprocess import random_accident_frame
+
+MODES = {
+    "stream": "CsvStreamLoader fed one request piece at a time",
+    "buffered": "whole body read, decompressed and parsed at once (no inserts)",
+}
+
+
+def memory_kb():
+    """(current, peak) RSS of this process in kB, from /proc/self/status"""
+    values = {}
+    with open("/proc/self/status") as f:
+        for line in f:
+            name, _, value = line.partition(":")
+            values[name] = value.split()[0] if value.split() else None
+    return int(values["VmRSS"]), int(values["VmHWM"])
+
+
+def upload_worker(mode, path, piece_bytes, cache_kib, queue):
+    """Consume one upload in a fresh process and report its peak RSS growth"""
+    if cache_kib:
+        ENGINE_PROFILES["bulk_load"]["pragmas"]["cache_size"] = -cache_kib
+    # Reset the peak, which imports have already raised above the baseline
+    with open("/proc/self/clear_refs", "w") as f:
+        f.write("5")
+    baseline_kb, _ = memory_kb()
+    started = time.perf_counter()
+    with open(path, "rb") as f:
+        if mode == "stream":
+            loader = CsvStreamLoader()
+            while piece := f.read(piece_bytes):
+                loader.feed(piece)
+            rows = loader.finish()["rows_read"]
+        else:
+            rows = len(pd.read_csv(io.BytesIO(gzip.decompress(f.read()))))
+    seconds = time.perf_counter() - started
+    _, peak_kb = memory_kb()
+    queue.put({"rows": rows, "seconds": seconds, "peak_mb": (peak_kb - baseline_kb) / 1024})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Peak memory of a gzip CSV upload by body size")
+    parser.add_argument("--rows", nargs="+", type=int, default=[50000, 200000, 800000])
+    parser.add_argument("--modes", nargs="+", choices=list(MODES), default=list(MODES))
+    parser.add_argument("--piece-bytes", type=int, default=64 * 1024, help="Size of each request body piece")
+    parser.add_argument(
+        "--sqlite-cache-kib", type=int, default=None,
+        help="Override the bulk_load page cache, whose pages count towards RSS as the database grows"
+    )
+    args = parser.parse_args()
+
+    # Fresh interpreters, so peak RSS is not shared between runs
+    context = multiprocessing.get_context("spawn")
+    try:
+        print(f"{'rows':>8} {'gzip':>8} {'csv':>8} {'mode':<9} {'time':>8} {'rows/s':>9} {'peak RSS':>9}")
+        for n_rows in args.rows:
+            csv_bytes = random_accident_frame(n_rows, bad_rate=0).to_csv(index=False).encode()
+            path = os.path.join(SCRATCH_DIR, f"accidents_{n_rows}.csv.gz")
+            with open(path, "wb") as f:
+                f.write(gzip.compress(csv_bytes))
+            for mode in args.modes:
+                engine = get_engine("bulk_load")
+                Base.metadata.drop_all(bind=engine)
+                Base.metadata.create_all(bind=engine)
+                queue = context.Queue()
+                process = context.Process(target=upload_worker, args=(mode, path, args.piece_bytes, args.sqlite_cache_kib, queue))
+                process.start()
+                result = queue.get()
+                process.join()
+                print(
+                    f"{n_rows:>8} {os.path.getsize(path) / 2**20:>6.1f}MB {len(csv_bytes) / 2**20:>6.1f}MB "
+                    f"{mode:<9} {result['seconds']:>7.1f}s {result['rows'] / result['seconds']:>9,.0f} "
+                    f"{result['peak_mb']:>7.0f}MB"
+                )
+    finally:
+        shutil.rmtree(SCRATCH_DIR, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
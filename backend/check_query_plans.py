@@ -0,0 +1,137 @@
+import datetime
+import os
+import re
+import shutil
+import sys
+import tempfile
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.database import Base, create_profile_engine
+from app import crud, models
+
+
+def crud_query_shapes(crud_obj):
+    """One call per CRUD read path and filter combination
+
+    get_hotspots is only checked with filters: an unfiltered random
+    sample has to read every row whatever the indexes.
+    """
+    day = datetime.date(2021, 6, 1)
+    return [
+        ("get_accidents", lambda: crud_obj.get_accidents()),
+        ("get_accidents by severity and date", lambda: crud_obj.get_accidents(
+            severity="Fatal", start_date=day, end_date=day + datetime.timedelta(days=30)
+        )),
+        ("get_accidents by bounding box", lambda: crud_obj.get_accidents(
+            min_latitude=51.2, max_latitude=51.4, min_longitude=-0.2, max_longitude=0.1
+        )),
+        ("get_accidents by longitude", lambda: crud_obj.get_accidents(min_longitude=-0.2, max_longitude=0.1)),
+        ("get_accidents after id", lambda: crud_obj.get_accidents(after_id=100)),
+        ("get_accident", lambda: crud_obj.get_accident(1)),
+        ("get_accident_by_index", lambda: crud_obj.get_accident_by_index("ACC000001")),
+        ("load_accident_columns", lambda: crud_obj.load_accident_columns(["id", "severity"], limit=10)),
+        ("load_accident_columns after id", lambda: crud_obj.load_accident_columns(["id"], after_id=100)),
+        ("get_accident_statistics", lambda: crud_obj.get_accident_statistics()),
+        ("get_hotspots by severity and date", lambda: crud_obj.get_hotspots(
+            severity_filter=["Fatal", "Serious"], start_date=day, end_date=day + datetime.timedelta(days=30)
+        )),
+        ("get_temporal_trends", lambda: crud_obj.get_temporal_trends()),
+        ("get_temporal_trends by severity", lambda: crud_obj.get_temporal_trends(severity="Fatal")),
+        ("get_predictions", lambda: crud_obj.get_predictions()),
+        ("get_predictions needing review", lambda: crud_obj.get_predictions(needs_review=True)),
+        ("get_prediction_metrics", lambda: crud_obj.get_prediction_metrics()),
+        ("insert dedup lookup", lambda: crud_obj._drop_existing_accidents([{"accident_index": "ACC000001"}])),
+        ("get_ingest_state", lambda: crud_obj.get_ingest_state("/data/accidents.csv")),
+    ]
+
+
+def partial_indexes():
+    """Names of the declared indexes with a WHERE clause"""
+    return {
+        index.name
+        for table in Base.metadata.tables.values()
+        for index in table.indexes
+        if index.dialect_options["sqlite"]["where"] is not None
+    }
+
+
+def full_scans(plan_rows, statement, partial=frozenset()):
+    """Plan steps reading a whole table or a whole index
+
+    A bare SCAN reads the table; SCAN ... USING [COVERING] INDEX walks an
+    entire index. Walking an index is accepted for unfiltered statements
+    (ordered reads cut short by LIMIT, aggregates over every row), where no
+    index could narrow the read, and for partial indexes, which only hold
+    the rows the filter selects.
+    """
+    filtered = re.search(r"\bWHERE\b", statement, re.IGNORECASE) is not None
+    scans = []
+    for detail in (row[-1] for row in plan_rows):
+        if not detail.startswith("SCAN"):
+            continue
+        index = re.search(r"USING (?:COVERING )?INDEX (\w+)", detail)
+        if index is None or (filtered and index.group(1) not in partial):
+            scans.append(detail)
+    return scans
+
+
+def find_full_scans():
+    """Run every CRUD query shape on an empty database and collect its full scans
+
+    Returns (label, plan details, statement) per offending statement and
+    prints a line per query shape.
+    """
+    directory = tempfile.mkdtemp(prefix="query_plans_")
+    try:
+        engine = create_profile_engine("oltp", url=f"sqlite:///{os.path.join(directory, 'plans.db')}")
+        Base.metadata.create_all(bind=engine)
+
+        db = Session(bind=engine)
+        # A stored prediction, so get_prediction_metrics runs all its queries
+        db.add(models.Prediction(
+            prediction_id="PRED_CHECK", input_data="{}", predicted_severity="Slight",
+            predicted_severity_code=2, confidence=0.9, is_correct=True
+        ))
+        db.commit()
+
+        captured = []
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT"):
+                captured.append((statement, parameters))
+
+        partial = partial_indexes()
+        failures = []
+        crud_obj = crud.CRUD(db)
+        for label, call in crud_query_shapes(crud_obj):
+            captured.clear()
+            call()
+            statements = list(captured)
+            label_failures = 0
+            for statement, parameters in statements:
+                plan = db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+                scans = full_scans(plan, statement, partial)
+                if scans:
+                    label_failures += 1
+                    failures.append((label, scans, statement))
+                    print(f"FULL SCAN  {label}: {'; '.join(scans)}")
+                    print(f"           {' '.join(statement.split())}")
+            if not label_failures:
+                print(f"ok         {label} ({len(statements)} queries)")
+
+        db.close()
+        engine.dispose()
+        return failures
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def main() -> int:
+    failures = find_full_scans()
+    print(f"{len(failures)} queries scan a full table or index" if failures else "No full scans")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -19,14 +19,93 @@ class Config:
     
     # Database configuration
     DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./accidents.db")
+    # Engine profile of the main engine ("oltp", "bulk_load", "analytics");
+    # CSV ingestion always uses the bulk_load profile
+    DB_PROFILE = os.getenv("DB_PROFILE", "oltp").lower()
     
     # ML Model paths
     MODEL_PATH = "app/ml_model/model.pkl"
     PREPROCESSOR_PATH = "app/ml_model/preprocessing_pipeline.pkl"
     FEATURES_PATH = "app/ml_model/feature_names.json"
     
+    # Single-file bundle (flattened model, feature names, label classes)
+    # memory-mapped read-only so workers share its pages
+    MODEL_BUNDLE_PATH = "app/ml_model/model_bundle.joblib"
+    MODEL_MMAP = os.getenv("MODEL_MMAP", "True").lower() == "true"
+    VERIFY_MODEL_CHECKSUM = os.getenv("VERIFY_MODEL_CHECKSUM", "True").lower() == "true"
+
+    # Model registry: immutable versioned artifacts plus a CURRENT pointer
+    MODEL_REGISTRY_DIR = os.getenv("MODEL_REGISTRY_DIR", "app/ml_model/registry")
+    AUTO_PROMOTE_MODELS = os.getenv("AUTO_PROMOTE_MODELS", "True").lower() == "true"
+
+    # Training mode for retrain jobs: "full" refits from scratch; opt in to
+    # "incremental" to add warm-started trees on rows newer than the served
+    # version (falling back to a full retrain when not possible or a
+    # periodic rebuild is due)
+    TRAINING_MODE = os.getenv("TRAINING_MODE", "full").lower()
+    INCREMENTAL_TREES = int(os.getenv("INCREMENTAL_TREES", 20))
+    INCREMENTAL_MIN_ROWS = int(os.getenv("INCREMENTAL_MIN_ROWS", 500))
+    MAX_FOREST_TREES = int(os.getenv("MAX_FOREST_TREES", 300))
+    FULL_RETRAIN_EVERY = int(os.getenv("FULL_RETRAIN_EVERY", 5))
+
+    # Hyperparameter tuning jobs (successive halving over a process pool)
+    TUNING_MAX_CANDIDATES = int(os.getenv("TUNING_MAX_CANDIDATES", 27))
+    TUNING_TIME_BUDGET = float(os.getenv("TUNING_TIME_BUDGET", 600)) or None
+    TUNING_CPU_BUDGET = float(os.getenv("TUNING_CPU_BUDGET", 0)) or None
+    TUNING_WORKERS = int(os.getenv("TUNING_WORKERS", os.cpu_count() or 2))
+    TUNING_CACHE_DIR = os.getenv("TUNING_CACHE_DIR", "app/ml_model/cache")
+    PREDICTION_P99_BUDGET_MS = float(os.getenv("PREDICTION_P99_BUDGET_MS", 10))
+
+    # Shadow scoring of sampled live requests with a candidate version
+    SHADOW_SAMPLE_RATE = float(os.getenv("SHADOW_SAMPLE_RATE", 0.1))
+    SHADOW_BATCH_SIZE = int(os.getenv("SHADOW_BATCH_SIZE", 64))
+    SHADOW_MAX_PENDING = int(os.getenv("SHADOW_MAX_PENDING", 5000))
+    SHADOW_FLUSH_INTERVAL_MS = int(os.getenv("SHADOW_FLUSH_INTERVAL_MS", 1000))
+
     # Data paths
     DATA_PATH = "app/data/AccidentsBig_processed.csv"
+
+    # CSV ingestion: rows per chunk, rows per transaction and duplicate
+    # handling ("on_conflict" INSERT ... DO NOTHING, "lookup" IN query, "auto").
+    # A transaction holds SQLite's write lock until it commits, and request
+    # writers (oltp profile) give up after busy_timeout (5 s): at 10000 rows
+    # the lock is held for about 0.6 s, at 100000 for about 6 s, for the same
+    # throughput (see benchmark_ingest.py). Larger values only pay off when
+    # nothing else writes during the load.
+    INGEST_CHUNK_SIZE = int(os.getenv("INGEST_CHUNK_SIZE", 10000))
+    INGEST_COMMIT_ROWS = int(os.getenv("INGEST_COMMIT_ROWS", 10000))
+    INGEST_DEDUP_STRATEGY = os.getenv("INGEST_DEDUP_STRATEGY", "auto").lower()
+    # Parallel ingestion: worker processes parsing CSV byte ranges of
+    # INGEST_BLOCK_BYTES, at most INGEST_QUEUE_BLOCKS parsed blocks waiting
+    # for the single database writer (1 worker = sequential chunked load)
+    INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", 1))
+    INGEST_BLOCK_BYTES = int(os.getenv("INGEST_BLOCK_BYTES", 8 * 1024 * 1024))
+    INGEST_QUEUE_BLOCKS = int(os.getenv("INGEST_QUEUE_BLOCKS", 0)) or None
+    # Resume interrupted loads from the checkpoint in the ingest_state table;
+    # files are identified by size, mtime and a hash of their first and last
+    # INGEST_HASH_SAMPLE_BYTES
+    INGEST_HASH_SAMPLE_BYTES = int(os.getenv("INGEST_HASH_SAMPLE_BYTES", 1024 * 1024))
+    # Explicit CSV date format (e.g. "%d/%m/%Y"); unset infers it like pandas
+    INGEST_DATE_FORMAT = os.getenv("INGEST_DATE_FORMAT") or None
+
+    # Real-time accident feed (/api/db/accidents/feed): records per
+    # transaction and per request
+    FEED_COMMIT_ROWS = int(os.getenv("FEED_COMMIT_ROWS", 1000))
+    MAX_FEED_RECORDS = int(os.getenv("MAX_FEED_RECORDS", 50000))
+    
+    # Training data loaded from the database (newest rows first)
+    TRAINING_MAX_ROWS = int(os.getenv("TRAINING_MAX_ROWS", 100000))
+    TRAINING_LOAD_CHUNK_SIZE = int(os.getenv("TRAINING_LOAD_CHUNK_SIZE", 50000))
+
+    # Compact the predictor's analytics frame (categories, narrow numerics,
+    # int32 day numbers) after loading
+    COMPACT_DATA = os.getenv("COMPACT_DATA", "True").lower() == "true"
+
+    # On-disk cache of featurized training matrices, keyed by a fingerprint
+    # of the accidents table
+    MATRIX_CACHE_ENABLED = os.getenv("MATRIX_CACHE_ENABLED", "True").lower() == "true"
+    MATRIX_CACHE_DIR = os.getenv("MATRIX_CACHE_DIR", "app/ml_model/cache")
+    MATRIX_CACHE_MAX_ENTRIES = int(os.getenv("MATRIX_CACHE_MAX_ENTRIES", 3))
     
     # Prediction settings
     SEVERITY_MAP = {
@@ -37,6 +116,40 @@ class Config:
     
     CONFIDENCE_THRESHOLD = 0.6
     
+    # Inference engine: "sklearn" (RandomForestClassifier.predict_proba) or
+    # "flat" (flattened NumPy forest, bit-identical probabilities)
+    INFERENCE_ENGINE = os.getenv("INFERENCE_ENGINE", "sklearn").lower()
+    
+    # Prediction result cache (LRU with TTL)
+    PREDICTION_CACHE_SIZE = int(os.getenv("PREDICTION_CACHE_SIZE", 10000))
+    PREDICTION_CACHE_TTL = int(os.getenv("PREDICTION_CACHE_TTL", 3600))
+    
+    # Maximum number of items accepted by /api/predict/batch
+    MAX_PREDICTION_BATCH_SIZE = int(os.getenv("MAX_PREDICTION_BATCH_SIZE", 10000))
+    
+    # Micro-batching of concurrent /api/predict calls
+    PREDICTION_BATCHING = os.getenv("PREDICTION_BATCHING", "True").lower() == "true"
+    BATCH_MAX_SIZE = int(os.getenv("BATCH_MAX_SIZE", 64))
+    BATCH_MAX_WAIT_US = int(os.getenv("BATCH_MAX_WAIT_US", 2000))
+    
+    # Bounded executors keeping blocking work off the event loop
+    DB_EXECUTOR_WORKERS = int(os.getenv("DB_EXECUTOR_WORKERS", 8))
+    DB_EXECUTOR_QUEUE = int(os.getenv("DB_EXECUTOR_QUEUE", 64))
+    CPU_EXECUTOR_WORKERS = int(os.getenv("CPU_EXECUTOR_WORKERS", os.cpu_count() or 2))
+    CPU_EXECUTOR_QUEUE = int(os.getenv("CPU_EXECUTOR_QUEUE", 128))
+    EXECUTOR_RETRY_AFTER = int(os.getenv("EXECUTOR_RETRY_AFTER", 1))
+    
+    # Write-behind buffering of prediction history
+    PREDICTION_WRITE_BEHIND = os.getenv("PREDICTION_WRITE_BEHIND", "True").lower() == "true"
+    WRITE_BEHIND_BATCH_SIZE = int(os.getenv("WRITE_BEHIND_BATCH_SIZE", 500))
+    WRITE_BEHIND_FLUSH_INTERVAL_MS = int(os.getenv("WRITE_BEHIND_FLUSH_INTERVAL_MS", 500))
+    WRITE_BEHIND_MAX_PENDING = int(os.getenv("WRITE_BEHIND_MAX_PENDING", 20000))
+    # Flush retries of a failing batch before its bad records are dead-lettered,
+    # backing off exponentially from WRITE_BEHIND_RETRY_DELAY_MS up to the
+    # flush interval
+    WRITE_BEHIND_MAX_RETRIES = int(os.getenv("WRITE_BEHIND_MAX_RETRIES", 3))
+    WRITE_BEHIND_RETRY_DELAY_MS = int(os.getenv("WRITE_BEHIND_RETRY_DELAY_MS", 50))
+    
     # JWT Authentication
     SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
     ALGORITHM = "HS256"
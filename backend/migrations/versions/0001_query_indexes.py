@@ -0,0 +1,59 @@
+"""Indexes for the CRUD query patterns
+
+Adds the composite and covering indexes declared in app/models.py to
+databases whose tables were created before them. Indexes that already
+exist (tables created by init_db after this revision) are left alone.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, columns)
+INDEXES = [
+    ("ix_accidents_severity_date", "accidents", ["severity", "accident_date"]),
+    ("ix_accidents_accident_date", "accidents", ["accident_date"]),
+    ("ix_accidents_location", "accidents", ["latitude", "longitude"]),
+    ("ix_accidents_longitude", "accidents", ["longitude"]),
+    ("ix_accidents_weather_conditions", "accidents", ["weather_conditions"]),
+    ("ix_predictions_created_at", "predictions", ["created_at"]),
+    ("ix_predictions_review_created_at", "predictions", ["needs_manual_review", "created_at"]),
+    ("ix_predictions_is_correct", "predictions", ["is_correct"]),
+]
+
+
+def _existing_indexes(table: str) -> set:
+    # Offline (--sql) runs cannot inspect the database; emit every index
+    if context.is_offline_mode():
+        return set()
+    return {index["name"] for index in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def upgrade() -> None:
+    existing = {table: _existing_indexes(table) for table in {table for _, table, _ in INDEXES}}
+    for name, table, columns in INDEXES:
+        if name not in existing[table]:
+            op.create_index(name, table, columns)
+
+    # Refresh planner statistics so the new indexes are chosen
+    if context.get_context().dialect.name == "sqlite":
+        op.execute("ANALYZE")
+
+
+def downgrade() -> None:
+    existing = {table: _existing_indexes(table) for table in {table for _, table, _ in INDEXES}}
+    for name, table, _ in reversed(INDEXES):
+        if name in existing[table]:
+            op.drop_index(name, table_name=table)
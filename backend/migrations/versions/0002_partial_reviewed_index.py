@@ -0,0 +1,52 @@
+"""Partial index for reviewed predictions
+
+Replaces the full ix_predictions_is_correct index with
+ix_predictions_reviewed, which only holds predictions with a known
+outcome (``is_correct IS NOT NULL``), so get_prediction_metrics never
+walks unreviewed rows.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _existing_indexes() -> set:
+    # Offline (--sql) runs cannot inspect the database; emit every statement
+    if context.is_offline_mode():
+        return set()
+    return {index["name"] for index in sa.inspect(op.get_bind()).get_indexes("predictions")}
+
+
+def upgrade() -> None:
+    existing = _existing_indexes()
+    if "ix_predictions_reviewed" not in existing:
+        op.create_index(
+            "ix_predictions_reviewed", "predictions", ["is_correct"],
+            sqlite_where=sa.text("is_correct IS NOT NULL")
+        )
+    if "ix_predictions_is_correct" in existing or context.is_offline_mode():
+        op.drop_index("ix_predictions_is_correct", table_name="predictions")
+
+    if context.get_context().dialect.name == "sqlite":
+        op.execute("ANALYZE")
+
+
+def downgrade() -> None:
+    existing = _existing_indexes()
+    if "ix_predictions_is_correct" not in existing:
+        op.create_index("ix_predictions_is_correct", "predictions", ["is_correct"])
+    if "ix_predictions_reviewed" in existing or context.is_offline_mode():
+        op.drop_index("ix_predictions_reviewed", table_name="predictions")
@@ -0,0 +1,55 @@
+import os
+import sys
+import tempfile
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+# Keep tests away from the working tree's registry and caches; Config reads
+# these when first imported
+_ARTIFACT_DIR = tempfile.mkdtemp(prefix="backend_tests_")
+os.environ.setdefault("MODEL_REGISTRY_DIR", os.path.join(_ARTIFACT_DIR, "registry"))
+os.environ.setdefault("MATRIX_CACHE_DIR", os.path.join(_ARTIFACT_DIR, "cache"))
+os.environ.setdefault("TUNING_CACHE_DIR", os.path.join(_ARTIFACT_DIR, "cache"))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_ARTIFACT_DIR, 'accidents.db')}")
+
+
+@pytest.fixture(scope="session")
+def trained_predictor():
+    """Small forest trained on the predictor's synthetic sample data"""
+    from app.ml_model.model_training import AccidentPredictor
+
+    predictor = AccidentPredictor(use_database=False, initialize=False)
+    predictor._create_sample_data()
+    predictor.train_model(params={"n_estimators": 20, "max_depth": 6})
+    return predictor
+
+
+@pytest.fixture
+def predictor(trained_predictor):
+    """The shared trained predictor with an empty prediction cache"""
+    trained_predictor.cache.clear()
+    return trained_predictor
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """Sessions on a fresh SQLite database with every table created"""
+    from sqlalchemy.orm import sessionmaker
+    from app.database import Base, create_profile_engine
+
+    engine = create_profile_engine("oltp", url=f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(bind=engine, autoflush=False)
+    engine.dispose()
+
+
+@pytest.fixture
+def app_database():
+    """The configured application database, emptied after the test"""
+    from app.database import Base, engine
+
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    Base.metadata.drop_all(bind=engine)
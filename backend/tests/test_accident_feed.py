@@ -0,0 +1,48 @@
+import datetime
+from app import models
+from app.accident_feed import DUPLICATE, INSERTED, store_accident_feed
+
+
+def feed_record(accident_index, **fields):
+    """A feed record as validated by AccidentFeedRecord"""
+    record = {
+        "accident_index": accident_index, "longitude": -0.1, "latitude": 51.5,
+        "accident_date": datetime.date(2023, 1, 14), "accident_time": None, "severity": "2",
+        "weather_conditions": None, "light_conditions": None, "road_type": None, "speed_limit": None,
+        "road_surface_conditions": None, "junction_detail": None, "urban_or_rural_area": None,
+    }
+    record.update(fields)
+    return record
+
+
+def test_record_without_time_stores_nulls(session_factory):
+    db = session_factory()
+    assert store_accident_feed(db, [feed_record("FEED1")]) == [INSERTED]
+
+    accident = db.query(models.Accident).filter_by(accident_index="FEED1").one()
+    assert accident.accident_time is None
+    assert accident.hour is None
+    assert accident.time_of_day is None
+    assert accident.speed_limit is None
+    assert accident.weather_conditions is None
+    assert accident.severity == "Serious"
+    assert (accident.year, accident.month, accident.day) == (2023, 1, 14)
+    assert accident.day_of_week == 5 and accident.is_weekend is True
+
+
+def test_stored_values_do_not_depend_on_the_batch(session_factory):
+    db = session_factory()
+    statuses = store_accident_feed(db, [
+        feed_record("FEED1", accident_time="07:45", speed_limit=70, weather_conditions="Fine"),
+        feed_record("FEED2", accident_time="25:00"),
+        feed_record("FEED1"),
+    ])
+    assert statuses == [INSERTED, INSERTED, DUPLICATE]
+
+    first = db.query(models.Accident).filter_by(accident_index="FEED1").one()
+    assert (first.accident_time, first.hour, first.time_of_day) == (datetime.time(7, 45), 7, "Morning")
+    assert first.speed_limit == 70
+
+    second = db.query(models.Accident).filter_by(accident_index="FEED2").one()
+    assert (second.accident_time, second.hour, second.time_of_day) == (None, None, None)
+    assert second.speed_limit is None and second.weather_conditions is None
@@ -0,0 +1,55 @@
+import asyncio
+import pytest
+from app.batching import PredictionBatcher
+
+
+class FlakyPredictor:
+    """Fails whole batches containing a "bad" input, scores others alone"""
+
+    def predict_batch(self, inputs, return_exceptions=False):
+        if any(item.get("bad") for item in inputs):
+            raise RuntimeError("batch failed")
+        return [{"id": item["id"]} for item in inputs]
+
+    def predict(self, input_data):
+        if input_data.get("bad"):
+            raise ValueError(f"bad input {input_data['id']}")
+        return {"id": input_data["id"]}
+
+
+class EncodingErrorPredictor:
+    """Reports encoding failures per input, like AccidentPredictor"""
+
+    def predict_batch(self, inputs, return_exceptions=False):
+        assert return_exceptions
+        return [
+            ValueError(f"bad input {item['id']}") if item.get("bad") else {"id": item["id"]}
+            for item in inputs
+        ]
+
+
+def run_concurrently(predictor, inputs):
+    async def scenario():
+        batcher = PredictionBatcher(lambda: predictor, max_batch_size=len(inputs), max_wait_us=200000)
+        batcher.start()
+        # Start from a busy state so the first batch waits for all requests
+        batcher._last_batch_size = len(inputs)
+        try:
+            return await asyncio.gather(
+                *(batcher.submit(item) for item in inputs), return_exceptions=True
+            ), batcher.get_stats()
+        finally:
+            await batcher.stop()
+
+    return asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("predictor", [FlakyPredictor(), EncodingErrorPredictor()])
+def test_failing_request_only_fails_its_own_future(predictor):
+    inputs = [{"id": 0}, {"id": 1, "bad": True}, {"id": 2}, {"id": 3}]
+
+    results, stats = run_concurrently(predictor, inputs)
+
+    assert stats["total_batches"] == 1
+    assert isinstance(results[1], ValueError)
+    assert [results[i] for i in (0, 2, 3)] == [{"id": 0}, {"id": 2}, {"id": 3}]
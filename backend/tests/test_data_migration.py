@@ -0,0 +1,108 @@
+import io
+import pandas as pd
+from app import models
+from app.data_migration import load_csv_to_db, read_csv_lines
+from app.database import SessionLocal
+
+HEADER = "Accident_Index,Longitude,Latitude,Date,Time,Accident_Severity,Weather_Conditions\n"
+
+
+def write_csv(path, n_rows, multiline_every=3):
+    """CSV whose weather field spans two lines on every ``multiline_every``-th row"""
+    rows = []
+    for i in range(n_rows):
+        weather = f'"Rain\nand ""wind"" {i}"' if i % multiline_every == 0 else f"Fine {i}"
+        rows.append(f"ACC{i:05d},-0.1,51.5,2021-03-{i % 28 + 1:02d},08:30,Slight,{weather}\n")
+    path.write_text(HEADER + "".join(rows))
+    return path
+
+
+def stored_weather():
+    db = SessionLocal()
+    try:
+        return {a.accident_index: a.weather_conditions for a in db.query(models.Accident)}
+    finally:
+        db.close()
+
+
+def test_read_csv_lines_never_splits_a_quoted_field():
+    data = io.BytesIO(b'a,"one\ntwo\nthree",b\nc,d,e\n')
+    assert read_csv_lines(data, 1) == [b'a,"one\n', b'two\n', b'three",b\n']
+    assert read_csv_lines(data, 1) == [b'c,d,e\n']
+
+
+def test_load_keeps_quoted_newlines_across_chunks(tmp_path, app_database):
+    csv_path = write_csv(tmp_path / "accidents.csv", 50)
+
+    result = load_csv_to_db(str(csv_path), batch_size=5, commit_every=10, workers=1)
+
+    expected = pd.read_csv(csv_path)
+    assert result["rows_read"] == result["rows_inserted"] == len(expected) == 50
+    assert stored_weather() == dict(zip(expected["Accident_Index"], expected["Weather_Conditions"]))
+
+
+def test_resume_after_cancel_loads_the_rest(tmp_path, app_database):
+    csv_path = write_csv(tmp_path / "accidents.csv", 50)
+    chunks = []
+
+    first = load_csv_to_db(
+        str(csv_path), batch_size=5, commit_every=5, workers=1,
+        progress=lambda stats: chunks.append(stats.chunks),
+        should_cancel=lambda: len(chunks) >= 3
+    )
+    second = load_csv_to_db(str(csv_path), batch_size=5, commit_every=5, workers=1)
+
+    assert first["cancelled"] and first["rows_inserted"] < 50
+    assert second["resumed_from_offset"] > 0
+    assert first["rows_inserted"] + second["rows_inserted"] == 50
+    assert second["rows_skipped"] == 0
+    assert len(stored_weather()) == 50
+
+
+def stored_accidents():
+    db = SessionLocal()
+    try:
+        return sorted(
+            (a.accident_index, a.accident_date, a.accident_time, a.severity, a.weather_conditions, a.hour)
+            for a in db.query(models.Accident)
+        )
+    finally:
+        db.close()
+
+
+def clear_accidents():
+    db = SessionLocal()
+    try:
+        db.query(models.Accident).delete()
+        db.query(models.IngestState).delete()
+        db.commit()
+    finally:
+        db.close()
+
+
+def test_csv_blocks_end_on_record_boundaries(tmp_path):
+    from app.ingest_pipeline import iter_csv_blocks
+
+    csv_path = write_csv(tmp_path / "accidents.csv", 40, multiline_every=2)
+    data = csv_path.read_bytes()
+    blocks = list(iter_csv_blocks(str(csv_path), block_size=50))
+
+    assert blocks[0][0] == len(HEADER) and blocks[-1][1] == len(data)
+    assert all(end == next_start for (_, end), (next_start, _) in zip(blocks, blocks[1:]))
+    assert all(data[start:end].count(b'"') % 2 == 0 for start, end in blocks)
+
+
+def test_parallel_load_matches_sequential(tmp_path, app_database):
+    csv_path = write_csv(tmp_path / "accidents.csv", 60)
+
+    sequential = load_csv_to_db(str(csv_path), batch_size=7, commit_every=7, workers=1)
+    expected = stored_accidents()
+    clear_accidents()
+    # Blocks shorter than a line, so cuts land before quoted newlines
+    from app.ingest_pipeline import load_csv_parallel
+    parallel = load_csv_parallel(str(csv_path), workers=2, block_size=10, commit_every=7)
+
+    assert stored_accidents() == expected
+    assert len(expected) == 60
+    for key in ("rows_read", "rows_inserted", "rows_skipped", "rows_invalid"):
+        assert parallel[key] == sequential[key]
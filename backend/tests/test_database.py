@@ -0,0 +1,43 @@
+import pytest
+from sqlalchemy import text
+from app.database import ENGINE_PROFILES, create_profile_engine, session_for
+
+# PRAGMA synchronous reads back as a number
+SYNCHRONOUS = {"OFF": 0, "NORMAL": 1, "FULL": 2, "EXTRA": 3}
+
+
+def read_pragmas(connection, names):
+    return {name: connection.execute(text(f"PRAGMA {name}")).scalar() for name in names}
+
+
+def expected_pragmas(profile):
+    expected = dict(ENGINE_PROFILES[profile]["pragmas"])
+    expected["journal_mode"] = expected["journal_mode"].lower()
+    expected["synchronous"] = SYNCHRONOUS[expected["synchronous"]]
+    if "foreign_keys" in expected:
+        expected["foreign_keys"] = int(expected["foreign_keys"] == "ON")
+    if "temp_store" in expected:
+        expected["temp_store"] = {"DEFAULT": 0, "FILE": 1, "MEMORY": 2}[expected["temp_store"]]
+    return expected
+
+
+def test_bulk_load_session_applies_its_pragmas():
+    expected = expected_pragmas("bulk_load")
+    db = session_for("bulk_load")
+    try:
+        assert read_pragmas(db.connection(), expected) == expected
+    finally:
+        db.close()
+
+
+@pytest.mark.parametrize("profile", list(ENGINE_PROFILES))
+def test_every_pooled_connection_gets_the_profile_pragmas(tmp_path, profile):
+    expected = expected_pragmas(profile)
+    engine = create_profile_engine(profile, url=f"sqlite:///{tmp_path / 'pragmas.db'}")
+    try:
+        # Two connections open at once, so both come from the pool's connect hook
+        with engine.connect() as first, engine.connect() as second:
+            assert read_pragmas(first, expected) == expected
+            assert read_pragmas(second, expected) == expected
+    finally:
+        engine.dispose()
@@ -0,0 +1,58 @@
+import asyncio
+import threading
+import time
+import pytest
+from fastapi import HTTPException
+from app.executors import BoundedExecutor
+
+
+def test_cancelled_awaiter_keeps_its_slot_until_the_thread_finishes():
+    executor = BoundedExecutor("test", max_workers=1, max_queue=0)
+    release = threading.Event()
+
+    async def scenario():
+        started = threading.Event()
+
+        def blocking():
+            started.set()
+            release.wait(5)
+
+        task = asyncio.create_task(executor.run(blocking))
+        while not started.is_set():
+            await asyncio.sleep(0.001)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        # The thread is still running, so the pool is still full
+        assert executor.get_stats()["in_flight"] == 1
+        with pytest.raises(HTTPException) as rejected:
+            await executor.run(time.sleep, 0)
+        assert rejected.value.status_code == 503
+
+        release.set()
+        for _ in range(500):
+            if executor.get_stats()["in_flight"] == 0:
+                break
+            await asyncio.sleep(0.01)
+        assert executor.get_stats()["in_flight"] == 0
+        assert await executor.run(sum, [1, 2]) == 3
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        release.set()
+        executor.shutdown()
+
+
+def test_failing_call_frees_its_slot():
+    executor = BoundedExecutor("test", max_workers=1, max_queue=0)
+
+    async def scenario():
+        with pytest.raises(ZeroDivisionError):
+            await executor.run(lambda: 1 / 0)
+        assert await executor.run(max, 1, 2) == 2
+
+    asyncio.run(scenario())
+    executor.shutdown()
+    assert executor.get_stats()["in_flight"] == 0
@@ -0,0 +1,101 @@
+import random
+from datetime import datetime
+import numpy as np
+import pandas as pd
+import pytest
+from app.ml_model.feature_encoder import (
+    CATEGORICAL_FEATURES, NUMERIC_FEATURES, FeatureEncoder, categorize_hour
+)
+
+# Training categories, with underscores and shared prefixes on purpose
+CATEGORIES = {
+    "weather_conditions": ["Fine", "Rain", "Fine_no_high_winds", "Snow"],
+    "light_conditions": ["Daylight", "Darkness_lights_lit", "Dusk"],
+    "road_type": ["Single carriageway", "Dual_carriageway", "Roundabout"],
+    "road_surface_conditions": ["Dry", "Wet", "Snow/Ice"],
+    "junction_detail": ["Not at junction", "T_junction", "Crossroads"],
+    "urban_or_rural_area": ["Urban", "Rural", "1", "2"],
+}
+UNSEEN = ["Hail", "type_Dry", "", "Unknown_value"]
+DATE_FORMATS = ["%Y-%m-%d", "%Y-%m-%dT%H:%M:%S", "%d %B %Y", "%B %d, %Y", "%Y/%m/%d"]
+TIMES = ["00:00", "05:59", "06:00", "11:30", "12:00", "17:59", "18:00", "23:59", "24:00", "7:5", "noon", ""]
+
+
+def reference_frame(requests):
+    """Derived features the way the original DataFrame-based predict built them"""
+    rows = []
+    for request in requests:
+        row = dict(request)
+        if "accident_date" in request:
+            date = pd.to_datetime(request["accident_date"])
+            row.pop("accident_date")
+            row.update(
+                year=date.year, month=date.month, day=date.day,
+                day_of_week=date.dayofweek, is_weekend=int(date.dayofweek in (5, 6))
+            )
+        if "accident_time" in request:
+            try:
+                hour = datetime.strptime(str(request["accident_time"]), "%H:%M").hour
+            except ValueError:
+                hour = 12
+            row["hour"] = hour
+            row["time_of_day"] = categorize_hour(hour)
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def reference_encode(requests, feature_names):
+    """pd.get_dummies + reindex, as prepare_features and _featurize do"""
+    data = reference_frame(requests)
+    categorical = [col for col in CATEGORICAL_FEATURES if col in data.columns]
+    features = [col for col in NUMERIC_FEATURES if col in data.columns] + categorical
+    X = pd.get_dummies(data[features], columns=categorical)
+    return X.reindex(columns=feature_names, fill_value=0).to_numpy(dtype=np.float64)
+
+
+def random_request(rng, unseen_rate=0.0):
+    date = datetime(2015, 1, 1) + pd.Timedelta(days=rng.randrange(3650))
+    request = {
+        "accident_date": date.strftime(rng.choice(DATE_FORMATS)),
+        "accident_time": rng.choice(TIMES) if rng.random() < 0.3 else f"{rng.randrange(24):02d}:{rng.randrange(60):02d}",
+        "longitude": rng.uniform(-3, 1),
+        "latitude": rng.uniform(50, 55),
+        "speed_limit": rng.choice([20, 30, 40, 50, 60, 70]),
+    }
+    for column, values in CATEGORIES.items():
+        request[column] = rng.choice(UNSEEN) if rng.random() < unseen_rate else rng.choice(values)
+    return request
+
+
+@pytest.fixture(scope="module")
+def feature_names():
+    rng = random.Random(0)
+    training = [random_request(rng) for _ in range(2000)]
+    data = reference_frame(training)
+    features = NUMERIC_FEATURES + CATEGORICAL_FEATURES
+    return pd.get_dummies(data[features], columns=CATEGORICAL_FEATURES).columns.tolist()
+
+
+def test_encode_matches_get_dummies(feature_names):
+    rng = random.Random(1)
+    encoder = FeatureEncoder(feature_names)
+    requests = [random_request(rng, unseen_rate=0.2) for _ in range(500)]
+
+    # Missing time, missing date, missing and non-string categories
+    requests[0].pop("accident_time")
+    requests[1].pop("accident_date")
+    requests[2].pop("weather_conditions")
+    requests[3]["urban_or_rural_area"] = 1
+
+    for request in requests:
+        expected = reference_encode([request], feature_names)[0]
+        np.testing.assert_array_equal(encoder.encode(request), expected, err_msg=str(request))
+
+
+def test_encode_batch_matches_encode(feature_names):
+    rng = random.Random(2)
+    encoder = FeatureEncoder(feature_names)
+    requests = [random_request(rng, unseen_rate=0.2) for _ in range(200)]
+
+    expected = np.stack([encoder.encode(request).copy() for request in requests])
+    np.testing.assert_array_equal(encoder.encode_batch(requests), expected)
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from app.ml_model.forest_engine import FlatForest
+
+
+@pytest.fixture(scope="module")
+def data():
+    rng = np.random.default_rng(7)
+    X = rng.normal(size=(2000, 12))
+    # Repeated values put some inputs exactly on split thresholds
+    X[:, :3] = np.round(X[:, :3], 1)
+    y = (X[:, 0] + rng.normal(scale=0.5, size=2000) > 0).astype(int) + (X[:, 1] > 1)
+    return X, y, rng.normal(size=(4096, 12)).round(1)
+
+
+@pytest.mark.parametrize("n_jobs", [1, -1])
+def test_predict_proba_is_bit_identical(data, n_jobs):
+    X, y, X_test = data
+    model = RandomForestClassifier(n_estimators=60, max_depth=12, n_jobs=n_jobs, random_state=0).fit(X, y)
+    flat = FlatForest.from_sklearn(model)
+
+    for batch in (X_test[:1], X_test[:32], X_test):
+        expected = model.predict_proba(batch)
+        np.testing.assert_allclose(flat.predict_proba(batch), expected, rtol=1e-12, atol=0)
+        # Threads add trees in completion order; summed in estimator order
+        # sklearn gives exactly the engine's probabilities
+        model.set_params(n_jobs=1)
+        np.testing.assert_array_equal(flat.predict_proba(batch), model.predict_proba(batch))
+        model.set_params(n_jobs=n_jobs)
+
+
+def test_round_trips_through_arrays(data):
+    X, y, X_test = data
+    model = RandomForestClassifier(n_estimators=10, random_state=0).fit(X, y)
+    flat = FlatForest.from_sklearn(model)
+    restored = FlatForest.from_arrays(flat.to_arrays())
+    np.testing.assert_array_equal(restored.predict_proba(X_test), model.predict_proba(X_test))
+
+
+def test_matches_the_trained_predictor(predictor):
+    from benchmark_predict import random_requests
+
+    X = predictor.encoder.encode_batch(random_requests(256, seed=3))
+    flat = FlatForest.from_sklearn(predictor.model)
+    np.testing.assert_array_equal(flat.predict_proba(X), predictor.model.predict_proba(X))
+
+
+def test_memory_mapped_bundle_shares_every_array(tmp_path, data):
+    from app.ml_model.artifacts import load_bundle, save_bundle
+
+    X, y, X_test = data
+    model = RandomForestClassifier(n_estimators=10, random_state=0).fit(X, y)
+    path = str(tmp_path / "bundle.joblib")
+    save_bundle(path, FlatForest.from_sklearn(model), [f"f{i}" for i in range(12)], ["a", "b", "c"],
+                model.feature_importances_)
+
+    flat, _, _ = load_bundle(path, mmap=True)
+    # Read-only views of the mapped file, not private copies
+    arrays = [flat.children] + [array for array in flat.to_arrays().values() if array.ndim]
+    assert not any(array.flags.writeable for array in arrays)
+    np.testing.assert_array_equal(flat.predict_proba(X_test), model.predict_proba(X_test))
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+from app.ml_model.frame_compaction import compact_frame, dates_to_days, day_number, days_to_dates
+
+
+def test_day_numbers_round_trip():
+    dates = pd.Series(pd.to_datetime(["1969-12-31", "1970-01-01", "2020-02-29", "2038-01-20"]), name="accident_date")
+
+    days = dates_to_days(dates)
+
+    assert days.dtype == np.int32
+    assert days.tolist() == [-1, 0, 18321, 24856]
+    assert [day_number(value) for value in dates] == days.tolist()
+    pd.testing.assert_series_equal(days_to_dates(days), dates)
+
+
+def test_floats_narrow_only_when_exact():
+    frame = pd.DataFrame({"exact": [0.5, -51.25, np.nan], "inexact": [0.1, -51.5, np.nan]})
+
+    compacted, report = compact_frame(frame)
+
+    assert compacted["exact"].dtype == np.float32
+    assert compacted["inexact"].dtype == np.float64
+    np.testing.assert_array_equal(compacted["exact"].astype(np.float64), frame["exact"])
+    assert report["exact"]["bytes_after"] == report["exact"]["bytes_before"] // 2
+
+
+def test_compacted_frame_keeps_every_value():
+    frame = pd.DataFrame({
+        "accident_date": pd.to_datetime(["2021-03-01", "2019-12-31", "2021-03-01", "2020-02-29"]),
+        "weather_conditions": ["Fine", "Raining", "Fine", None],
+        "accident_index": ["A1", "A2", "A3", "A4"],
+        "speed_limit": np.array([30, 70, 20, 60], dtype=np.int64),
+        "is_weekend": [True, False, False, True],
+    })
+
+    compacted, report = compact_frame(frame, max_category_ratio=0.75)
+
+    assert report["accident_date"]["dtype_after"] == "int32"
+    assert report["weather_conditions"]["dtype_after"] == "category"
+    assert report["accident_index"]["dtype_after"] == "object"
+    assert report["speed_limit"]["dtype_after"] == "int8"
+    assert report["is_weekend"]["dtype_after"] == "bool"
+    assert list(compacted["weather_conditions"].cat.categories) == ["Fine", "Raining"]
+
+    restored = compacted.assign(
+        accident_date=days_to_dates(compacted["accident_date"]),
+        # Categories hold missing values as NaN
+        weather_conditions=compacted["weather_conditions"].astype(object).where(compacted["weather_conditions"].notna(), None),
+        speed_limit=compacted["speed_limit"].astype(np.int64),
+    )
+    pd.testing.assert_frame_equal(restored, frame)
+
+
+def test_dates_with_missing_values_are_left_alone():
+    frame = pd.DataFrame({"accident_date": pd.to_datetime(["2021-03-01", None])})
+
+    compacted, _ = compact_frame(frame)
+
+    pd.testing.assert_series_equal(compacted["accident_date"], frame["accident_date"])
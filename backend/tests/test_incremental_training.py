@@ -0,0 +1,69 @@
+import warnings
+import numpy as np
+import pytest
+from sqlalchemy import text
+from config import Config
+from app.ml_model.model_training import AccidentPredictor, FullRetrainRequired
+from benchmark_training_load import seed_accidents
+
+BASE_TREES = 10
+
+
+@pytest.fixture
+def base_version(app_database, tmp_path, monkeypatch):
+    """A promoted full-retrain version over 1500 seeded accidents"""
+    monkeypatch.setattr(Config, "MODEL_REGISTRY_DIR", str(tmp_path / "registry"))
+    monkeypatch.setattr(Config, "MATRIX_CACHE_ENABLED", False)
+    monkeypatch.setattr(Config, "INCREMENTAL_TREES", 5)
+    monkeypatch.setattr(Config, "INCREMENTAL_MIN_ROWS", 100)
+    seed_accidents(app_database, 1500)
+
+    predictor = AccidentPredictor(use_database=True, initialize=False)
+    predictor.train_model(params={"n_estimators": BASE_TREES, "max_depth": 6})
+    return predictor.publish_version(promote=True)
+
+
+def test_warm_start_adds_trees_fitted_on_float32_rows(base_version, app_database):
+    seed_accidents(app_database, 600, first_index=1500, seed=7)
+    candidate = AccidentPredictor(use_database=True, initialize=False)
+
+    result = candidate.train_incremental()
+    version = candidate.publish_version(promote=False)
+
+    assert not result["skipped"] and result["new_rows"] == 600
+    assert len(candidate.model.estimators_) == BASE_TREES + Config.INCREMENTAL_TREES
+    # Fitted on a plain array, like a full fit, so serving arrays raise no feature-name warning
+    assert not hasattr(candidate.model, "feature_names_in_")
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        candidate.model.predict_proba(np.zeros((1, len(candidate.feature_names)), dtype=np.float32))
+
+    # Scored on held-out new rows only, and labelled that way
+    meta = candidate.registry.get(version)
+    assert "accuracy" not in meta and 0 <= meta["new_rows_accuracy"] <= 1
+    assert meta["n_estimators"] == BASE_TREES + Config.INCREMENTAL_TREES
+    assert candidate.registry.current_version() == base_version
+
+
+def _cap_forest(app_database, monkeypatch):
+    monkeypatch.setattr(Config, "MAX_FOREST_TREES", BASE_TREES)
+
+
+def _single_class_rows(app_database, monkeypatch):
+    # Fails after the base forest is loaded, the latest point it can
+    with app_database.begin() as conn:
+        conn.execute(text("UPDATE accidents SET severity = 'Slight' WHERE accident_index >= 'BENCH00001500'"))
+
+
+@pytest.mark.parametrize("make_impossible", [_cap_forest, _single_class_rows])
+def test_full_retrain_required_leaves_current_version_untouched(base_version, app_database, monkeypatch, make_impossible):
+    seed_accidents(app_database, 600, first_index=1500, seed=7)
+    make_impossible(app_database, monkeypatch)
+    candidate = AccidentPredictor(use_database=True, initialize=False)
+    versions = candidate.registry.list_versions()
+
+    with pytest.raises(FullRetrainRequired):
+        candidate.train_incremental()
+
+    assert candidate.registry.current_version() == base_version
+    assert candidate.registry.list_versions() == versions
@@ -0,0 +1,81 @@
+import datetime
+import numpy as np
+import pytest
+from sqlalchemy import insert, text, update
+from app.models import Accident
+from app.ml_model.matrix_cache import MATRIX_ARRAYS, MatrixCache, source_fingerprint
+
+# Older than any onupdate timestamp a test produces
+SEEDED_AT = datetime.datetime(2020, 1, 1)
+
+
+def add_accidents(db, first, n):
+    db.execute(insert(Accident.__table__), [
+        {
+            "accident_index": f"ACC{i:05d}", "longitude": -0.1, "latitude": 51.5,
+            "accident_date": datetime.date(2021, 3, 1), "severity": "Slight",
+            "created_at": SEEDED_AT, "updated_at": SEEDED_AT,
+        }
+        for i in range(first, first + n)
+    ])
+    db.commit()
+
+
+@pytest.fixture
+def db(session_factory):
+    db = session_factory()
+    add_accidents(db, 0, 10)
+    yield db
+    db.close()
+
+
+def core_update(db):
+    db.execute(update(Accident.__table__).where(Accident.__table__.c.id == 3).values(severity="Fatal"))
+    db.commit()
+
+
+def orm_update(db):
+    db.execute(update(Accident).where(Accident.id == 3).values(severity="Fatal"))
+    db.commit()
+
+
+def orm_flush(db):
+    db.get(Accident, 3).severity = "Fatal"
+    db.commit()
+
+
+def delete_row(db):
+    db.execute(text("DELETE FROM accidents WHERE id = 3"))
+    db.commit()
+
+
+@pytest.mark.parametrize("change", [
+    lambda db: add_accidents(db, 10, 1), core_update, orm_update, orm_flush, delete_row,
+])
+def test_data_changes_miss(db, change):
+    before = source_fingerprint(db)
+    change(db)
+    assert source_fingerprint(db) != before
+
+
+def test_unchanged_table_and_settings_hit(db, tmp_path):
+    key = source_fingerprint(db, extra={"max_rows": 100})
+    cache = MatrixCache(str(tmp_path))
+    arrays = {name: np.arange(4, dtype=np.float32) for name in MATRIX_ARRAYS}
+    cache.save(key, arrays, {"feature_names": ["a"]})
+
+    assert source_fingerprint(db, extra={"max_rows": 100}) == key
+    loaded, meta = cache.load(key)
+    assert meta["feature_names"] == ["a"]
+    np.testing.assert_array_equal(loaded["X_train"], arrays["X_train"])
+
+    assert source_fingerprint(db, extra={"max_rows": 200}) != key
+    assert cache.load(source_fingerprint(db, extra={"max_rows": 200})) is None
+
+
+def test_raw_sql_update_is_not_detected(db):
+    # Documented gap: writes outside SQLAlchemy leave updated_at alone
+    before = source_fingerprint(db)
+    db.execute(text("UPDATE accidents SET severity = 'Fatal' WHERE id = 3"))
+    db.commit()
+    assert source_fingerprint(db) == before
@@ -0,0 +1,33 @@
+import pytest
+from app.ml_model.feature_encoder import parse_accident_date
+from app.ml_model.model_training import WARMUP_INPUT
+
+
+def test_parse_accident_date_rejects_garbage():
+    assert parse_accident_date("2023-01-15").day == 15
+    assert parse_accident_date("15 January 2023").month == 1
+    for value in ("garbage", "", "2023-13-45"):
+        with pytest.raises(ValueError):
+            parse_accident_date(value)
+
+
+def test_bad_date_fails_only_its_own_item(predictor):
+    inputs = [
+        dict(WARMUP_INPUT),
+        dict(WARMUP_INPUT, accident_date="garbage"),
+        dict(WARMUP_INPUT, accident_date="2023-06-30", accident_time="08:15"),
+    ]
+
+    results = predictor.predict_batch(inputs, return_exceptions=True)
+
+    assert len(results) == 3
+    assert isinstance(results[1], ValueError)
+    assert "garbage" in str(results[1])
+    for i in (0, 2):
+        assert results[i]["severity"] == predictor.predict(inputs[i])["severity"]
+        assert results[i]["confidence"] == pytest.approx(predictor.predict(inputs[i])["confidence"])
+
+
+def test_bad_date_raises_without_return_exceptions(predictor):
+    with pytest.raises(ValueError):
+        predictor.predict_batch([dict(WARMUP_INPUT), dict(WARMUP_INPUT, accident_date="garbage")])
@@ -0,0 +1,85 @@
+from types import SimpleNamespace
+import pytest
+from config import Config
+from app.ml_model import prediction_cache
+from app.ml_model.model_training import WARMUP_INPUT, AccidentPredictor
+from app.ml_model.prediction_cache import PredictionCache
+from app.training_jobs import load_and_swap_predictor
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = SimpleNamespace(value=1000.0)
+    monkeypatch.setattr(prediction_cache.time, "monotonic", lambda: now.value)
+    return now
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = PredictionCache(max_size=2)
+    cache.put("a", {"v": 1})
+    cache.put("b", {"v": 2})
+    assert cache.get("a") == {"v": 1}
+
+    cache.put("c", {"v": 3})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"v": 1} and cache.get("c") == {"v": 3}
+    assert cache.get_stats()["evictions"] == 1
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = PredictionCache(ttl_seconds=10)
+    cache.put("a", {"v": 1})
+
+    clock.value += 10
+    assert cache.get("a") == {"v": 1}
+    clock.value += 0.001
+    assert cache.get("a") is None
+
+    stats = cache.get_stats()
+    assert (stats["hits"], stats["misses"], stats["expirations"], stats["size"]) == (1, 1, 1, 0)
+
+
+def test_zero_size_disables_caching():
+    cache = PredictionCache(max_size=0)
+    cache.put("a", {"v": 1})
+    assert cache.get("a") is None
+
+
+@pytest.fixture
+def registry_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "MODEL_REGISTRY_DIR", str(tmp_path / "registry"))
+
+
+def train_sample_predictor(n_estimators):
+    predictor = AccidentPredictor(use_database=False, initialize=False)
+    predictor._create_sample_data()
+    predictor.train_model(params={"n_estimators": n_estimators, "max_depth": 4})
+    return predictor
+
+
+def test_publishing_a_version_invalidates_cached_results(registry_dir):
+    predictor = train_sample_predictor(5)
+    assert predictor.predict(WARMUP_INPUT)["model_version"] == "unversioned"
+
+    version = predictor.publish_version()
+
+    assert predictor.cache.get_stats()["size"] == 0
+    assert predictor.predict(WARMUP_INPUT)["model_version"] == version
+
+
+def test_hot_swap_serves_the_new_version_from_an_empty_cache(registry_dir, monkeypatch):
+    # Analytics data is not needed to serve predictions
+    monkeypatch.setattr(AccidentPredictor, "load_and_preprocess_data", lambda self: None)
+    old_version = train_sample_predictor(5).publish_version(promote=True)
+    new_version = train_sample_predictor(7).publish_version()
+    state = SimpleNamespace(predictor=load_and_swap_predictor(SimpleNamespace(), old_version))
+    old = state.predictor
+    old.predict(WARMUP_INPUT)
+
+    load_and_swap_predictor(state, new_version)
+
+    assert state.predictor is not old
+    assert state.predictor.cache.get_stats()["hits"] == 0
+    assert state.predictor.predict(WARMUP_INPUT)["model_version"] == new_version
+    assert old.predict(WARMUP_INPUT)["model_version"] == old_version
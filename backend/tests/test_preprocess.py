@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+import pytest
+from app.data_migration import preprocess_accident_data
+from benchmark_preprocess import BAD_TIMES, random_accident_frame, rowwise_preprocess
+
+
+def assert_same_output(df):
+    expected = rowwise_preprocess(df.copy())
+    actual = preprocess_accident_data(df.copy())
+    pd.testing.assert_frame_equal(actual, expected)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_rowwise_on_random_frames(seed):
+    rng = np.random.default_rng(seed)
+    assert_same_output(random_accident_frame(
+        int(rng.integers(1, 400)), seed=seed, bad_rate=float(rng.uniform(0, 0.6)),
+        date_format=str(rng.choice(["%Y-%m-%d", "%d/%m/%Y", "%m/%d/%Y", "%Y-%m-%d %H:%M"]))
+    ))
+
+
+@pytest.mark.parametrize("times", [
+    ["24:00", "23:60", "", None],        # nothing parses: object hour column
+    ["07:30", "7:5", "23:59", "00:00"],  # everything parses: int64 hours
+    [np.nan, np.nan, np.nan, np.nan],    # float column of NaN
+    BAD_TIMES[:4],
+])
+def test_matches_rowwise_on_edge_case_times(times):
+    df = random_accident_frame(len(times), bad_rate=0)
+    df["Time"] = pd.Series(times, dtype=object if any(isinstance(t, str) for t in times) else None)
+    assert_same_output(df)
+
+
+def test_matches_rowwise_on_unparseable_dates():
+    df = random_accident_frame(4, bad_rate=0)
+    df["Date"] = ["garbage", "", None, "2021-02-30"]
+    assert_same_output(df)
@@ -0,0 +1,30 @@
+from check_query_plans import find_full_scans, full_scans
+
+
+def plan(*details):
+    return [(0, 0, 0, detail) for detail in details]
+
+
+def test_full_scans_flags_table_and_index_scans():
+    filtered = "SELECT * FROM accidents WHERE id > ?"
+    assert full_scans(plan("SCAN accidents"), "SELECT * FROM accidents")
+    assert full_scans(plan("SCAN accidents USING INDEX ix_accidents_accident_date"), filtered)
+    assert full_scans(plan("SCAN accidents USING COVERING INDEX ix_accidents_id"), filtered)
+    assert not full_scans(plan("SEARCH accidents USING INTEGER PRIMARY KEY (rowid>?)"), filtered)
+
+
+def test_full_scans_accepts_unfiltered_walks_and_partial_indexes():
+    assert not full_scans(
+        plan("SCAN accidents USING INDEX ix_accidents_accident_date"),
+        "SELECT * FROM accidents ORDER BY accident_date DESC LIMIT ?"
+    )
+    assert not full_scans(
+        plan("SCAN predictions USING COVERING INDEX ix_predictions_reviewed"),
+        "SELECT count(is_correct) FROM predictions WHERE is_correct IS NOT NULL",
+        partial={"ix_predictions_reviewed"}
+    )
+
+
+def test_crud_queries_do_not_scan_full_tables():
+    failures = find_full_scans()
+    assert failures == [], "\n".join(f"{label}: {'; '.join(scans)}" for label, scans, _ in failures)
@@ -0,0 +1,50 @@
+import threading
+import pytest
+from app.ml_model.registry import ModelRegistry
+
+
+def register_versions(root, n):
+    registry = ModelRegistry(root)
+    versions = []
+    for _ in range(n):
+        version, staging = registry.create_staging()
+        registry.finalize(version, staging, {"created_at": version})
+        versions.append(version)
+    return versions
+
+
+def test_concurrent_promotions_from_separate_instances_keep_every_entry(tmp_path):
+    root = str(tmp_path / "registry")
+    versions = register_versions(root, 40)
+
+    def promote_all(own_versions):
+        # A fresh instance per call, like get_model_registry() per request
+        for version in own_versions:
+            ModelRegistry(root).promote(version)
+
+    threads = [threading.Thread(target=promote_all, args=(versions[i::8],)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    registry = ModelRegistry(root)
+    history = registry._read_history()
+    assert sorted(history) == sorted(versions)
+    assert registry.current_version() == history[-1]
+
+
+def test_rollback_refuses_a_changed_previous_version(tmp_path):
+    root = str(tmp_path / "registry")
+    first, second, third = register_versions(root, 3)
+    registry = ModelRegistry(root)
+    registry.promote(first)
+    registry.promote(second)
+
+    assert registry.previous_version() == first
+    registry.promote(third)
+    with pytest.raises(ValueError):
+        registry.rollback(expected=first)
+
+    assert registry.rollback(expected=second) == second
+    assert registry.current_version() == second
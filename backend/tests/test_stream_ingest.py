@@ -0,0 +1,53 @@
+import gzip
+from app import models
+from app.database import SessionLocal
+from app.stream_ingest import CsvStreamLoader
+
+HEADER = b"Accident_Index,Longitude,Latitude,Date,Time,Accident_Severity\n"
+
+
+def csv_rows(first, n):
+    return b"".join(
+        f"ACC{i:05d},-0.1,51.5,2021-03-{i % 28 + 1:02d},08:30,Slight\n".encode()
+        for i in range(first, first + n)
+    )
+
+
+def stored_indexes():
+    db = SessionLocal()
+    try:
+        return {index for (index,) in db.query(models.Accident.accident_index)}
+    finally:
+        db.close()
+
+
+def feed_in_pieces(loader, data, size):
+    for start in range(0, len(data), size):
+        loader.feed(data[start:start + size])
+
+
+def test_multi_member_gzip_streamed_in_small_pieces(app_database):
+    # Three gzip members concatenated, as `cat a.gz b.gz c.gz` produces
+    body = gzip.compress(HEADER + csv_rows(0, 40)) + gzip.compress(csv_rows(40, 25)) + gzip.compress(csv_rows(65, 15))
+    loader = CsvStreamLoader(batch_size=10, commit_every=20)
+
+    feed_in_pieces(loader, body, 7)
+    stats = loader.finish()
+
+    assert loader.compressed
+    assert stats["rows_read"] == stats["rows_inserted"] == 80
+    assert stats["rows_skipped"] == stats["rows_invalid"] == 0
+    assert stats["chunks"] == 8
+    assert stats["bytes_read"] == len(body)
+    assert stored_indexes() == {f"ACC{i:05d}" for i in range(80)}
+
+
+def test_abort_reports_the_rows_already_committed(app_database):
+    loader = CsvStreamLoader(batch_size=10, commit_every=20)
+
+    # 50 complete rows: chunks of 10, committed after rows 20 and 40
+    feed_in_pieces(loader, HEADER + csv_rows(0, 51), 64)
+    committed = loader.abort()
+
+    assert committed == 40
+    assert len(stored_indexes()) == 40
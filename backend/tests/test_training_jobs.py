@@ -0,0 +1,93 @@
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+from types import SimpleNamespace
+import pytest
+from app import training_jobs
+from app.ml_model.registry import ModelRegistry
+from app.training_jobs import TrainingJobRunner, install_trained_version
+
+
+def _job_with_worker(pids):
+    """Stand-in training process: own group plus one long-running worker"""
+    os.setpgrp()
+    worker = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"])
+    pids.put(worker.pid)
+    time.sleep(60)
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    # A zombie has exited but was not reaped (its parent was killed too)
+    with open(f"/proc/{pid}/stat") as f:
+        return f.read().split(")")[-1].split()[0] != "Z"
+
+
+@pytest.mark.skipif(not hasattr(os, "killpg") or not os.path.isdir("/proc"), reason="POSIX process groups")
+def test_terminate_reaches_workers_of_the_training_process():
+    ctx = multiprocessing.get_context("spawn")
+    pids = ctx.Queue()
+    process = ctx.Process(target=_job_with_worker, args=(pids,))
+    process.start()
+    worker_pid = pids.get(timeout=30)
+
+    TrainingJobRunner._terminate(process)
+    process.join(timeout=10)
+
+    deadline = time.time() + 10
+    while _alive(worker_pid) and time.time() < deadline:
+        time.sleep(0.05)
+    assert not process.is_alive()
+    assert not _alive(worker_pid)
+
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    from config import Config
+
+    monkeypatch.setattr(Config, "MODEL_REGISTRY_DIR", str(tmp_path / "registry"))
+    registry = ModelRegistry(Config.MODEL_REGISTRY_DIR)
+    versions = []
+    for _ in range(2):
+        version, staging = registry.create_staging()
+        registry.finalize(version, staging, {})
+        versions.append(version)
+    registry.promote(versions[0])
+    return registry, versions
+
+
+def test_trained_version_is_promoted_only_after_it_is_serving(registry, monkeypatch):
+    registry, (served, trained) = registry
+    state = SimpleNamespace(predictor="old")
+
+    def swap(state, version):
+        assert registry.current_version() == served
+        state.predictor = version
+
+    monkeypatch.setattr(training_jobs, "load_and_swap_predictor", swap)
+    result = {"promote": True, "promoted": False, "model_version": trained}
+    install_trained_version(state, result)
+
+    assert state.predictor == trained
+    assert registry.current_version() == trained
+    assert result["promoted"]
+
+
+def test_failed_load_leaves_current_alone(registry, monkeypatch):
+    registry, (served, trained) = registry
+    state = SimpleNamespace(predictor="old")
+
+    def swap(state, version):
+        raise RuntimeError("corrupt artifact")
+
+    monkeypatch.setattr(training_jobs, "load_and_swap_predictor", swap)
+    with pytest.raises(RuntimeError):
+        install_trained_version(state, {"promote": True, "model_version": trained})
+
+    assert state.predictor == "old"
+    assert registry.current_version() == served
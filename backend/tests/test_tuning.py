@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+from app.ml_model.tuning import save_design_matrix, successive_halving
+
+
+@pytest.fixture
+def design_paths(tmp_path):
+    rng = np.random.RandomState(0)
+    X = rng.rand(300, 5)
+    y = (X[:, 0] + 0.2 * rng.rand(300) > 0.6).astype(int)
+    return save_design_matrix(str(tmp_path), X[:240], X[240:], y[:240], y[240:])
+
+
+def test_halving_rounds_skip_a_failed_candidate(design_paths):
+    # max_depth=-1 is rejected by the forest, in the worker
+    search_space = {"n_estimators": [3], "max_depth": [2, 4, -1]}
+
+    result = successive_halving(design_paths, search_space, max_candidates=3, eta=2, max_workers=1)
+
+    assert [(r["candidates"], r["completed"], r["fraction"]) for r in result["rounds"]] == [(3, 2, 0.5), (1, 1, 1.0)]
+    assert len(result["leaderboard"]) == 3
+    assert all(entry["params"]["max_depth"] != -1 for entry in result["leaderboard"])
+    assert result["best"] is result["leaderboard"][0] and result["best"]["round"] == 2
+    assert not result["budget_exhausted"]
+    assert result["latency_measured_in"] == "tuning_worker"
+
+
+def test_spent_time_budget_starts_no_fits(design_paths):
+    search_space = {"n_estimators": [3], "max_depth": [2, 4, 6]}
+
+    result = successive_halving(design_paths, search_space, max_candidates=3, max_workers=1, time_budget=0)
+
+    assert result["budget_exhausted"]
+    assert result["rounds"] == [dict(result["rounds"][0], candidates=3, completed=0)]
+    assert result["leaderboard"] == [] and result["best"] is None
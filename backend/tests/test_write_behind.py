@@ -0,0 +1,82 @@
+import time
+from app import models
+from app.write_behind import PredictionWriter
+
+
+def prediction(i, **overrides):
+    record = {
+        "prediction_id": f"PRED_{i}",
+        "input_data": "{}",
+        "predicted_severity": "Slight",
+        "predicted_severity_code": 0,
+        "confidence": 0.9,
+    }
+    record.update(overrides)
+    return record
+
+
+def stored_ids(session_factory):
+    db = session_factory()
+    try:
+        return sorted(p.prediction_id for p in db.query(models.Prediction))
+    finally:
+        db.close()
+
+
+def test_bad_record_is_dead_lettered_after_retries(session_factory):
+    writer = PredictionWriter(session_factory, batch_size=100, max_retries=2)
+    for i in range(4):
+        writer.submit(prediction(i, input_data=None) if i == 2 else prediction(i))
+
+    # The first write and its retries fail as a whole
+    for _ in range(3):
+        assert writer.flush() == 0
+    assert writer.pending_count() == 4
+
+    # Newer records wait behind the failing batch, then flow once it is split
+    writer.submit(prediction(4))
+    assert writer.flush() == 4
+    assert writer.total_dead_lettered == 1
+    assert writer.pending_count() == 0
+    assert stored_ids(session_factory) == ["PRED_0", "PRED_1", "PRED_3", "PRED_4"]
+
+
+def test_stop_writes_what_it_can_from_a_failing_batch(session_factory):
+    writer = PredictionWriter(session_factory, batch_size=100, flush_interval=60, max_retries=5)
+    writer.start()
+    writer.submit(prediction(0))
+    writer.submit(prediction(1, input_data=None))
+    writer.submit(prediction(2))
+
+    writer.stop()
+
+    assert writer.total_dead_lettered == 1
+    assert writer.pending_count() == 0
+    assert stored_ids(session_factory) == ["PRED_0", "PRED_2"]
+
+
+class FlakyWriter(PredictionWriter):
+    """Writer whose inserts fail like a locked database until ``fail_until``"""
+
+    fail_until = 0.0
+
+    def _insert(self, records):
+        if time.monotonic() < self.fail_until:
+            raise RuntimeError("database is locked")
+        return super()._insert(records)
+
+
+def test_transient_failure_recovers_without_dead_lettering(session_factory):
+    writer = FlakyWriter(session_factory, batch_size=2, flush_interval=0.2, max_retries=3, retry_delay=0.02)
+    writer.fail_until = time.monotonic() + 0.15
+    writer.start()
+    # Keep the buffer at batch_size or more through the whole lock episode
+    for i in range(40):
+        writer.submit(prediction(i))
+        time.sleep(0.005)
+
+    writer.stop()
+
+    assert writer.failed_flushes > 0
+    assert writer.total_dead_lettered == 0
+    assert len(stored_ids(session_factory)) == 40